@@ -0,0 +1,90 @@
+#!/usr/bin/env python
+"""
+Benchmark the parsing of `globus transfer --batch` input, with and without the
+fast batch line parser.
+
+A synthetic batch of lines in the forms accepted by `globus transfer --batch` is
+generated, and parsed with the same click command and fast parser as the
+transfer command uses. The items produced by both are checked to be the same.
+
+usage:
+    python ./scripts/benchmark_batch_parse.py [--count N]
+"""
+from __future__ import annotations
+
+import argparse
+import io
+import time
+
+import click
+
+from globus_cli.parsing import BatchLineParser, TaskPath, mutex_option_group
+from globus_cli.utils import shlex_process_stream
+
+
+def synthetic_batch(count: int) -> str:
+    lines = []
+    for i in range(count):
+        if i % 10 == 0:
+            lines.append(f"--recursive dir{i} dest/dir{i}")
+        elif i % 10 == 1:
+            lines.append(f"--external-checksum {i:032x} file{i}.dat dest/file{i}.dat")
+        elif i % 100 == 2:
+            lines.append(f"'file {i}.dat' 'dest/file {i}.dat'  # with spaces")
+        elif i % 100 == 3:
+            lines.append("")
+        else:
+            lines.append(f"data/{i // 1000}/file{i}.dat /abs/dest/./{i}.dat")
+    return "\n".join(lines) + "\n"
+
+
+def parse(batch: str, use_fast_parser: bool) -> tuple[list, float]:
+    items = []
+
+    def add_batch_item(source_path, dest_path, recursive, external_checksum):
+        items.append((source_path, dest_path, recursive, external_checksum))
+
+    @click.command()
+    @click.option("--external-checksum")
+    @click.option("--recursive", "-r", is_flag=True)
+    @click.argument("source_path", type=TaskPath(base_dir="/src/"))
+    @click.argument("dest_path", type=TaskPath(base_dir="/dst/"))
+    @mutex_option_group("--recursive", "--external-checksum")
+    def process_batch_line(dest_path, source_path, recursive, external_checksum):
+        add_batch_item(str(source_path), str(dest_path), recursive, external_checksum)
+
+    fast_parser = None
+    if use_fast_parser:
+        fast_parser = BatchLineParser(
+            add_batch_item,
+            arguments=[("source_path", "/src/"), ("dest_path", "/dst/")],
+            flags={"--recursive": "recursive", "-r": "recursive"},
+            options={"--external-checksum": "external_checksum"},
+            mutually_exclusive=("recursive", "external_checksum"),
+        )
+
+    start = time.perf_counter()
+    shlex_process_stream(process_batch_line, io.StringIO(batch), fast_parser)
+    return items, time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument(
+        "--count", type=int, default=1_000_000, help="number of batch lines"
+    )
+    args = parser.parse_args()
+
+    batch = synthetic_batch(args.count)
+    print(f"parsing {args.count} batch lines")
+    fast_items, fast_time = parse(batch, use_fast_parser=True)
+    print(f"  {'fast parser':>12}: {fast_time:8.2f}s")
+    click_items, click_time = parse(batch, use_fast_parser=False)
+    print(f"  {'click':>12}: {click_time:8.2f}s")
+    if fast_items != click_items:
+        raise SystemExit("the fast parser and click produced different items!")
+    print(f"  speedup: {click_time / fast_time:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
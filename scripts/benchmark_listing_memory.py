@@ -0,0 +1,81 @@
+#!/usr/bin/env python
+"""
+Benchmark the memory used to hold a large listing as dicts and as ListingItems.
+
+A synthetic listing of operation_ls items is generated, with every string built
+separately as the JSON decoder would build it, and the memory allocated to hold
+all of the items is measured with tracemalloc.
+
+usage:
+    python ./scripts/benchmark_listing_memory.py [--count N]
+"""
+from __future__ import annotations
+
+import argparse
+import gc
+import time
+import tracemalloc
+from typing import Any, Callable, Iterator
+
+from globus_cli.services.transfer import ListingItem
+
+USERS = ["alice", "bob", "carol", "dave"]
+
+
+def _fresh(s: str) -> str:
+    # a new string object with the same value, as a decoded response would have
+    return "".join(list(s))
+
+
+def synthetic_items(count: int) -> Iterator[dict]:
+    for i in range(count):
+        is_dir = i % 10 == 0
+        user = USERS[i % len(USERS)]
+        yield {
+            "DATA_TYPE": _fresh("file"),
+            "group": _fresh(user),
+            "last_modified": f"2022-01-{i % 28 + 1:02} 00:00:00+00:00",
+            "link_group": None,
+            "link_last_modified": None,
+            "link_size": None,
+            "link_target": None,
+            "link_user": None,
+            "name": f"dir{i // 1000}/file{i}.dat",
+            "permissions": _fresh("0755" if is_dir else "0644"),
+            "size": 4096 if is_dir else i,
+            "type": _fresh("dir" if is_dir else "file"),
+            "user": _fresh(user),
+        }
+
+
+def measure(count: int, convert: Callable[[dict], Any]) -> tuple[float, float]:
+    """Return (MiB held, seconds) for a list of all of the converted items"""
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    items = [convert(item) for item in synthetic_items(count)]
+    elapsed = time.perf_counter() - start
+    held, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del items
+    return held / 2**20, elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument(
+        "--count", type=int, default=1_000_000, help="number of listing items"
+    )
+    args = parser.parse_args()
+
+    print(f"holding {args.count} listing items")
+    results = {}
+    for label, convert in (("dict", dict), ("ListingItem", ListingItem)):
+        held, elapsed = measure(args.count, convert)
+        results[label] = held
+        print(f"  {label:>12}: {held:8.1f} MiB  ({elapsed:.2f}s)")
+    print(f"  reduction: {results['dict'] / results['ListingItem']:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
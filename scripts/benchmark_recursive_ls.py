@@ -0,0 +1,145 @@
+#!/usr/bin/env python
+"""
+Benchmark `globus ls --recursive` traversal against a local mock Transfer service.
+
+A threaded HTTP server on localhost answers `operation_ls` calls for a synthetic
+directory tree, adding a fixed delay to every response to stand in for network
+round-trip time. The same walk is then timed with different numbers of workers.
+
+usage:
+    python ./scripts/benchmark_recursive_ls.py [--fanout N] [--depth N] [--latency S]
+
+A single wide level, where the cost of looking ahead through the queue shows up:
+    python ./scripts/benchmark_recursive_ls.py --fanout 40000 --depth 1 --files 0
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import threading
+import time
+import urllib.parse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from globus_cli.services.transfer import CustomTransferClient
+
+ENDPOINT_ID = "00000000-0000-0000-0000-000000000000"
+
+
+def _file_doc(name: str, type_: str) -> dict:
+    return {
+        "DATA_TYPE": "file",
+        "group": "bench",
+        "last_modified": "2022-01-01 00:00:00+00:00",
+        "link_group": None,
+        "link_last_modified": None,
+        "link_size": None,
+        "link_target": None,
+        "link_user": None,
+        "name": name,
+        "permissions": "0755" if type_ == "dir" else "0644",
+        "size": 4096 if type_ == "dir" else 1024,
+        "type": type_,
+        "user": "bench",
+    }
+
+
+class MockTransferServer(ThreadingHTTPServer):
+    # the default backlog of 5 is too small for many concurrent clients, and
+    # dropped connections are retried only after a long delay
+    request_queue_size = 128
+    daemon_threads = True
+
+
+def make_handler(fanout: int, files: int, depth: int, latency: float) -> type:
+    class MockTransferHandler(BaseHTTPRequestHandler):
+        def log_message(self, *args: object) -> None:
+            pass
+
+        def do_GET(self) -> None:
+            url = urllib.parse.urlparse(self.path)
+            query = urllib.parse.parse_qs(url.query)
+            path = query.get("path", ["/"])[0]
+            if not path.endswith("/"):
+                path += "/"
+            level = path.count("/") - 1
+
+            data = [_file_doc(f"file{i}.dat", "file") for i in range(files)]
+            if level < depth:
+                data += [_file_doc(f"dir{i}", "dir") for i in range(fanout)]
+
+            body = json.dumps(
+                {
+                    "DATA": data,
+                    "DATA_TYPE": "file_list",
+                    "endpoint": ENDPOINT_ID,
+                    "length": len(data),
+                    "path": path,
+                }
+            ).encode()
+
+            time.sleep(latency)
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+    return MockTransferHandler
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--fanout", type=int, default=6, help="subdirs per dir")
+    parser.add_argument("--files", type=int, default=10, help="files per dir")
+    parser.add_argument("--depth", type=int, default=3, help="depth of the tree")
+    parser.add_argument(
+        "--latency", type=float, default=0.02, help="seconds of delay per ls call"
+    )
+    parser.add_argument(
+        "--workers", type=int, nargs="+", default=[1, 4, 16], help="worker counts"
+    )
+    args = parser.parse_args()
+
+    server = MockTransferServer(
+        ("127.0.0.1", 0),
+        make_handler(args.fanout, args.files, args.depth, args.latency),
+    )
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    client = CustomTransferClient(base_url=f"http://127.0.0.1:{server.server_port}/")
+    # measure the traversal engine, not the client-side rate limit
+    client.rate_limiter.rate = client.rate_limiter.max_rate = 1e9
+
+    ndirs = sum(args.fanout**i for i in range(args.depth + 1))
+    print(
+        f"tree: {ndirs} dirs, {ndirs * args.files} files, "
+        f"{args.latency * 1000:.0f}ms latency per ls"
+    )
+    print(f"{'workers':>8} {'seconds':>10} {'speedup':>8} {'items':>8}")
+
+    baseline_time = None
+    baseline_names = None
+    for workers in args.workers:
+        start = time.perf_counter()
+        names = [
+            item["name"]
+            for item in client.recursive_operation_ls(
+                ENDPOINT_ID, {"path": "/"}, depth=args.depth, max_workers=workers
+            )
+        ]
+        elapsed = time.perf_counter() - start
+
+        if baseline_time is None:
+            baseline_time, baseline_names = elapsed, names
+        elif names != baseline_names:
+            raise RuntimeError(f"{workers} workers produced a different listing")
+        print(
+            f"{workers:>8} {elapsed:>10.3f} "
+            f"{baseline_time / elapsed:>7.1f}x {len(names):>8}"
+        )
+
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -14,6 +14,12 @@ DEV_REQUIREMENTS = [
     "ruamel.yaml==0.17.16",
 ]
 
+# optional dependencies of particular features
+EXTRAS_REQUIRE = {
+    # reading --batch input compressed with zstd
+    "zstd": ["zstandard>=0.16,<1"],
+}
+
 
 def parse_version():
     # single source of truth for package version
@@ -50,7 +56,7 @@ setup(
         "requests>=2.19.1,<3.0.0",
         "cryptography>=3.3.1,<37",
     ],
-    extras_require={"development": DEV_REQUIREMENTS},
+    extras_require={"development": DEV_REQUIREMENTS, **EXTRAS_REQUIRE},
     entry_points={"console_scripts": ["globus = globus_cli:main"]},
     # descriptive info, non-critical
     description="Globus CLI",
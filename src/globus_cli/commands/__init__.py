@@ -2,6 +2,7 @@ from globus_cli.commands.bookmark import bookmark_command
 from globus_cli.commands.cli_profile_list import cli_profile_list
 from globus_cli.commands.collection import collection_command
 from globus_cli.commands.delete import delete_command
+from globus_cli.commands.du import du_command
 from globus_cli.commands.endpoint import endpoint_command
 from globus_cli.commands.get_identities import get_identities_command
 from globus_cli.commands.group import group_command
@@ -50,6 +51,7 @@ main.add_command(api_command)
 
 main.add_command(get_identities_command)
 main.add_command(ls_command)
+main.add_command(du_command)
 main.add_command(mkdir_command)
 main.add_command(rename_command)
 main.add_command(delete_command)
@@ -1,10 +1,40 @@
 import sys
+import time
+from typing import Iterable
 
 import click
 
-from globus_cli.termio import FORMAT_SILENT, formatted_print
+from globus_cli.termio import FORMAT_SILENT, formatted_print, is_verbose
 
-from ..services.transfer import CustomTransferClient
+from ..services.transfer import (
+    TERMINAL_TASK_STATUSES,
+    CustomTransferClient,
+    PollingSchedule,
+    TaskListPoller,
+    iterable_response_to_dict,
+)
+
+# for the `--meow` easter egg
+_SLEEPY_CAT = r"""
+   |\      _,,,---,,_
+   /,`.-'`'    -.  ;-;;,_
+  |,4-  ) )-,_..;\ (  `'-'
+ '---''(_/--'  `-'\_)"""
+_AWAKE_CAT = r"""
+                  _..
+  /}_{\           /.-'
+ ( a a )-.___...-'/
+ ==._.==         ;
+      \ i _..._ /,
+      {_;/   {_//"""
+
+
+def _report_api_calls(api_calls, waited_time) -> None:
+    if is_verbose():
+        click.echo(
+            f"Made {api_calls} API calls while waiting {waited_time:.1f} seconds",
+            err=True,
+        )
 
 
 def transfer_task_wait_with_io(
@@ -23,77 +53,159 @@ def transfer_task_wait_with_io(
     This does the core "task wait" loop, including all of the IO.
     It *does exit* on behalf of the caller. (We can enhance with a
     `noabort=True` param or somesuch in the future if necessary.)
+
+    The task is polled often at first, and then less and less often, up to once
+    every `polling_interval` seconds (see `PollingSchedule`). The task document
+    from the last poll is the one which is printed.
     """
+    schedule = PollingSchedule(polling_interval)
+    api_calls = 0
+    waited_time = 0.0
 
-    def timed_out(waited_time):
+    def timed_out():
         if timeout is None:
             return False
         else:
             return waited_time >= timeout
 
-    def check_completed():
-        completed = transfer_client.task_wait(
-            task_id, timeout=polling_interval, polling_interval=polling_interval
-        )
-        if completed:
-            if heartbeat:
-                click.echo("", err=True)
-            # meowing tasks wake up!
-            if meow:
-                click.echo(
-                    r"""
-                  _..
-  /}_{\           /.-'
- ( a a )-.___...-'/
- ==._.==         ;
-      \ i _..._ /,
-      {_;/   {_//""",
-                    err=True,
-                )
-
-            # TODO: possibly update TransferClient.task_wait so that we don't
-            # need to do an extra fetch to get the task status after completion
-            res = transfer_client.get_task(task_id)
-            formatted_print(res, text_format=FORMAT_SILENT)
-
-            status = res["status"]
-            if status == "SUCCEEDED":
-                click.get_current_context().exit(0)
-            else:
-                click.get_current_context().exit(1)
-
-        return completed
+    def get_task():
+        nonlocal api_calls
+        api_calls += 1
+        return transfer_client.get_task(task_id)
 
     # Tasks start out sleepy
     if meow:
-        click.echo(
-            r"""
-   |\      _,,,---,,_
-   /,`.-'`'    -.  ;-;;,_
-  |,4-  ) )-,_..;\ (  `'-'
- '---''(_/--'  `-'\_)""",
-            err=True,
-        )
+        click.echo(_SLEEPY_CAT, err=True)
 
-    waited_time = 0
-    while not timed_out(waited_time) and not check_completed():
+    res = get_task()
+    while res["status"] not in TERMINAL_TASK_STATUSES and not timed_out():
         if heartbeat:
             click.echo(".", err=True, nl=False)
             sys.stderr.flush()
 
-        waited_time += polling_interval
+        delay = schedule.next_delay()
+        if timeout is not None:
+            delay = min(delay, timeout - waited_time)
+        time.sleep(delay)
+        waited_time += delay
+        res = get_task()
 
-    # add a trailing newline to heartbeats if we fail
+    # add a trailing newline to heartbeats
     if heartbeat:
         click.echo("", err=True)
 
-    exit_code = 1
-    if timed_out(waited_time):
+    if res["status"] in TERMINAL_TASK_STATUSES:
+        # meowing tasks wake up!
+        if meow:
+            click.echo(_AWAKE_CAT, err=True)
+        exit_code = 0 if res["status"] == "SUCCEEDED" else 1
+    else:
         click.echo(f"Task has yet to complete after {timeout} seconds", err=True)
         exit_code = timeout_exit_code
 
+    _report_api_calls(api_calls, waited_time)
+
     # output json if requested, but nothing for text mode
-    res = transfer_client.get_task(task_id)
     formatted_print(res, text_format=FORMAT_SILENT)
 
     click.get_current_context().exit(exit_code)
+
+
+def transfer_tasks_wait_with_io(
+    transfer_client: CustomTransferClient,
+    meow,
+    heartbeat,
+    polling_interval,
+    timeout,
+    task_ids: Iterable[str],
+    timeout_exit_code,
+) -> None:
+    """
+    The "task wait" loop for several tasks at once, including all of the IO, and
+    the `--meow` easter egg.
+
+    All of the tasks are checked on each poll, with batched task_list calls (see
+    `TaskListPoller`), on the same schedule as a wait for a single task. Each task
+    is reported on stderr as it completes, and the completed tasks are printed at
+    the end (or, for NDJSON output, as they complete).
+
+    It *does exit* on behalf of the caller: with status 1 if any task failed or
+    was not found, with `timeout_exit_code` if any tasks had yet to complete at the
+    timeout, and with status 0 if all of the tasks succeeded.
+    """
+    poller = TaskListPoller(transfer_client, task_ids)
+    schedule = PollingSchedule(polling_interval)
+    waited_time = 0.0
+    total = len(poller.pending)
+    failed = 0
+    # whether a heartbeat line has been started on stderr
+    heartbeat_started = False
+
+    def end_heartbeat_line():
+        nonlocal heartbeat_started
+        if heartbeat_started:
+            click.echo("", err=True)
+            heartbeat_started = False
+
+    def completed_tasks():
+        nonlocal failed, heartbeat_started, waited_time
+        reported_not_found = 0
+        while True:
+            for task in poller.poll():
+                if task["status"] != "SUCCEEDED":
+                    failed += 1
+                end_heartbeat_line()
+                click.echo(
+                    f"Task {task['task_id']} {task['status']} "
+                    f"({total - len(poller.pending)} of {total} done)",
+                    err=True,
+                )
+                yield task
+            for task_id in poller.not_found[reported_not_found:]:
+                end_heartbeat_line()
+                click.echo(f"Task {task_id} was not found", err=True)
+            reported_not_found = len(poller.not_found)
+
+            if not poller.pending or (timeout is not None and waited_time >= timeout):
+                break
+            if heartbeat:
+                click.echo(".", err=True, nl=False)
+                sys.stderr.flush()
+                heartbeat_started = True
+            delay = schedule.next_delay()
+            if timeout is not None:
+                delay = min(delay, timeout - waited_time)
+            time.sleep(delay)
+            waited_time += delay
+        end_heartbeat_line()
+
+    # Tasks start out sleepy
+    if meow:
+        click.echo(_SLEEPY_CAT, err=True)
+
+    formatted_print(
+        completed_tasks(),
+        fields=(("Task ID", "task_id"), ("Status", "status"), ("Label", "label")),
+        json_converter=iterable_response_to_dict,
+    )
+
+    # meowing tasks wake up, once all of them are done!
+    if meow and not poller.pending:
+        click.echo(_AWAKE_CAT, err=True)
+
+    _report_api_calls(poller.api_calls, waited_time)
+
+    if poller.pending:
+        click.echo(
+            f"{len(poller.pending)} of {total} tasks have yet to complete after "
+            f"{timeout} seconds",
+            err=True,
+        )
+
+    if failed or poller.not_found:
+        exit_code = 1
+    elif poller.pending:
+        exit_code = timeout_exit_code
+    else:
+        exit_code = 0
+    click.get_current_context().exit(exit_code)
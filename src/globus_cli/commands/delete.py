@@ -5,6 +5,8 @@ from globus_cli import utils
 from globus_cli.login_manager import LoginManager
 from globus_cli.parsing import (
     ENDPOINT_PLUS_OPTPATH,
+    BatchLineParser,
+    NDJSONBatchParser,
     TaskPath,
     command,
     delete_and_rm_options,
@@ -71,6 +73,7 @@ def delete_command(
     *,
     login_manager: LoginManager,
     batch,
+    batch_format,
     ignore_missing,
     star_silent,
     recursive,
@@ -114,6 +117,10 @@ def delete_command(
 
     Empty lines and comments beginning with '#' are ignored.
 
+    \b
+    With `--batch-format ndjson`, each line is instead a JSON object of the form
+    {{"path": ...}}
+
     Batch only requires an ENDPOINT on the "base" command, but you may pass an
     ENPDOINT:PATH to prefix all the paths read in the batch with that path.
 
@@ -122,6 +129,8 @@ def delete_command(
     endpoint_id, path = endpoint_plus_path
     if path is None and (not batch):
         raise click.UsageError("delete requires either a PATH OR --batch")
+    if batch_format == "ndjson" and not batch:
+        raise click.UsageError("--batch-format can only be used with --batch")
 
     transfer_client = login_manager.get_transfer_client()
 
@@ -157,7 +166,17 @@ def delete_command(
             """
             delete_data.add_item(str(path))
 
-        utils.shlex_process_stream(process_batch_line, batch)
+        if batch_format == "ndjson":
+            NDJSONBatchParser(
+                delete_data.add_item, arguments=[("path", path)]
+            ).process_stream(batch)
+        else:
+            fast_parser = BatchLineParser(
+                delete_data.add_item, arguments=[("path", path)]
+            )
+            utils.shlex_process_stream(
+                process_batch_line, batch, fast_parser=fast_parser
+            )
     else:
         if not star_silent and enable_globs and path.endswith("*"):
             # not intuitive, but `click.confirm(abort=True)` prints to stdout
@@ -0,0 +1,133 @@
+from typing import Any, Dict
+
+import click
+
+from globus_cli.login_manager import LoginManager
+from globus_cli.parsing import ENDPOINT_PLUS_OPTPATH, command
+from globus_cli.services.transfer import (
+    DiskUsageAggregator,
+    autoactivate,
+    iterable_response_to_dict,
+)
+from globus_cli.termio import formatted_print
+
+
+@command(
+    "du",
+    short_help="Summarize the size of endpoint directory contents",
+    adoc_examples=r"""Show the total size of each directory under a path
+
+[source,bash]
+----
+$ ep_id=ddb59aef-6d04-11e5-ba46-22000b92c6ec
+$ globus du $ep_id:/share/godata/
+----
+
+Show only the grand total, as a single line of JSON
+
+[source,bash]
+----
+$ globus du $ep_id:/share/godata/ --max-depth 0 --format ndjson
+----
+""",
+)
+@click.argument("endpoint_plus_path", type=ENDPOINT_PLUS_OPTPATH)
+@click.option(
+    "--all",
+    "-a",
+    "show_hidden",
+    is_flag=True,
+    help="Include files and directories that start with `.`",
+)
+@click.option(
+    "--max-depth",
+    "-d",
+    default=1,
+    show_default=True,
+    type=click.IntRange(min=0),
+    metavar="INTEGER",
+    help=(
+        "Show totals for directories up to this many levels below the path. "
+        "A value of 0 shows only the grand total"
+    ),
+)
+@click.option(
+    "--recursive-depth-limit",
+    default=10,
+    show_default=True,
+    type=click.IntRange(min=0),
+    metavar="INTEGER",
+    help=(
+        "Limit the number of directories to traverse. The contents of deeper "
+        "directories are not counted"
+    ),
+)
+@click.option(
+    "--parallel",
+    default=1,
+    show_default=True,
+    type=click.IntRange(min=1),
+    metavar="INTEGER",
+    help="The number of directory listings to run concurrently",
+)
+@LoginManager.requires_login(LoginManager.TRANSFER_RS)
+def du_command(
+    *,
+    login_manager: LoginManager,
+    endpoint_plus_path,
+    show_hidden,
+    max_depth,
+    recursive_depth_limit,
+    parallel,
+):
+    """
+    Summarize the total size, number of files, and number of directories under a
+    directory on an endpoint, like `du`. If no path is given, the default
+    directory on that endpoint will be used.
+
+    Totals for each directory are printed as soon as the directory has been
+    completely listed, followed by the grand total for the path, shown as ".". Only
+    the totals of the directories which are still being listed are held in memory,
+    so very large trees can be summarized.
+
+    If using text output, each line shows the size in bytes, the number of files,
+    and the directory path, separated by tabs.
+
+    {AUTOMATIC_ACTIVATION}
+    """
+    endpoint_id, path = endpoint_plus_path
+
+    transfer_client = login_manager.get_transfer_client()
+    autoactivate(transfer_client, endpoint_id, if_expires_in=60)
+
+    ls_params: Dict[str, Any] = {"show_hidden": int(show_hidden)}
+    if path:
+        ls_params["path"] = path
+
+    aggregator = DiskUsageAggregator(
+        walk_depth=recursive_depth_limit, report_depth=max_depth
+    )
+    res = aggregator.aggregate(
+        transfer_client.recursive_operation_ls(
+            endpoint_id,
+            ls_params,
+            depth=recursive_depth_limit,
+            max_workers=parallel,
+            compact_items=True,
+        )
+    )
+
+    def print_totals(data):
+        for record in data:
+            click.echo(f"{record['size']}\t{record['file_count']}\t{record['path']}")
+
+    formatted_print(
+        res, text_format=print_totals, json_converter=iterable_response_to_dict
+    )
+
+    if aggregator.unlisted_dirs:
+        click.echo(
+            f"{aggregator.unlisted_dirs} directories were below the "
+            "--recursive-depth-limit and their contents were not counted",
+            err=True,
+        )
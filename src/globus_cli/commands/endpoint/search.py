@@ -1,11 +1,11 @@
-from typing import Optional
+from typing import Any, Dict, List, Optional
 
 import click
 
 from globus_cli.login_manager import LoginManager
-from globus_cli.parsing import command
+from globus_cli.parsing import api_fields_option, command
 from globus_cli.services.transfer import ENDPOINT_LIST_FIELDS, iterable_response_to_dict
-from globus_cli.termio import formatted_print
+from globus_cli.termio import api_fields_param, formatted_print
 from globus_cli.utils import PagingWrapper
 
 
@@ -66,6 +66,7 @@ $ globus endpoint search --filter-scope my-endpoints
     type=click.IntRange(1, 1000),
     help="The maximum number of results to return.",
 )
+@api_fields_option
 @click.argument("filter_fulltext", required=False)
 @LoginManager.requires_login(LoginManager.AUTH_RS, LoginManager.TRANSFER_RS)
 def endpoint_search(
@@ -75,6 +76,7 @@ def endpoint_search(
     limit: int,
     filter_owner_id: Optional[str],
     filter_scope: Optional[str],
+    api_fields: Optional[List[str]],
 ) -> None:
     """
     Search for Globus endpoints with search filters. If --filter-scope is set to the
@@ -99,11 +101,18 @@ def endpoint_search(
     if owner_id:
         owner_id = auth_client.maybe_lookup_identity_id(owner_id)
 
+    # only request the parts of each endpoint document which will be shown
+    query_params: Dict[str, Any] = {}
+    fields_param = api_fields_param(ENDPOINT_LIST_FIELDS, api_fields)
+    if fields_param is not None:
+        query_params["fields"] = fields_param
+
     search_iterator = PagingWrapper(
         transfer_client.paginated.endpoint_search(
             filter_fulltext=filter_fulltext,
             filter_scope=filter_scope,
             filter_owner_id=owner_id,
+            query_params=query_params,
         ).items(),
         limit=limit,
     )
@@ -3,14 +3,21 @@ from typing import Any, Dict, Union
 import click
 from globus_sdk.services.transfer.response import IterableTransferResponse
 
-from globus_cli.login_manager import LoginManager
+from globus_cli.login_manager import LoginManager, token_storage_adapter
 from globus_cli.parsing import ENDPOINT_PLUS_OPTPATH, command
 from globus_cli.services.transfer import (
+    LsCache,
     RecursiveLsResponse,
     autoactivate,
     iterable_response_to_dict,
 )
-from globus_cli.termio import formatted_print, is_verbose, outformat_is_text
+from globus_cli.termio import (
+    FORMAT_TEXT_TABLE,
+    formatted_print,
+    is_verbose,
+    outformat_is_ndjson,
+    outformat_is_text,
+)
 
 
 @command(
@@ -119,6 +126,65 @@ $ globus ls $ep_id:/share/godata/ --filter '~*.txt'  # done with --filter, bette
         "this should behave like a non-recursive `ls`"
     ),
 )
+@click.option(
+    "--parallel",
+    default=1,
+    show_default=True,
+    type=click.IntRange(min=1),
+    metavar="INTEGER",
+    help=(
+        "The number of directory listings to run concurrently in `--recursive` "
+        "listings. Results are shown in the same order regardless of this value"
+    ),
+)
+@click.option(
+    "--recursive-filter-mode",
+    type=click.Choice(("prune", "search"), case_sensitive=False),
+    default="prune",
+    show_default=True,
+    help=(
+        "How `--filter` applies to `--recursive` listings. 'prune' only descends "
+        "into directories which match the filter. 'search' descends into every "
+        "directory and shows the items which match the filter at any depth"
+    ),
+)
+@click.option(
+    "--checkpoint",
+    "checkpoint_file",
+    type=click.Path(dir_okay=False),
+    help=(
+        "For `--recursive` listings only. Periodically save the progress of the "
+        "listing to this file. If the file already exists, resume the listing "
+        "from it, skipping directories which were already shown. The file is "
+        "removed when the listing completes. Requires the default text output or "
+        "'--format ndjson'"
+    ),
+)
+@click.option(
+    "--cache-ttl",
+    default=0,
+    type=click.IntRange(min=0),
+    metavar="SECONDS",
+    envvar="GLOBUS_CLI_LS_CACHE_TTL",
+    help=(
+        "Cache listings locally, and reuse cached listings which are less than "
+        "this many seconds old. Can also be set with GLOBUS_CLI_LS_CACHE_TTL. "
+        "The default of 0 disables the cache"
+    ),
+)
+@click.option(
+    "--no-cache",
+    is_flag=True,
+    help="Do not read or write the local listing cache, even if it is enabled",
+)
+@click.option(
+    "--refresh",
+    is_flag=True,
+    help=(
+        "Do not use cached listings, but store the new listings in the cache "
+        "if it is enabled"
+    ),
+)
 @LoginManager.requires_login(LoginManager.TRANSFER_RS)
 def ls_command(
     *,
@@ -126,6 +192,12 @@ def ls_command(
     endpoint_plus_path,
     recursive_depth_limit,
     recursive,
+    parallel,
+    recursive_filter_mode,
+    checkpoint_file,
+    cache_ttl,
+    no_cache,
+    refresh,
     long_output,
     show_hidden,
     filter_val,
@@ -137,6 +209,10 @@ def ls_command(
     If using text output files and directories are printed with one entry per line in
     alphabetical order.  Directories are always displayed with a trailing '/'.
 
+    With '--format ndjson', each file and directory is printed as a compact JSON
+    object on its own line. Recursive listings are printed as they are walked,
+    rather than being collected into a single document.
+
 
     \b
     === Filtering
@@ -156,15 +232,50 @@ def ls_command(
     \b
     "~*.txt" matches all .txt files, for example
 
+    With --recursive, the filter also applies to the directories which are
+    traversed, so only directories matching the filter are descended into. Use
+    '--recursive-filter-mode search' to descend into every directory and show only
+    the items matching the filter. This finds matches at any depth while only
+    transferring the directory names and the matching items.
+
+    \b
+    === Caching
+
+    With --cache-ttl (or GLOBUS_CLI_LS_CACHE_TTL), listings are cached locally and
+    repeated listings of the same path with the same options are answered from the
+    cache until they expire. Listings of recursive ls are cached per directory.
+    The mkdir, rename, delete, and rm commands remove any cached listings of the
+    paths they change and of their parent directories. Changes made in other ways
+    are not seen until the cached listings expire.
+
     {AUTOMATIC_ACTIVATION}
     """
     endpoint_id, path = endpoint_plus_path
 
+    if checkpoint_file:
+        if not recursive:
+            raise click.UsageError("--checkpoint can only be used with --recursive")
+        # resuming skips directories which were already listed, so it is only safe
+        # when each item is printed as soon as it is listed
+        streaming = outformat_is_ndjson() or (
+            outformat_is_text() and not (long_output or is_verbose())
+        )
+        if not streaming:
+            raise click.UsageError(
+                "--checkpoint can only be used with the default text output "
+                "or '--format ndjson'"
+            )
+
     # do autoactivation before the `ls` call so that recursive invocations
     # won't do this repeatedly, and won't have to instantiate new clients
     transfer_client = login_manager.get_transfer_client()
     autoactivate(transfer_client, endpoint_id, if_expires_in=60)
 
+    if cache_ttl and not no_cache:
+        transfer_client.ls_cache = LsCache.open_default(
+            namespace=token_storage_adapter().namespace, ttl=cache_ttl, refresh=refresh
+        )
+
     # create the query paramaters to send to operation_ls
     ls_params: Dict[str, Any] = {"show_hidden": int(show_hidden)}
     if path:
@@ -181,15 +292,20 @@ def ls_command(
     # get the `ls` result
     if recursive:
         # NOTE:
-        # --recursive and --filter have an interplay that some users may find
-        # surprising
-        # if we're asked to change or "improve" the behavior in the future, we
-        # could do so with "type:dir" or "type:file" filters added in, and
-        # potentially work out some viable behavior based on what people want
+        # by default, --recursive and --filter have an interplay that some users
+        # may find surprising: the filter also prunes the directories walked
+        # in "search" mode, directories are found with a separate "type:dir"
+        # listing, so the filter only applies to the items shown
         res: Union[
             IterableTransferResponse, RecursiveLsResponse
         ] = transfer_client.recursive_operation_ls(
-            endpoint_id, ls_params, depth=recursive_depth_limit
+            endpoint_id,
+            ls_params,
+            depth=recursive_depth_limit,
+            max_workers=parallel,
+            checkpoint_file=checkpoint_file,
+            filter_items_only=recursive_filter_mode == "search",
+            compact_items=True,
         )
     else:
         res = transfer_client.operation_ls(endpoint_id, **ls_params)
@@ -197,6 +313,11 @@ def ls_command(
     def cleaned_item_name(item):
         return item["name"] + ("/" if item["type"] == "dir" else "")
 
+    def print_item_names(data):
+        # print names as they arrive, rather than after the listing completes
+        for item in data:
+            click.echo(cleaned_item_name(item))
+
     # and then print it, per formatting rules
     formatted_print(
         res,
@@ -209,10 +330,8 @@ def ls_command(
             ("File Type", "type"),
             ("Filename", cleaned_item_name),
         ],
-        simple_text=(
-            None
-            if long_output or is_verbose() or not outformat_is_text()
-            else "\n".join(cleaned_item_name(x) for x in res)
+        text_format=(
+            FORMAT_TEXT_TABLE if long_output or is_verbose() else print_item_names
         ),
         json_converter=iterable_response_to_dict,
     )
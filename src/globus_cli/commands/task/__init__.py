@@ -2,8 +2,10 @@ from globus_cli.commands.task.cancel import cancel_task
 from globus_cli.commands.task.event_list import task_event_list
 from globus_cli.commands.task.generate_submission_id import generate_submission_id
 from globus_cli.commands.task.list import task_list
+from globus_cli.commands.task.monitor import task_monitor
 from globus_cli.commands.task.pause_info import task_pause_info
 from globus_cli.commands.task.show import show_task
+from globus_cli.commands.task.sync import task_sync
 from globus_cli.commands.task.update import update_task
 from globus_cli.commands.task.wait import task_wait
 from globus_cli.parsing import group
@@ -21,4 +23,6 @@ task_command.add_command(cancel_task)
 task_command.add_command(task_event_list)
 task_command.add_command(task_pause_info)
 task_command.add_command(task_wait)
+task_command.add_command(task_monitor)
+task_command.add_command(task_sync)
 task_command.add_command(generate_submission_id)
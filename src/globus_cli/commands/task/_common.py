@@ -1,5 +1,5 @@
 import functools
-from typing import Callable, Optional
+from typing import IO, Callable, Iterable, List, Optional
 
 import click
 
@@ -12,3 +12,20 @@ def task_id_arg(f: Optional[Callable] = None, *, required=True):
     if f is None:
         return functools.partial(task_id_arg, required=required)
     return click.argument("TASK_ID", required=required)(f)
+
+
+def task_ids_from_args(
+    task_ids: Iterable[str], from_file: Optional[IO[str]]
+) -> List[str]:
+    """
+    Combine the task IDs given as arguments with those read from a --from-file,
+    where blank lines and lines starting with '#' are ignored.
+    """
+    result = list(task_ids)
+    if from_file:
+        result.extend(
+            line.strip()
+            for line in from_file
+            if line.strip() and not line.lstrip().startswith("#")
+        )
+    return result
@@ -1,4 +1,7 @@
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
 import click
+import globus_sdk
 
 from globus_cli.login_manager import LoginManager
 from globus_cli.parsing import command
@@ -6,6 +9,9 @@ from globus_cli.termio import FORMAT_TEXT_RAW, formatted_print
 
 from ._common import task_id_arg
 
+# the default number of cancellations to have in flight at once with --all
+CANCEL_ALL_MAX_PARALLEL = 8
+
 
 @command(
     "cancel",
@@ -21,8 +27,9 @@ requested output format.
 
 If '--all' is requested, output will contain all task IDs which were
 cancelled. If, in addition to this, the output format is text, the results will
-be streamed as tasks are cancelled. JSON output is buffered and printed all at
-once, after all of the cancellations.
+be streamed as tasks are cancelled, in the order in which the cancellations
+complete. JSON output is buffered and printed all at once, after all of the
+cancellations, with the results in the same order as the task IDs.
 
 When '--all' is not passed, output is a simple success message indicating that
 the task was cancelled, or an error.
@@ -46,8 +53,17 @@ $ globus task cancel --all
 @click.option(
     "--all", "-a", is_flag=True, help="Cancel all in-progress tasks that you own"
 )
+@click.option(
+    "--max-parallel",
+    type=click.IntRange(min=1),
+    metavar="INTEGER",
+    help=(
+        "With --all, the maximum number of tasks to cancel at once "
+        f"[default: {CANCEL_ALL_MAX_PARALLEL}]"
+    ),
+)
 @LoginManager.requires_login(LoginManager.TRANSFER_RS)
-def cancel_task(*, login_manager: LoginManager, all, task_id):
+def cancel_task(*, login_manager: LoginManager, all, task_id, max_parallel):
     """
     Cancel a task you own or all tasks which you own.
 
@@ -55,6 +71,10 @@ def cancel_task(*, login_manager: LoginManager, all, task_id):
     you may have which have not started execution.
 
     You must either provide the '--all' option or a 'TASK_ID'.
+
+    With '--all', several tasks are cancelled at once, up to '--max-parallel'. If
+    any of the cancellations fail, the others still go ahead, and the command
+    exits with status 1.
     """
 
     if bool(all) + bool(task_id) != 1:
@@ -63,32 +83,55 @@ def cancel_task(*, login_manager: LoginManager, all, task_id):
             "to cancel all in-progress tasks OR a single "
             "task ID to cancel."
         )
+    if max_parallel is not None and not all:
+        raise click.UsageError("--max-parallel can only be used with --all")
 
     transfer_client = login_manager.get_transfer_client()
 
     if all:
-        task_ids = [
-            task_row["task_id"]
-            for task_row in transfer_client.paginated.task_list(
-                query_params={
-                    "filter": "type:TRANSFER,DELETE/status:ACTIVE,INACTIVE",
-                    "fields": "task_id",
-                }
-            ).items()
-        ]
+        # a task may show up on more than one page if the list changes while it is
+        # being read, but it is only cancelled once
+        task_ids = list(
+            dict.fromkeys(
+                task_row["task_id"]
+                for task_row in transfer_client.paginated.task_list(
+                    query_params={
+                        "filter": "type:TRANSFER,DELETE/status:ACTIVE,INACTIVE",
+                        "fields": "task_id",
+                    }
+                ).items()
+            )
+        )
 
         task_count = len(task_ids)
 
         if not task_ids:
             raise click.ClickException("You have no in-progress tasks.")
 
+        failed = 0
+
         def cancellation_iterator():
-            for i in task_ids:
-                yield (i, transfer_client.cancel_task(i).data)
+            nonlocal failed
+            # each task is cancelled exactly once, and the results are produced as
+            # the cancellations complete
+            with ThreadPoolExecutor(
+                max_workers=max_parallel or CANCEL_ALL_MAX_PARALLEL
+            ) as executor:
+                futures = {
+                    executor.submit(transfer_client.cancel_task, i): i for i in task_ids
+                }
+                for future in as_completed(futures):
+                    try:
+                        data = future.result().data
+                    except globus_sdk.GlobusAPIError as err:
+                        failed += 1
+                        data = {"code": err.code, "message": err.message}
+                    yield (futures[future], data)
 
         def json_converter(res):
+            results = dict(cancellation_iterator())
             return {
-                "results": [x for i, x in cancellation_iterator()],
+                "results": [results[i] for i in task_ids],
                 "task_ids": task_ids,
             }
 
@@ -102,6 +145,9 @@ def cancel_task(*, login_manager: LoginManager, all, task_id):
         # handling this?
         formatted_print(None, text_format=_custom_text, json_converter=json_converter)
 
+        if failed:
+            click.get_current_context().exit(1)
+
     else:
         res = transfer_client.cancel_task(task_id)
         formatted_print(res, text_format=FORMAT_TEXT_RAW, response_key="message")
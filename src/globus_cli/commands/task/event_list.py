@@ -1,17 +1,100 @@
 import json
+import sys
+import time
 import uuid
 
 import click
 
 from globus_cli.login_manager import LoginManager
 from globus_cli.parsing import command
-from globus_cli.services.transfer import iterable_response_to_dict
-from globus_cli.termio import formatted_print
+from globus_cli.services.transfer import (
+    TERMINAL_TASK_STATUSES,
+    PollingSchedule,
+    TaskEventFollower,
+    iterable_response_to_dict,
+)
+from globus_cli.termio import (
+    formatted_print,
+    is_verbose,
+    outformat_is_ndjson,
+    outformat_is_text,
+)
 from globus_cli.utils import PagingWrapper
 
 from ._common import task_id_arg
 
 
+def squashed_json_details(x):
+    is_json = False
+    try:
+        loaded = json.loads(x["details"])
+        is_json = True
+    except ValueError:
+        loaded = x["details"]
+
+    if is_json:
+        return json.dumps(loaded, separators=(",", ":"), sort_keys=True)
+    else:
+        return loaded.replace("\n", "\\n")
+
+
+def _print_followed_events(events):
+    for event in events:
+        if outformat_is_ndjson():
+            click.echo(json.dumps(event, separators=(",", ":"), sort_keys=True))
+        else:
+            click.echo(
+                " | ".join(
+                    (
+                        event["time"],
+                        event["code"],
+                        str(event["is_error"]),
+                        squashed_json_details(event),
+                    )
+                )
+            )
+    # new events are shown as soon as they are seen, even when piped
+    sys.stdout.flush()
+
+
+def follow_task_events(
+    transfer_client, task_id, filter_string, limit, polling_interval
+):
+    """
+    Print the most recent events of a task, and then each new event, until the
+    task completes. Then exit, with the status of the task.
+
+    The status of the task is only checked when a poll finds no new events, as a
+    task which has just completed produces no more.
+    """
+    follower = TaskEventFollower(transfer_client, task_id, event_filter=filter_string)
+    schedule = PollingSchedule(polling_interval)
+    task_checks = 0
+
+    _print_followed_events(follower.poll(limit=limit))
+    while True:
+        time.sleep(schedule.next_delay())
+        events = follower.poll()
+        if events:
+            _print_followed_events(events)
+            schedule.reset()
+            continue
+
+        task_checks += 1
+        status = transfer_client.get_task(task_id)["status"]
+        if status in TERMINAL_TASK_STATUSES:
+            # events from just before the task completed
+            _print_followed_events(follower.poll())
+            break
+
+    if is_verbose():
+        click.echo(
+            f"Made {follower.api_calls + task_checks} API calls while following",
+            err=True,
+        )
+    click.get_current_context().exit(0 if status == "SUCCEEDED" else 1)
+
+
 @command(
     "event-list",
     short_help="List events for a given task",
@@ -35,6 +118,13 @@ from ._common import task_id_arg
 ----
 $ globus task pause-info TASK_ID --format JSON
 ----
+
+Print the errors of a task as they happen, until it completes:
+
+[source,bash]
+----
+$ globus task event-list --follow --filter-errors TASK_ID
+----
 """,
 )
 @task_id_arg
@@ -43,6 +133,25 @@ $ globus task pause-info TASK_ID --format JSON
 )
 @click.option("--filter-errors", is_flag=True, help="Filter results to errors")
 @click.option("--filter-non-errors", is_flag=True, help="Filter results to non errors")
+@click.option(
+    "--follow",
+    "-f",
+    is_flag=True,
+    help=(
+        "After showing the most recent events, keep printing new events as they "
+        "happen, until the task completes"
+    ),
+)
+@click.option(
+    "--polling-interval",
+    type=click.IntRange(min=1),
+    default=10,
+    show_default=True,
+    help=(
+        "With --follow, the longest time, in seconds, between checks for new "
+        "events. Checks are more frequent just after new events are seen"
+    ),
+)
 @LoginManager.requires_login(LoginManager.TRANSFER_RS)
 def task_event_list(
     *,
@@ -50,7 +159,9 @@ def task_event_list(
     task_id: uuid.UUID,
     limit: int,
     filter_errors: bool,
-    filter_non_errors: bool
+    filter_non_errors: bool,
+    follow: bool,
+    polling_interval: int,
 ):
     """
     This command shows the recent events for a running task.
@@ -62,6 +173,16 @@ def task_event_list(
     Events may be filtered using '--filter-errors' or '--filter-non-errors', but
     these two options may not be used in tandem.
 
+    With '--follow', the command keeps checking for new events, and prints each
+    one as it is seen, oldest first, like 'tail -f'. The first check prints the
+    '--limit' most recent events, along with any others from the same time as
+    the oldest of them. Only the events since the last check are fetched each
+    time. Checks are made often just after new events
+    are seen, and less and less often (up to the '--polling-interval') while
+    there are none. When the task completes, the command exits with status 0 if
+    it succeeded and 1 if it failed. Text output prints one line per event, and
+    '--format ndjson' prints one JSON object per event.
+
     NOTE: Tasks older than one month may no longer have event log history. In this
     case, no events will be shown.
     """
@@ -80,6 +201,17 @@ def task_event_list(
     else:
         filter_string = ""
 
+    if follow:
+        if not (outformat_is_text() or outformat_is_ndjson()):
+            raise click.UsageError(
+                "--follow can only be used with the default text output "
+                "or '--format ndjson'"
+            )
+        follow_task_events(
+            transfer_client, task_id, filter_string, limit, polling_interval
+        )
+        return
+
     event_iterator = PagingWrapper(
         transfer_client.paginated.task_event_list(
             task_id,
@@ -89,19 +221,6 @@ def task_event_list(
         limit=limit,
     )
 
-    def squashed_json_details(x):
-        is_json = False
-        try:
-            loaded = json.loads(x["details"])
-            is_json = True
-        except ValueError:
-            loaded = x["details"]
-
-        if is_json:
-            return json.dumps(loaded, separators=(",", ":"), sort_keys=True)
-        else:
-            return loaded.replace("\n", "\\n")
-
     formatted_print(
         event_iterator,
         fields=(
@@ -1,9 +1,9 @@
 import click
 
-from globus_cli.login_manager import LoginManager
-from globus_cli.parsing import command
-from globus_cli.services.transfer import iterable_response_to_dict
-from globus_cli.termio import formatted_print
+from globus_cli.login_manager import LoginManager, token_storage_adapter
+from globus_cli.parsing import api_fields_option, command
+from globus_cli.services.transfer import TaskDatabase, iterable_response_to_dict
+from globus_cli.termio import api_fields_param, formatted_print
 from globus_cli.utils import PagingWrapper
 
 
@@ -75,9 +75,21 @@ globus task list --format=unix --jmespath='DATA[*].[task_id, status]' | \
     awk '{printf "Task %s is currently %s\n", $1, $2;
           printf "View at https://app.globus.org/activity/%s\n\n", $1}'
 ----
+
+List all of the failed tasks in the local copy made by 'globus task sync':
+
+[source,bash]
+----
+$ globus task list --local --limit 0 --filter-status FAILED
+----
 """,  # noqa: E501
 )
-@click.option("--limit", default=10, show_default=True, help="Limit number of results.")
+@click.option(
+    "--limit",
+    default=10,
+    show_default=True,
+    help="Limit number of results. With --local, 0 shows all results.",
+)
 @click.option(
     "--filter-task-id",
     multiple=True,
@@ -143,11 +155,21 @@ globus task list --format=unix --jmespath='DATA[*].[task_id, status]' | \
     callback=_format_date_callback,
     help="Filter results to tasks that were completed before given time.",
 )
+@click.option(
+    "--local",
+    is_flag=True,
+    help=(
+        "List tasks from the local copy made by 'globus task sync', rather than "
+        "from the Transfer service"
+    ),
+)
+@api_fields_option
 @LoginManager.requires_login(LoginManager.TRANSFER_RS)
 def task_list(
     *,
     login_manager: LoginManager,
     limit,
+    local,
     filter_task_id,
     filter_status,
     filter_type,
@@ -158,13 +180,61 @@ def task_list(
     filter_requested_before,
     filter_completed_after,
     filter_completed_before,
+    api_fields,
 ):
     """
     List tasks for the current user.
 
     This lists your most recent tasks. The tasks displayed may be filtered by a number
     of attributes, each with a separate commandline option.
+
+    With --local, tasks are read from a local database which is kept up to date by
+    'globus task sync', so no calls are made to the Transfer service. Task
+    statuses are as of the last sync.
     """
+    fields = [
+        ("Task ID", "task_id"),
+        ("Status", "status"),
+        ("Type", "type"),
+        ("Source Display Name", "source_endpoint_display_name"),
+        ("Dest Display Name", "destination_endpoint_display_name"),
+        ("Label", "label"),
+    ]
+    # only request the parts of each task document which will be shown
+    fields_param = api_fields_param(fields, api_fields)
+
+    if local:
+        task_db = TaskDatabase.open_existing(
+            namespace=token_storage_adapter().namespace
+        )
+        if task_db is None:
+            raise click.UsageError(
+                "There is no local copy of your tasks. Run 'globus task sync' first."
+            )
+        try:
+            tasks = task_db.query(
+                task_ids=filter_task_id,
+                statuses=filter_status,
+                task_type=filter_type,
+                labels=filter_label,
+                not_labels=filter_not_label,
+                inexact=inexact,
+                requested_after=filter_requested_after,
+                requested_before=filter_requested_before,
+                completed_after=filter_completed_after,
+                completed_before=filter_completed_before,
+                limit=limit or None,
+            )
+            if api_fields:
+                # trim the stored documents as the service would have
+                keys = fields_param.split(",")
+                tasks = ({k: t[k] for k in keys if k in t} for t in tasks)
+            formatted_print(
+                tasks, fields=fields, json_converter=iterable_response_to_dict
+            )
+        finally:
+            task_db.close()
+        return
 
     def _process_filterval(prefix, value, default=None):
         if value:
@@ -202,22 +272,15 @@ def task_list(
         "completion_time", [filter_completed_after, filter_completed_before]
     )
 
+    query_params = {"filter": filter_string[:-1]}  # remove trailing /
+    if fields_param is not None:
+        query_params["fields"] = fields_param
+
     transfer_client = login_manager.get_transfer_client()
     task_iterator = PagingWrapper(
-        transfer_client.paginated.task_list(
-            query_params={"filter": filter_string[:-1]},  # remove trailing /
-        ).items(),
+        transfer_client.paginated.task_list(query_params=query_params).items(),
         limit=limit,
     )
-
-    fields = [
-        ("Task ID", "task_id"),
-        ("Status", "status"),
-        ("Type", "type"),
-        ("Source Display Name", "source_endpoint_display_name"),
-        ("Dest Display Name", "destination_endpoint_display_name"),
-        ("Label", "label"),
-    ]
     formatted_print(
         task_iterator, fields=fields, json_converter=iterable_response_to_dict
     )
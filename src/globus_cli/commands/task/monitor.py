@@ -0,0 +1,205 @@
+import datetime
+import json
+import sys
+import time
+
+import click
+
+from globus_cli.login_manager import LoginManager
+from globus_cli.parsing import command
+from globus_cli.services.transfer import ThroughputMonitor
+from globus_cli.termio import (
+    formatted_print,
+    is_verbose,
+    out_is_terminal,
+    outformat_is_ndjson,
+    outformat_is_text,
+)
+
+from ._common import task_ids_from_args
+
+# the largest number of active tasks which are found when no task IDs are given
+MONITOR_DISCOVER_LIMIT = 1000
+
+
+def _format_bytes(value):
+    for unit in ("B", "KB", "MB", "GB", "TB"):
+        if abs(value) < 1000 or unit == "TB":
+            break
+        value /= 1000
+    return f"{value:.1f} {unit}" if unit != "B" else f"{value:.0f} B"
+
+
+def _format_rate(value, fmt):
+    if value is None:
+        return "-"
+    return fmt(value)
+
+
+MONITOR_FIELDS = [
+    ("Task ID", "task_id"),
+    ("Status", "status"),
+    ("Files", lambda row: f"{row['files_transferred']}/{row['files']}"),
+    (
+        "Subtasks",
+        lambda row: f"{row['subtasks_succeeded']}/{row['subtasks_total']}",
+    ),
+    ("Transferred", lambda row: _format_bytes(row["bytes_transferred"])),
+    (
+        "Bytes/s",
+        lambda row: _format_rate(
+            row["bytes_per_second"], lambda x: _format_bytes(x) + "/s"
+        ),
+    ),
+    ("Files/s", lambda row: _format_rate(row["files_per_second"], "{:.1f}".format)),
+]
+
+
+def _active_task_ids(transfer_client):
+    res = transfer_client.task_list(
+        limit=MONITOR_DISCOVER_LIMIT,
+        filter={"status": ["ACTIVE", "INACTIVE"], "type": ["TRANSFER", "DELETE"]},
+    )
+    return [task["task_id"] for task in res]
+
+
+@command(
+    "monitor",
+    short_help="Show the live throughput of several tasks",
+    adoc_output="""When text output is requested, a table of the tasks is printed
+after each check, and redrawn in place on a terminal. The following fields are
+used, with a final row for the totals of all of the tasks:
+
+- 'Task ID'
+- 'Status'
+- 'Files'
+- 'Subtasks'
+- 'Transferred'
+- 'Bytes/s'
+- 'Files/s'
+
+When NDJSON output is requested, each check prints one JSON object, with the
+time of the check, the "totals" of all of the tasks, and a row for each of the
+"tasks".
+""",
+    adoc_examples="""Watch the throughput of all of your active tasks:
+
+[source,bash]
+----
+$ globus task monitor
+----
+
+Record the progress of the tasks listed in a file once a minute:
+
+[source,bash]
+----
+$ globus task monitor --interval 60 -F ndjson --from-file task_ids.txt >> log.ndjson
+----
+""",
+)
+@click.argument("TASK_ID", nargs=-1)
+@click.option(
+    "--from-file",
+    type=click.File("r"),
+    help=(
+        "Read task IDs from this file, one per line, in addition to any given as "
+        "arguments. Use the special `-` value to read from stdin"
+    ),
+)
+@click.option(
+    "--interval",
+    type=click.IntRange(min=1),
+    default=5,
+    show_default=True,
+    help="The time, in seconds, between checks of the tasks",
+)
+@click.option(
+    "--count",
+    type=click.IntRange(min=1),
+    help="Stop after this many checks, even if some tasks have not completed",
+)
+@LoginManager.requires_login(LoginManager.TRANSFER_RS)
+def task_monitor(*, login_manager: LoginManager, task_id, from_file, interval, count):
+    """
+    Show the progress and throughput of several tasks, updated every interval
+    until all of them complete.
+
+    Tasks can be given as arguments, or with --from-file (where blank lines and
+    lines starting with '#' are ignored). If no tasks are given, all of your
+    active tasks are monitored.
+
+    All of the tasks are checked together, with one call to the Transfer service
+    for each batch of tasks. The rates of each task are computed from the changes
+    in its number of bytes, files, and subtasks transferred since the previous
+    check, so they are only shown from the second check on.
+    """
+    if not (outformat_is_text() or outformat_is_ndjson()):
+        raise click.UsageError(
+            "task monitor can only be used with the default text output "
+            "or '--format ndjson'"
+        )
+
+    transfer_client = login_manager.get_transfer_client()
+    # the service reports task IDs in lowercase
+    task_ids = [t.lower() for t in task_ids_from_args(task_id, from_file)]
+    if not task_ids and not from_file:
+        task_ids = _active_task_ids(transfer_client)
+    if not task_ids:
+        click.echo("No tasks to monitor", err=True)
+        return
+
+    monitor = ThroughputMonitor(transfer_client, task_ids)
+    # on a terminal, each table replaces the last one. The screen is cleared
+    # rather than only the lines of the last table, as long rows may wrap
+    redraw = outformat_is_text() and out_is_terminal()
+    reported_not_found = 0
+    checks = 0
+
+    def report_not_found():
+        nonlocal reported_not_found
+        for missing_id in monitor.not_found[reported_not_found:]:
+            click.echo(f"Task {missing_id} was not found", err=True)
+        reported_not_found = len(monitor.not_found)
+
+    try:
+        while True:
+            rows = monitor.sample()
+            checks += 1
+            # when redrawing, these would be cleared along with the table, so
+            # they are reported once monitoring stops
+            if not redraw:
+                report_not_found()
+
+            totals = monitor.totals(rows)
+            if outformat_is_ndjson():
+                sample = {
+                    "time": datetime.datetime.now(datetime.timezone.utc).isoformat(
+                        timespec="seconds"
+                    ),
+                    "totals": totals,
+                    "tasks": rows,
+                }
+                click.echo(json.dumps(sample, separators=(",", ":"), sort_keys=True))
+            else:
+                if redraw:
+                    # move to the top left of the screen, and clear it
+                    # (color=True stops click from stripping the escape codes)
+                    click.echo("\x1b[H\x1b[2J", nl=False, color=True)
+                elif checks > 1:
+                    click.echo()
+                total_row = {
+                    **totals,
+                    "task_id": "TOTAL",
+                    "status": f"{totals['active_tasks']}/{totals['tasks']} ACTIVE",
+                }
+                formatted_print(rows + [total_row], fields=MONITOR_FIELDS)
+            sys.stdout.flush()
+
+            if monitor.done or (count is not None and checks >= count):
+                break
+            time.sleep(interval)
+    finally:
+        report_not_found()
+
+    if is_verbose():
+        click.echo(f"Made {monitor.api_calls} API calls while monitoring", err=True)
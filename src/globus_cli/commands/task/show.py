@@ -2,7 +2,10 @@ import click
 
 from globus_cli.login_manager import LoginManager
 from globus_cli.parsing import command, mutex_option_group
-from globus_cli.services.transfer import iterable_response_to_dict
+from globus_cli.services.transfer import (
+    ResumableNDJSONExport,
+    iterable_response_to_dict,
+)
 from globus_cli.termio import FORMAT_TEXT_RECORD, formatted_print
 
 from ._common import task_id_arg
@@ -75,6 +78,36 @@ def print_skipped_errors(client, task_id):
     )
 
 
+EXPORT_FIELDS = [
+    ("Task ID", "task_id"),
+    ("Export File", "filename"),
+    ("Items", "items"),
+    ("Resumed", "resumed"),
+]
+
+
+def export_task_paths(client, task_id, filename, *, skipped_errors):
+    if skipped_errors:
+        kind, method = "skipped_errors", client.paginated.task_skipped_errors
+    else:
+        kind, method = (
+            "successful_transfers",
+            client.paginated.task_successful_transfers,
+        )
+    export = ResumableNDJSONExport(filename, {"task_id": str(task_id), "kind": kind})
+    export.run(lambda marker: method(task_id, marker=marker).pages())
+    formatted_print(
+        {
+            "task_id": str(task_id),
+            "filename": filename,
+            "items": export.item_count,
+            "resumed": export.resumed,
+        },
+        text_format=FORMAT_TEXT_RECORD,
+        fields=EXPORT_FIELDS,
+    )
+
+
 def print_task_detail(client, task_id):
     res = client.get_task(task_id)
     formatted_print(
@@ -129,6 +162,13 @@ If *--successful-transfers* is given, the following fields are used:
 
 - 'Source Path'
 - 'Destination Path'
+
+If *--export* is given, the following fields are used:
+
+- 'Task ID'
+- 'Export File'
+- 'Items'
+- 'Resumed'
 """,
     adoc_examples="""Show detailed info about a task as text
 
@@ -136,6 +176,14 @@ If *--successful-transfers* is given, the following fields are used:
 ----
 $ globus task show TASK_ID
 ----
+
+Export the files transferred by a task to 'transferred.ndjson', resuming an
+earlier export to that file if it was interrupted
+
+[source,bash]
+----
+$ globus task show --successful-transfers --export transferred.ndjson TASK_ID
+----
 """,
 )
 @task_id_arg
@@ -158,19 +206,54 @@ $ globus task show TASK_ID
         "Mutually exclusive with --successful-transfers"
     ),
 )
+@click.option(
+    "--export",
+    "export_file",
+    type=click.Path(dir_okay=False),
+    help=(
+        "With --successful-transfers or --skipped-errors, write the paths to "
+        "this file as NDJSON instead of printing them. If an earlier export to "
+        "the file was interrupted, it is resumed"
+    ),
+)
 @mutex_option_group("--successful-transfers", "--skipped-errors")
 @LoginManager.requires_login(LoginManager.TRANSFER_RS)
 def show_task(
-    *, login_manager: LoginManager, successful_transfers, skipped_errors, task_id
+    *,
+    login_manager: LoginManager,
+    successful_transfers,
+    skipped_errors,
+    export_file,
+    task_id,
 ):
     """
     Print information detailing the status and other info about a task.
 
     The task may be pending, completed, or in progress.
+
+    \b
+    === Exporting Paths
+
+    Tasks can transfer millions of files, which are slow to print as a table or
+    a single JSON document. With --export, the paths shown by
+    --successful-transfers or --skipped-errors are written to a file, one JSON
+    object per line, as each page of them is fetched. Progress is recorded in a
+    file with ".resume" added to the export filename. If the export is
+    interrupted, rerunning the same command continues from the last page which
+    was written. The resume file is removed when the export completes.
     """
     transfer_client = login_manager.get_transfer_client()
 
-    if successful_transfers:
+    if export_file:
+        if not (successful_transfers or skipped_errors):
+            raise click.UsageError(
+                "--export can only be used with --successful-transfers or "
+                "--skipped-errors"
+            )
+        export_task_paths(
+            transfer_client, task_id, export_file, skipped_errors=skipped_errors
+        )
+    elif successful_transfers:
         print_successful_transfers(transfer_client, task_id)
     elif skipped_errors:
         print_skipped_errors(transfer_client, task_id)
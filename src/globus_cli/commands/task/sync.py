@@ -0,0 +1,51 @@
+from globus_cli.login_manager import LoginManager, token_storage_adapter
+from globus_cli.parsing import command
+from globus_cli.services.transfer import TaskDatabase
+from globus_cli.termio import FORMAT_TEXT_RECORD, formatted_print
+
+SYNC_FIELDS = [
+    ("New Tasks", "new"),
+    ("Refreshed Tasks", "refreshed"),
+    ("Newest Request Time", "last_request_time"),
+]
+
+
+@command(
+    "sync",
+    short_help="Update the local copy of your tasks",
+    adoc_output="""When text output is requested, the following fields are used:
+
+- 'New Tasks'
+- 'Refreshed Tasks'
+- 'Newest Request Time'
+""",
+    adoc_examples="""Update the local copy of your tasks, then list the failed ones:
+
+[source,bash]
+----
+$ globus task sync
+$ globus task list --local --filter-status FAILED
+----
+""",
+)
+@LoginManager.requires_login(LoginManager.TRANSFER_RS)
+def task_sync(*, login_manager: LoginManager):
+    """
+    Update a local database of your task documents, which can be queried with
+    'globus task list --local'.
+
+    The first sync fetches all of your tasks. Later syncs only fetch the tasks
+    requested since the newest task in the database, and fetch again the tasks
+    which had not yet succeeded or failed.
+    """
+    transfer_client = login_manager.get_transfer_client()
+    task_db = TaskDatabase.open_default(namespace=token_storage_adapter().namespace)
+    try:
+        counts = task_db.sync(transfer_client)
+        formatted_print(
+            {**counts, "last_request_time": task_db.last_request_time},
+            text_format=FORMAT_TEXT_RECORD,
+            fields=SYNC_FIELDS,
+        )
+    finally:
+        task_db.close()
@@ -1,19 +1,26 @@
+import click
+
 from globus_cli.login_manager import LoginManager
 from globus_cli.parsing import command, synchronous_task_wait_options
 
-from .._common import transfer_task_wait_with_io
-from ._common import task_id_arg
+from .._common import transfer_task_wait_with_io, transfer_tasks_wait_with_io
+from ._common import task_ids_from_args
 
 
 @command(
     "wait",
-    short_help="Wait for a task to complete",
+    short_help="Wait for one or more tasks to complete",
     adoc_output="""
 When text output is requested, no output is written to standard out. All output
 is written to standard error.
 
 When JSON output is requested, the standard error output remains, but the task
 status after waiting will be sent to stdout.
+
+When waiting on several tasks, each task is reported on standard error as it
+completes, and the completed tasks are listed on standard out at the end (as a
+table for text output, or under the "DATA" key for JSON output). With NDJSON
+output, each task is written to standard out as it completes.
 """,
     adoc_examples="""
 Wait 30 seconds for a task to complete, printing heartbeats to stderr and
@@ -30,9 +37,24 @@ Wait for a task without limit, silently, polling every 5 minutes:
 ----
 $ globus task wait --polling-interval 300 TASK_ID
 ----
+
+Wait for all of the tasks listed in a file, one ID per line, for up to an hour:
+
+[source,bash]
+----
+$ globus task wait --timeout 3600 --from-file task_ids.txt
+----
 """,
 )
-@task_id_arg
+@click.argument("TASK_ID", nargs=-1)
+@click.option(
+    "--from-file",
+    type=click.File("r"),
+    help=(
+        "Read task IDs from this file, one per line, in addition to any given as "
+        "arguments. Use the special `-` value to read from stdin"
+    ),
+)
 @synchronous_task_wait_options
 @LoginManager.requires_login(LoginManager.TRANSFER_RS)
 def task_wait(
@@ -43,24 +65,48 @@ def task_wait(
     polling_interval,
     timeout,
     task_id,
+    from_file,
     timeout_exit_code
 ):
     """
-    Wait for a task to complete.
+    Wait for one or more tasks to complete.
 
-    This command waits until the timeout is reached, checking every 'M' seconds
-    (where 'M' is the polling interval).
+    This command waits until the timeout is reached, checking the task status
+    frequently at first, and then less often, up to every 'M' seconds (where 'M'
+    is the polling interval).
 
     If the task succeeds by then, it exits with status 0. Otherwise, it exits with
     status 1.
+
+    Several tasks can be given as arguments, or with --from-file (where blank lines
+    and lines starting with '#' are ignored). All of the tasks are checked together
+    on each polling interval. If they all succeed, the exit status is 0. If any of
+    them fail, or are not found, it is 1. Otherwise, if any have yet to complete at
+    the timeout, it is the --timeout-exit-code.
     """
+    task_ids = task_ids_from_args(task_id, from_file)
+    if not task_ids:
+        raise click.UsageError("give at least one TASK_ID, or use --from-file")
+
     transfer_client = login_manager.get_transfer_client()
-    transfer_task_wait_with_io(
-        transfer_client,
-        meow,
-        heartbeat,
-        polling_interval,
-        timeout,
-        task_id,
-        timeout_exit_code,
-    )
+    if len(task_ids) == 1 and not from_file:
+        transfer_task_wait_with_io(
+            transfer_client,
+            meow,
+            heartbeat,
+            polling_interval,
+            timeout,
+            task_ids[0],
+            timeout_exit_code,
+        )
+    else:
+        # the service reports task IDs in lowercase
+        transfer_tasks_wait_with_io(
+            transfer_client,
+            meow,
+            heartbeat,
+            polling_interval,
+            timeout,
+            [t.lower() for t in task_ids],
+            timeout_exit_code,
+        )
@@ -7,12 +7,23 @@ from globus_cli import utils
 from globus_cli.login_manager import LoginManager
 from globus_cli.parsing import (
     ENDPOINT_PLUS_OPTPATH,
+    BatchFile,
+    BatchLineParser,
+    NDJSONBatchParser,
     TaskPath,
     command,
     mutex_option_group,
     task_submission_options,
 )
-from globus_cli.services.transfer import autoactivate
+from globus_cli.services.transfer import (
+    BatchCoalescer,
+    ChunkedTransferSubmission,
+    StreamingTransferData,
+    SyncPlanner,
+    autoactivate_endpoints,
+    iterable_response_to_dict,
+    join_sync_path,
+)
 from globus_cli.termio import FORMAT_TEXT_RECORD, formatted_print
 
 
@@ -125,6 +136,15 @@ fi
         "actually transfer a file over the network?"
     ),
 )
+@click.option(
+    "--plan-sync",
+    is_flag=True,
+    help=(
+        "List SOURCE_PATH and DEST_PATH (both directories) and compare them, and "
+        "submit only the files which are missing from DEST_PATH or which differ "
+        "according to --sync-level"
+    ),
+)
 @click.option(
     "--preserve-mtime",
     is_flag=True,
@@ -154,7 +174,7 @@ fi
 )
 @click.option(
     "--batch",
-    type=click.File("r"),
+    type=BatchFile(),
     help=(
         "Accept a batch of source/dest path pairs from a file. Use the special `-` "
         "value to read from stdin; otherwise opens the file from the argument and "
@@ -163,6 +183,53 @@ fi
         "allowed and are used as prefixes to the batchmode inputs."
     ),
 )
+@click.option(
+    "--batch-format",
+    type=click.Choice(("shell", "ndjson"), case_sensitive=False),
+    default="shell",
+    show_default=True,
+    help=(
+        "The format of --batch input. 'shell' lines are arguments, respecting "
+        "quotes. 'ndjson' lines are JSON objects, each with \"source_path\" and "
+        '"destination_path" keys, and optionally "recursive" and '
+        '"external_checksum" keys'
+    ),
+)
+@click.option(
+    "--coalesce",
+    is_flag=True,
+    help=(
+        "Replace the --batch items which transfer every file in a source "
+        "directory with a single recursive item for the directory. Directories "
+        "are listed to check that they are completely covered"
+    ),
+)
+@click.option(
+    "--chunk-size",
+    type=click.IntRange(min=1),
+    metavar="INTEGER",
+    help=(
+        "Submit the --batch input as several tasks, each with at most this many "
+        "items. Requires --chunk-manifest"
+    ),
+)
+@click.option(
+    "--chunk-manifest",
+    type=click.Path(dir_okay=False),
+    help=(
+        "For use with --chunk-size. Record the submission ID and task ID of each "
+        "chunk in this file. If the file already exists, resume the submission "
+        "from it, skipping chunks which were already submitted"
+    ),
+)
+@click.option(
+    "--chunk-parallel",
+    default=4,
+    show_default=True,
+    type=click.IntRange(min=1),
+    metavar="INTEGER",
+    help="The number of chunks to submit concurrently",
+)
 @click.option(
     "--external-checksum",
     help=(
@@ -225,7 +292,13 @@ def transfer_command(
     *,
     login_manager: LoginManager,
     batch,
+    batch_format,
+    coalesce,
+    chunk_size,
+    chunk_manifest,
+    chunk_parallel,
     sync_level,
+    plan_sync,
     recursive,
     destination,
     source,
@@ -286,10 +359,57 @@ def transfer_command(
 
     Skips empty lines and allows comments beginning with "#".
 
+    \b
+    With `--batch-format ndjson`, each line is instead a JSON object of the form
+    {{"source_path": ..., "destination_path": ..., "recursive": ...,
+     "external_checksum": ...}}
+    where "recursive" and "external_checksum" are optional.
+
     \b
     If you use `--batch` and a commandline SOURCE_PATH and/or DEST_PATH, these
     paths will be used as dir prefixes to any paths read from the batch source.
 
+    \b
+    === Coalescing Batches
+
+    Batches which list every file under a directory, one per line, can be made
+    much smaller with `--coalesce`. The source directories of the batch items
+    are listed, and when every entry in a directory is transferred to the same
+    name in a single destination directory, those items are replaced by one
+    recursive item for the directory. Directories which contain anything not in
+    the batch, including empty subdirectories, are left alone, as are items
+    with an external checksum. As `--delete` only applies to recursive items,
+    it cannot be used with `--coalesce`.
+
+    \b
+    === Chunked Submission
+
+    Very large batches can be submitted as several tasks with `--chunk-size`.
+    The batch items are split into chunks of at most that many items, and each
+    chunk is submitted as its own task, with its own submission ID.
+    Up to `--chunk-parallel` chunks are submitted at once.
+
+    The submission ID and task ID of each chunk are recorded in the
+    `--chunk-manifest` file. If some chunks could not be submitted, repeat the
+    command with the same batch input and manifest to submit only the remaining
+    chunks. Chunks which were already submitted are not submitted again.
+
+    \b
+    === Planned Sync
+
+    With `--plan-sync`, the source and destination directories are listed
+    recursively and compared before the task is submitted, and the task only
+    includes the files which need to be transferred: those which are missing
+    from the destination, or which differ according to `--sync-level`. Without
+    `--sync-level`, files differ if they have a different size or a newer
+    modification time on the source. As checksums cannot be compared from
+    listings, `--sync-level checksum` includes every file, and leaves the
+    comparison to the task. When few files have changed, this makes for a much
+    smaller task than a recursive transfer with `--sync-level`.
+    Patterns given with `--exclude` are applied to the listings.
+    Files which are only present on the destination are left alone, so
+    `--delete` cannot be used, and empty directories are not created.
+
     \b
     === Sync Levels
 
@@ -332,6 +452,35 @@ def transfer_command(
             "which need it"
         )
 
+    if chunk_size is not None:
+        if not batch:
+            raise click.UsageError("--chunk-size can only be used with --batch")
+        if not chunk_manifest:
+            raise click.UsageError("--chunk-size requires --chunk-manifest")
+        if submission_id:
+            raise click.UsageError(
+                "You cannot use --submission-id with --chunk-size. "
+                "Each chunk is submitted with its own submission ID"
+            )
+    elif chunk_manifest:
+        raise click.UsageError("--chunk-manifest can only be used with --chunk-size")
+
+    if batch_format == "ndjson" and not batch:
+        raise click.UsageError("--batch-format can only be used with --batch")
+
+    if coalesce and not batch:
+        raise click.UsageError("--coalesce can only be used with --batch")
+    if coalesce and delete:
+        # --delete only acts on recursive items, so collapsing file items into
+        # recursive ones would delete files which the batch never mentioned
+        raise click.UsageError("--coalesce cannot be used with --delete")
+
+    if plan_sync and (batch or external_checksum or delete):
+        raise click.UsageError(
+            "--plan-sync cannot be used with --batch, --external-checksum, "
+            "or --delete"
+        )
+
     if (cmd_source_path is None or cmd_dest_path is None) and (not batch):
         raise click.UsageError(
             "transfer requires either SOURCE_PATH and DEST_PATH or --batch"
@@ -357,6 +506,10 @@ def transfer_command(
         filter_rules = None
 
     transfer_client = login_manager.get_transfer_client()
+    # each chunk of a chunked submission gets its own submission ID, so a
+    # placeholder stops the SDK from fetching one for the transfer as a whole
+    if chunk_size is not None:
+        submission_id = "chunked"
     transfer_data = TransferData(
         transfer_client,
         source_endpoint,
@@ -378,8 +531,42 @@ def transfer_command(
             **perf_opts,
         },
     )
+    if chunk_size is not None:
+        del transfer_data["submission_id"]
+
+    # items are kept compactly until the transfer is submitted (or displayed)
+    items = StreamingTransferData(transfer_data)
+
+    def add_batch_item(source_path, destination_path, recursive, external_checksum):
+        items.add_item(
+            source_path,
+            destination_path,
+            external_checksum=external_checksum,
+            checksum_algorithm=checksum_algorithm,
+            recursive=recursive,
+        )
+
+    # the endpoints are listed to plan a sync or to coalesce a batch, so in those
+    # cases they are activated before the items are put together
+    activate_early = plan_sync or coalesce
+    if activate_early and not skip_activation_check:
+        autoactivate_endpoints(
+            transfer_client, [source_endpoint, dest_endpoint], if_expires_in=60
+        )
 
-    if batch:
+    if batch and batch_format == "ndjson":
+        NDJSONBatchParser(
+            add_batch_item,
+            arguments=[
+                ("source_path", cmd_source_path),
+                ("destination_path", cmd_dest_path),
+            ],
+            flags=("recursive",),
+            options=("external_checksum",),
+            mutually_exclusive=("recursive", "external_checksum"),
+        ).process_stream(batch)
+
+    elif batch:
 
         @click.command()
         @click.option("--external-checksum")
@@ -392,18 +579,49 @@ def transfer_command(
             Parse a line of batch input and turn it into a transfer submission
             item.
             """
-            transfer_data.add_item(
-                str(source_path),
-                str(dest_path),
-                external_checksum=external_checksum,
-                checksum_algorithm=checksum_algorithm,
-                recursive=recursive,
+            add_batch_item(
+                str(source_path), str(dest_path), recursive, external_checksum
             )
 
-        utils.shlex_process_stream(process_batch_line, batch)
+        # most lines are handled by the fast parser, and the rest (including any
+        # errors) by the click command
+        fast_parser = BatchLineParser(
+            add_batch_item,
+            arguments=[
+                ("source_path", cmd_source_path),
+                ("destination_path", cmd_dest_path),
+            ],
+            flags={"--recursive": "recursive", "-r": "recursive"},
+            options={"--external-checksum": "external_checksum"},
+            mutually_exclusive=("recursive", "external_checksum"),
+        )
+        utils.shlex_process_stream(process_batch_line, batch, fast_parser=fast_parser)
+
+    elif plan_sync:
+        planner = SyncPlanner(
+            transfer_client,
+            source_endpoint,
+            cmd_source_path,
+            dest_endpoint,
+            cmd_dest_path,
+            exclude=exclude,
+            sync_level=sync_level,
+        )
+        for name, item_recursive in planner.plan():
+            items.add_item(
+                join_sync_path(cmd_source_path, name),
+                join_sync_path(cmd_dest_path, name),
+                checksum_algorithm=checksum_algorithm,
+                recursive=item_recursive,
+            )
+        click.echo(
+            f"{planner.files_differing} of {planner.files_compared} files "
+            "need to be transferred",
+            err=True,
+        )
 
     else:
-        transfer_data.add_item(
+        items.add_item(
             cmd_source_path,
             cmd_dest_path,
             external_checksum=external_checksum,
@@ -411,15 +629,40 @@ def transfer_command(
             recursive=recursive,
         )
 
-    for item in transfer_data["DATA"]:
-        if item["recursive"]:
-            has_recursive_items = True
-            break
-    else:
-        has_recursive_items = False
+    # these need every item as a dict
+    if coalesce or dry_run or chunk_size is not None:
+        items.materialize()
+
+    if coalesce:
+        coalescer = BatchCoalescer(
+            transfer_client, source_endpoint, transfer_data["DATA"], exclude=exclude
+        )
+        items_before = len(transfer_data["DATA"])
+        transfer_data["DATA"] = coalescer.coalesce()
+        click.echo(
+            f"Coalesced {items_before} items into {len(transfer_data['DATA'])} "
+            f"({coalescer.directories_collapsed} of "
+            f"{coalescer.directories_listed} directories listed were collapsed), "
+            f"reducing the payload from {coalescer.payload_bytes_before} to "
+            f"{coalescer.payload_bytes_after} bytes",
+            err=True,
+        )
 
-    if exclude and not has_recursive_items:
-        raise click.UsageError("--exclude can only be used with --recursive transfers")
+    if exclude:
+        # coalescing can turn a batch of files into recursive items
+        if coalesce:
+            has_recursive_items = any(
+                item["recursive"] for item in transfer_data["DATA"]
+            )
+        else:
+            has_recursive_items = items.has_recursive_items
+        if not has_recursive_items:
+            # with --plan-sync, the patterns were already applied to the listings
+            if not plan_sync:
+                raise click.UsageError(
+                    "--exclude can only be used with --recursive transfers"
+                )
+            transfer_data.pop("filter_rules", None)
 
     if dry_run:
         formatted_print(
@@ -435,13 +678,46 @@ def transfer_command(
         # exit safely
         return
 
+    if plan_sync and not items.item_count:
+        click.echo("The destination is up to date, no task was submitted", err=True)
+        return
+
     # autoactivate after parsing all args and putting things together
-    # skip this if skip-activation-check is given
-    if not skip_activation_check:
-        autoactivate(transfer_client, source_endpoint, if_expires_in=60)
-        autoactivate(transfer_client, dest_endpoint, if_expires_in=60)
+    # skip this if skip-activation-check is given (or if it was done already)
+    if not skip_activation_check and not activate_early:
+        autoactivate_endpoints(
+            transfer_client, [source_endpoint, dest_endpoint], if_expires_in=60
+        )
+
+    if chunk_size is not None:
+        submission = ChunkedTransferSubmission(
+            transfer_client,
+            transfer_data,
+            chunk_size=chunk_size,
+            manifest_filename=chunk_manifest,
+            max_workers=chunk_parallel,
+        )
+        formatted_print(
+            submission.submit(),
+            fields=(
+                ("Chunk", "chunk"),
+                ("Items", "item_count"),
+                ("Task ID", "task_id"),
+                ("Status", "status"),
+                ("Message", "message"),
+            ),
+            json_converter=iterable_response_to_dict,
+        )
+        if submission.failed:
+            click.echo(
+                f"{submission.failed} chunks could not be submitted. Repeat the "
+                "command with the same --chunk-manifest to submit them.",
+                err=True,
+            )
+            click.get_current_context().exit(1)
+        return
 
-    res = transfer_client.submit_transfer(transfer_data)
+    res = transfer_client.submit_transfer(items)
     formatted_print(
         res,
         text_format=FORMAT_TEXT_RECORD,
@@ -1,7 +1,9 @@
+from globus_cli.parsing.batch_line import BatchLineParser, NDJSONBatchParser
 from globus_cli.parsing.commands import command, group, main_group
 from globus_cli.parsing.mutex_group import MutexInfo, mutex_option_group
 from globus_cli.parsing.one_use_option import one_use_option
 from globus_cli.parsing.shared_options import (
+    api_fields_option,
     collection_id_arg,
     delete_and_rm_options,
     endpoint_id_arg,
@@ -14,6 +16,7 @@ from globus_cli.parsing.shared_options import (
 from .param_types import (
     ENDPOINT_PLUS_OPTPATH,
     ENDPOINT_PLUS_REQPATH,
+    BatchFile,
     CommaDelimitedList,
     IdentityType,
     JSONStringOrFile,
@@ -31,9 +34,13 @@ __all__ = [
     "group",
     "main_group",
     "one_use_option",
+    # batch input
+    "BatchLineParser",
+    "NDJSONBatchParser",
     # param types
     "ENDPOINT_PLUS_OPTPATH",
     "ENDPOINT_PLUS_REQPATH",
+    "BatchFile",
     "CommaDelimitedList",
     "IdentityType",
     "JSONStringOrFile",
@@ -54,4 +61,5 @@ __all__ = [
     "synchronous_task_wait_options",
     "security_principal_opts",
     "no_local_server_option",
+    "api_fields_option",
 ]
@@ -0,0 +1,218 @@
+import json
+import re
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    List,
+    NoReturn,
+    Optional,
+    Sequence,
+    TextIO,
+    Tuple,
+)
+
+import click
+
+from ..utils import format_list_of_words
+from .param_types.task_path import _normpath, _pathjoin
+
+# lines containing any of these characters are split with shlex, which handles
+# quoting, escapes, and comments
+_NEEDS_SHLEX = re.compile(r"['\"\\#]")
+# shlex splits on exactly these whitespace characters
+_SIMPLE_TOKEN = re.compile(r"[^ \t\r\n]+")
+
+
+def fast_split(line: str) -> Optional[List[str]]:
+    """
+    Split a line the way `shlex.split(line, comments=True)` would, if that can be
+    done without shlex. Returns None for lines which need shlex.
+    """
+    if _NEEDS_SHLEX.search(line):
+        return None
+    return _SIMPLE_TOKEN.findall(line)
+
+
+class BatchLineParser:
+    """
+    A fast parser for the common forms of --batch input lines.
+
+    Invoking a click command for each line of batch input is slow for batches
+    with many lines. This parser handles lines which consist only of the given
+    options and arguments, passing the parsed values to ``callback``, and rejects
+    anything else by returning False. Rejected lines are left to the click
+    command, which either accepts them or reports the error, so the accepted
+    grammar and the error output are the same with or without this parser.
+
+    Paths are joined with their base dirs and normalized in the same way as a
+    ``TaskPath`` would do it, and passed to ``callback`` as strings.
+
+    :param callback: Called with the parsed values of each accepted line, as
+        keyword arguments
+    :param arguments: The names of the positional arguments, in order, paired
+        with the base dir for each one
+    :param flags: A mapping of flag option strings (e.g. ``--recursive``) to the
+        names of their params
+    :param options: A mapping of option strings which take a value to the names
+        of their params
+    :param mutually_exclusive: The names of params which may not be used together
+    """
+
+    def __init__(
+        self,
+        callback: Callable[..., Any],
+        *,
+        arguments: Sequence[Tuple[str, Optional[str]]],
+        flags: Optional[Dict[str, str]] = None,
+        options: Optional[Dict[str, str]] = None,
+        mutually_exclusive: Sequence[str] = (),
+    ) -> None:
+        self.callback = callback
+        self.arguments = arguments
+        self.flags = flags or {}
+        self.options = options or {}
+        self.mutually_exclusive = mutually_exclusive
+
+        self._defaults: Dict[str, Any] = {name: False for name in self.flags.values()}
+        self._defaults.update({name: None for name in self.options.values()})
+
+    def process_line(self, line: str) -> bool:
+        """
+        Parse a line of batch input and pass its values to the callback. Returns
+        True if the line was handled (blank lines are handled by doing nothing), and
+        False if it must be handled by the click command.
+        """
+        argv = fast_split(line)
+        if argv is None:
+            return False
+        if not argv:
+            return True
+        return self.process_argv(argv)
+
+    def process_argv(self, argv: List[str]) -> bool:
+        """
+        Parse an already split line of batch input and pass its values to the
+        callback. Returns False if the line must be handled by the click command.
+        """
+        values = dict(self._defaults)
+        positional = []
+        i, argc = 0, len(argv)
+        while i < argc:
+            arg = argv[i]
+            i += 1
+            if not arg.startswith("-") or arg == "-":
+                positional.append(arg)
+            elif arg in self.flags:
+                values[self.flags[arg]] = True
+            elif arg in self.options:
+                # leave values which look like options to click
+                if i == argc or argv[i].startswith("-"):
+                    return False
+                values[self.options[arg]] = argv[i]
+                i += 1
+            else:
+                opt, sep, value = arg.partition("=")
+                if not sep or opt not in self.options:
+                    return False
+                values[self.options[opt]] = value
+
+        if len(positional) != len(self.arguments):
+            return False
+        if sum(1 for name in self.mutually_exclusive if values[name]) > 1:
+            return False
+
+        for (name, base_dir), value in zip(self.arguments, positional):
+            if base_dir:
+                value = _pathjoin(base_dir, value)
+            values[name] = _normpath(value)
+
+        self.callback(**values)
+        return True
+
+
+class NDJSONBatchParser:
+    """
+    A parser for --batch input in which each line is a JSON object.
+
+    Each object must have a string for each of the path ``arguments``, and may
+    have a boolean for each of the ``flags`` and a string (or null) for each of
+    the ``options``. Any other key is an error. Objects are validated as they are
+    read, and the first invalid line stops processing with a usage error naming
+    the line. Blank lines are skipped.
+
+    Paths are joined with their base dirs and normalized in the same way as a
+    ``TaskPath`` would do it.
+
+    :param callback: Called with the values of each line, as keyword arguments
+        named after the keys of the JSON objects
+    :param arguments: The keys for the paths, paired with the base dir for each
+    :param flags: The keys for boolean values, which default to False
+    :param options: The keys for string values, which default to None
+    :param mutually_exclusive: The keys which may not be used together
+    """
+
+    def __init__(
+        self,
+        callback: Callable[..., Any],
+        *,
+        arguments: Sequence[Tuple[str, Optional[str]]],
+        flags: Sequence[str] = (),
+        options: Sequence[str] = (),
+        mutually_exclusive: Sequence[str] = (),
+    ) -> None:
+        self.callback = callback
+        self.arguments = arguments
+        self.flags = flags
+        self.options = options
+        self.mutually_exclusive = mutually_exclusive
+
+        self._known_keys = (
+            {name for name, _ in arguments} | set(self.flags) | set(self.options)
+        )
+
+    def process_stream(self, stream: TextIO) -> None:
+        for lineno, line in enumerate(stream, start=1):
+            if not line.strip():
+                continue
+            try:
+                doc = json.loads(line)
+            except ValueError as err:
+                self._fail(lineno, f"not valid JSON ({err})")
+            self.callback(**self._validate(lineno, doc))
+
+    def _fail(self, lineno: int, message: str) -> NoReturn:
+        raise click.UsageError(f"invalid --batch input on line {lineno}: {message}")
+
+    def _validate(self, lineno: int, doc: Any) -> Dict[str, Any]:
+        if not isinstance(doc, dict):
+            self._fail(lineno, "expected a JSON object")
+        for key in doc:
+            if key not in self._known_keys:
+                self._fail(lineno, f"unexpected key '{key}'")
+
+        values: Dict[str, Any] = {}
+        for name, base_dir in self.arguments:
+            value = doc.get(name)
+            if not isinstance(value, str):
+                self._fail(lineno, f"'{name}' must be a string")
+            if base_dir:
+                value = _pathjoin(base_dir, value)
+            values[name] = _normpath(value)
+        for name in self.flags:
+            value = doc.get(name, False)
+            if not isinstance(value, bool):
+                self._fail(lineno, f"'{name}' must be true or false")
+            values[name] = value
+        for name in self.options:
+            value = doc.get(name)
+            if value is not None and not isinstance(value, str):
+                self._fail(lineno, f"'{name}' must be a string or null")
+            values[name] = value
+
+        present = [name for name in self.mutually_exclusive if values[name]]
+        if len(present) > 1:
+            self._fail(
+                lineno, f"{format_list_of_words(*present)} are mutually exclusive"
+            )
+        return values
@@ -10,6 +10,7 @@ import jmespath
 JSON_FORMAT = "json"
 TEXT_FORMAT = "text"
 UNIX_FORMAT = "unix"
+NDJSON_FORMAT = "ndjson"
 
 
 def _setup_logging(level="DEBUG"):
@@ -61,6 +62,9 @@ class CommandState:
     def outformat_is_unix(self):
         return self.output_format == UNIX_FORMAT
 
+    def outformat_is_ndjson(self):
+        return self.output_format == NDJSON_FORMAT
+
     def is_verbose(self):
         return self.verbosity > 0
 
@@ -92,9 +96,13 @@ def format_option(f: Callable) -> Callable:
         "-F",
         "--format",
         type=click.Choice(
-            [UNIX_FORMAT, JSON_FORMAT, TEXT_FORMAT], case_sensitive=False
+            [UNIX_FORMAT, JSON_FORMAT, TEXT_FORMAT, NDJSON_FORMAT],
+            case_sensitive=False,
+        ),
+        help=(
+            "Output format for stdout. Defaults to text. 'ndjson' prints one "
+            "compact JSON object per line as results arrive"
         ),
-        help="Output format for stdout. Defaults to text",
         expose_value=False,
         callback=callback,
     )(f)
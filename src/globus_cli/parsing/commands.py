@@ -37,7 +37,13 @@ class GlobusCommand(click.Command):
     This command requires all endpoints it uses to be activated. It will attempt to
     auto-activate any endpoints that are not active, but if auto-activation fails,
     you will need to manually activate the endpoint. See 'globus endpoint activate'
-    for more details."""
+    for more details.
+
+    Set GLOBUS_CLI_ACTIVATION_CACHE_TTL to a number of seconds to skip
+    auto-activation for endpoints which were seen to be activated within that
+    time. Cached results are only dropped when they expire, or by
+    'globus endpoint deactivate', so an endpoint deactivated by other means may be
+    treated as active until then."""
 
     def __init__(self, *args, **kwargs):
         self.adoc_skip = kwargs.pop("adoc_skip", False)
@@ -1,3 +1,4 @@
+from .batch_file import BatchFile
 from .comma_delimited import CommaDelimitedList
 from .endpoint_plus_path import (
     ENDPOINT_PLUS_OPTPATH,
@@ -11,6 +12,7 @@ from .prefix_mapper import JSONStringOrFile
 from .task_path import TaskPath
 
 __all__ = (
+    "BatchFile",
     "CommaDelimitedList",
     "ENDPOINT_PLUS_OPTPATH",
     "ENDPOINT_PLUS_REQPATH",
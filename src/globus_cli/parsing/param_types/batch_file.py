@@ -0,0 +1,65 @@
+import gzip
+import io
+from typing import IO, Any, BinaryIO, cast
+
+import click
+
+GZIP_MAGIC = b"\x1f\x8b"
+ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+
+
+class BatchFile(click.File):
+    """
+    A file of --batch input, opened for reading as text.
+
+    Input compressed with gzip or zstd is decompressed as it is read. Compression
+    is detected from the first bytes of the input rather than from the filename,
+    so compressed input can also be piped in on stdin. Reading zstd input
+    requires the optional `zstandard` package, which is installed with the
+    `zstd` extra (`pip install 'globus-cli[zstd]'`).
+    """
+
+    def __init__(self) -> None:
+        super().__init__("rb")
+
+    def convert(self, value: Any, param: Any, ctx: Any) -> IO[str]:
+        if isinstance(value, io.TextIOBase):
+            return cast(IO[str], value)
+        binary_stream = super().convert(value, param, ctx)
+        return io.TextIOWrapper(
+            self._decompressing_reader(binary_stream, value, param, ctx)
+        )
+
+    def _decompressing_reader(
+        self, stream: BinaryIO, value: Any, param: Any, ctx: Any
+    ) -> BinaryIO:
+        # peeking requires a buffered stream
+        if hasattr(stream, "peek"):
+            buffered = cast(io.BufferedReader, stream)
+        else:
+            buffered = io.BufferedReader(cast(io.RawIOBase, stream))
+        magic = buffered.peek(len(ZSTD_MAGIC))
+
+        if magic.startswith(GZIP_MAGIC):
+            return cast(BinaryIO, gzip.GzipFile(fileobj=buffered, mode="rb"))
+        if magic.startswith(ZSTD_MAGIC):
+            try:
+                import zstandard
+            except ImportError:
+                # the context is never entered when parsing fails, so the file
+                # would not be closed by click
+                if value != "-":
+                    buffered.close()
+                self.fail(
+                    "the input is compressed with zstd, which requires the "
+                    "'zstandard' package. Install it with "
+                    "\"pip install 'globus-cli[zstd]'\", or decompress the "
+                    "input before passing it to the CLI",
+                    param=param,
+                    ctx=ctx,
+                )
+            reader = zstandard.ZstdDecompressor().stream_reader(
+                buffered, read_across_frames=True
+            )
+            return cast(BinaryIO, io.BufferedReader(reader))
+        return cast(BinaryIO, buffered)
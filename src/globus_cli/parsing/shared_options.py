@@ -9,6 +9,7 @@ from globus_cli.parsing.command_state import (
     map_http_status_option,
     verbose_option,
 )
+from globus_cli.parsing.param_types import BatchFile, CommaDelimitedList
 
 
 def common_options(
@@ -240,7 +241,7 @@ def delete_and_rm_options(
     if supports_batch:
         f = click.option(
             "--batch",
-            type=click.File("r"),
+            type=BatchFile(),
             help=(
                 "Accept a batch of source/dest path pairs from a file. Use the "
                 "special `-` value to read from stdin; otherwise opens the file from "
@@ -250,6 +251,17 @@ def delete_and_rm_options(
                 "batchmode inputs. "
             ),
         )(f)
+        f = click.option(
+            "--batch-format",
+            type=click.Choice(("shell", "ndjson"), case_sensitive=False),
+            default="shell",
+            show_default=True,
+            help=(
+                "The format of --batch input. 'shell' lines are arguments, "
+                "respecting quotes. 'ndjson' lines are JSON objects, each with a "
+                '"path" key'
+            ),
+        )(f)
     return f
 
 
@@ -291,7 +303,10 @@ def synchronous_task_wait_options(f):
         type=int,
         show_default=True,
         callback=polling_interval_callback,
-        help="Number of seconds between Task status checks.",
+        help=(
+            "The longest time, in seconds, between Task status checks. Checks are "
+            "more frequent at first, slowing down to this interval."
+        ),
     )(f)
     f = click.option(
         "--heartbeat",
@@ -430,3 +445,20 @@ def no_local_server_option(f):
             "remote connection."
         ),
     )(f)
+
+
+def api_fields_option(f):
+    """
+    Option for commands which list documents from an API which supports a
+    "fields" query param (see `api_fields_param`)
+    """
+    return click.option(
+        "--fields",
+        "api_fields",
+        type=CommaDelimitedList(),
+        help=(
+            "Only request these fields of each result from the service, as a "
+            "comma-delimited list. By default, text output only requests the "
+            "fields which it shows, and other output formats request all fields"
+        ),
+    )(f)
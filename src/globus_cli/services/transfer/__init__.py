@@ -1,27 +1,59 @@
 from .activation import (
     activation_requirements_help_text,
     autoactivate,
+    autoactivate_endpoints,
     supported_activation_methods,
 )
+from .activation_cache import ActivationCache
+from .chunked_submit import ChunkedTransferSubmission
 from .client import CustomTransferClient
+from .coalesce import BatchCoalescer
 from .data import assemble_generic_doc, display_name_or_cname, iterable_response_to_dict
 from .delegate_proxy import fill_delegate_proxy_activation_requirements
+from .disk_usage import DiskUsageAggregator
+from .listing_item import ListingItem
+from .ls_cache import LsCache
 from .recursive_ls import RecursiveLsResponse
+from .streaming_data import StreamingTransferData
+from .sync_plan import SyncPlanner, join_sync_path
+from .task_db import TaskDatabase
+from .task_events import TaskEventFollower
+from .task_export import ResumableNDJSONExport
+from .task_monitor import ThroughputMonitor
+from .task_wait import TERMINAL_TASK_STATUSES, PollingSchedule, TaskListPoller
 
 ENDPOINT_LIST_FIELDS = (
     ("ID", "id"),
     ("Owner", "owner_string"),
-    ("Display Name", display_name_or_cname),
+    # the display name falls back to the canonical name
+    ("Display Name", display_name_or_cname, ("display_name", "canonical_name")),
 )
 
 
 __all__ = (
     "ENDPOINT_LIST_FIELDS",
+    "ActivationCache",
+    "BatchCoalescer",
+    "ChunkedTransferSubmission",
     "CustomTransferClient",
+    "DiskUsageAggregator",
+    "ListingItem",
+    "LsCache",
     "RecursiveLsResponse",
+    "ResumableNDJSONExport",
+    "StreamingTransferData",
+    "SyncPlanner",
+    "TaskDatabase",
+    "TaskEventFollower",
+    "TaskListPoller",
+    "ThroughputMonitor",
+    "PollingSchedule",
+    "TERMINAL_TASK_STATUSES",
+    "join_sync_path",
     "supported_activation_methods",
     "activation_requirements_help_text",
     "autoactivate",
+    "autoactivate_endpoints",
     "fill_delegate_proxy_activation_requirements",
     "display_name_or_cname",
     "iterable_response_to_dict",
@@ -1,5 +1,12 @@
+from concurrent.futures import ThreadPoolExecutor
+
 import click
 
+from globus_cli.login_manager.tokenstore import token_storage_adapter
+from globus_cli.utils import CLIStubResponse
+
+from .activation_cache import ActivationCache, activation_cache_ttl
+
 
 def supported_activation_methods(res):
     """
@@ -83,21 +90,73 @@ def autoactivate(client, endpoint_id, if_expires_in=None):
     to determine which methods of activation are supported, then tells
     the user to use 'globus endpoint activate' with the correct options(s)
     """
-    kwargs = {}
-    if if_expires_in is not None:
-        kwargs["if_expires_in"] = if_expires_in
+    (res,) = autoactivate_endpoints(client, [endpoint_id], if_expires_in=if_expires_in)
+    return res
 
-    res = client.endpoint_autoactivate(endpoint_id, **kwargs)
-    if res["code"] == "AutoActivationFailed":
 
-        message = (
-            "The endpoint could not be auto-activated and must be "
-            "activated before it can be used.\n\n"
-            + activation_requirements_help_text(res, endpoint_id)
+def autoactivate_endpoints(client, endpoint_ids, if_expires_in=None):
+    """
+    Auto-activate several endpoints at once, as with `autoactivate`, returning the
+    results in the same order.
+
+    The requests are made concurrently. If the cache is enabled (see
+    `activation_cache_ttl`), endpoints which were recently seen to be activated
+    (see `ActivationCache`) are not auto-activated again, and get a stub result
+    with a code of "AlreadyActivated". If any endpoints cannot be
+    auto-activated, the requirements of the first of them are shown, and the
+    command exits.
+    """
+    ttl = activation_cache_ttl()
+    cache = (
+        ActivationCache.open_default(
+            namespace=token_storage_adapter().namespace, ttl=ttl
         )
+        if ttl
+        else None
+    )
 
-        click.echo(message, err=True)
-        click.get_current_context().exit(1)
+    kwargs = {}
+    if if_expires_in is not None:
+        kwargs["if_expires_in"] = if_expires_in
 
-    else:
-        return res
+    results = {}
+    pending = []
+    for endpoint_id in dict.fromkeys(str(e) for e in endpoint_ids):
+        if cache is not None and cache.get(endpoint_id, if_expires_in):
+            results[endpoint_id] = CLIStubResponse(
+                {
+                    "DATA_TYPE": "activation_result",
+                    "code": "AlreadyActivated",
+                    "message": "Endpoint recently activated (cached result)",
+                    "endpoint_id": endpoint_id,
+                }
+            )
+        else:
+            pending.append(endpoint_id)
+
+    if len(pending) == 1:
+        results[pending[0]] = client.endpoint_autoactivate(pending[0], **kwargs)
+    elif pending:
+        with ThreadPoolExecutor(max_workers=len(pending)) as executor:
+            responses = executor.map(
+                lambda e: client.endpoint_autoactivate(e, **kwargs), pending
+            )
+            results.update(zip(pending, responses))
+
+    for endpoint_id in pending:
+        res = results[endpoint_id]
+        if res["code"] == "AutoActivationFailed":
+
+            message = (
+                "The endpoint could not be auto-activated and must be "
+                "activated before it can be used.\n\n"
+                + activation_requirements_help_text(res, endpoint_id)
+            )
+
+            click.echo(message, err=True)
+            click.get_current_context().exit(1)
+
+        if cache is not None and res.get("expires_in") is not None:
+            cache.put(endpoint_id, res["expires_in"])
+
+    return [results[str(e)] for e in endpoint_ids]
@@ -0,0 +1,139 @@
+import json
+import logging
+import os
+import time
+from typing import Any, Dict, Optional
+
+import click
+
+from globus_cli.login_manager.tokenstore import _get_data_dir
+
+log = logging.getLogger(__name__)
+
+ACTIVATION_CACHE_FILENAME = "activation_cache.json"
+
+# the maximum age (in seconds) of a cached activation result, for callers which
+# enable the cache without choosing one
+ACTIVATION_CACHE_TTL = 300
+
+ACTIVATION_CACHE_TTL_ENVVAR = "GLOBUS_CLI_ACTIVATION_CACHE_TTL"
+
+
+def _cache_filename() -> str:
+    # kept in the same directory as the token storage
+    return os.path.join(_get_data_dir(), ACTIVATION_CACHE_FILENAME)
+
+
+def activation_cache_ttl() -> int:
+    """
+    The maximum age of a cached activation result, from the environment. The cache
+    is off (0) unless the variable is set.
+    """
+    value = os.getenv(ACTIVATION_CACHE_TTL_ENVVAR)
+    if value is None:
+        return 0
+    try:
+        ttl = int(value)
+    except ValueError:
+        ttl = -1
+    if ttl < 0:
+        raise click.UsageError(
+            f"couldn't parse {ACTIVATION_CACHE_TTL_ENVVAR} environment variable: "
+            f"{value!r} is not a non-negative integer"
+        )
+    return ttl
+
+
+class ActivationCache:
+    """
+    A local record of recent endpoint autoactivation results, stored as a small
+    JSON file.
+
+    For each login namespace and endpoint, the cache holds the time at which the
+    endpoint was last seen to be activated, and the time at which that activation
+    expires. An endpoint is treated as active (so that autoactivation can be
+    skipped) if it was seen to be activated less than ``ttl`` seconds ago, and its
+    activation has more than ``if_expires_in`` seconds left. Only successful
+    activations are recorded.
+
+    Writes go to a temporary file which is then renamed over the cache, so that
+    concurrent commands never see a partially written file.
+
+    :param filename: The path of the cache file
+    :param namespace: Keeps the results seen by different logins apart
+    :param ttl: The maximum age (in seconds) of a result which will be used
+    """
+
+    def __init__(
+        self, filename: str, *, namespace: str = "", ttl: float = ACTIVATION_CACHE_TTL
+    ) -> None:
+        self.filename = filename
+        self.namespace = namespace
+        self.ttl = ttl
+
+    @classmethod
+    def open_default(cls, **kwargs: Any) -> "ActivationCache":
+        """Use the cache in the CLI's data directory"""
+        return cls(_cache_filename(), **kwargs)
+
+    def _load(self) -> Dict[str, Dict[str, Dict[str, Any]]]:
+        try:
+            with open(self.filename) as fp:
+                doc = json.load(fp)
+        except (OSError, ValueError):
+            return {}
+        return doc if isinstance(doc, dict) else {}
+
+    def _save(self, doc: Dict[str, Dict[str, Dict[str, Any]]]) -> None:
+        tmp_filename = f"{self.filename}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(os.path.dirname(self.filename), exist_ok=True)
+            with open(tmp_filename, "w") as fp:
+                json.dump(doc, fp)
+            os.replace(tmp_filename, self.filename)
+        except OSError as err:
+            # the cache is only an optimization, so failing to write it is fine
+            log.debug("could not write activation cache: %s", err)
+
+    def get(self, endpoint_id: str, if_expires_in: Optional[int] = None) -> bool:
+        """Check for a fresh record that the endpoint is activated"""
+        record = self._load().get(self.namespace, {}).get(str(endpoint_id))
+        if record is None:
+            return False
+        now = time.time()
+        if now - record["checked"] >= self.ttl:
+            return False
+        expires = record["expires"]
+        if expires is not None and expires - now <= (if_expires_in or 0):
+            return False
+        log.debug("activation cache hit for %s", endpoint_id)
+        return True
+
+    def put(self, endpoint_id: str, expires_in: int) -> None:
+        """
+        Record that the endpoint is activated, for ``expires_in`` more seconds (or
+        indefinitely, if it is negative)
+        """
+        now = time.time()
+        doc = self._load()
+        # drop stale records while rewriting the file
+        for records in doc.values():
+            for key in [
+                k for k, r in records.items() if now - r["checked"] >= self.ttl
+            ]:
+                del records[key]
+        doc.setdefault(self.namespace, {})[str(endpoint_id)] = {
+            "checked": now,
+            "expires": now + expires_in if expires_in >= 0 else None,
+        }
+        self._save(doc)
+
+    def invalidate(self, endpoint_id: str) -> None:
+        """Drop the records (for all logins) of an endpoint"""
+        doc = self._load()
+        changed = False
+        for records in doc.values():
+            if records.pop(str(endpoint_id), None) is not None:
+                changed = True
+        if changed:
+            self._save(doc)
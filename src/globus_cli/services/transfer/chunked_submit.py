@@ -0,0 +1,238 @@
+import hashlib
+import json
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Dict, Iterator, List, Optional
+
+import click
+import globus_sdk
+
+log = logging.getLogger(__name__)
+
+MANIFEST_VERSION = 2
+
+# options of the transfer document which are not part of a manifest's identity:
+# the items are fingerprinted per chunk, each chunk has its own submission ID,
+# and skipping the activation check does not change what is transferred
+_UNFINGERPRINTED_OPTIONS = ("DATA", "submission_id", "skip_activation_check")
+
+
+def _fingerprint(items: List[Dict[str, Any]]) -> str:
+    doc = json.dumps(items, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(doc.encode()).hexdigest()
+
+
+class ChunkManifest:
+    """
+    On-disk record of a transfer which is submitted as several tasks.
+
+    For each chunk of the transfer items, the manifest holds a fingerprint of the
+    items, the submission ID which was reserved for the chunk, and the ID of the
+    task once it has been submitted. A submission ID is always saved before the
+    chunk is submitted with it, so if the command is interrupted, resubmitting a
+    chunk with its saved submission ID cannot create a second task.
+
+    Writes go to a temporary file which is then renamed over the manifest, so an
+    interruption during a write leaves the previous manifest intact.
+
+    :param filename: The path of the manifest file
+    :param identity: A description of the transfer (its options and chunk size).
+        A manifest can only be resumed by a transfer with the same identity.
+    """
+
+    def __init__(self, filename: str, identity: Dict[str, Any]) -> None:
+        self.filename = filename
+        # normalize through JSON so that it compares equal to a loaded identity
+        self.identity = json.loads(json.dumps(identity))
+        self.chunks: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+
+    def load_or_create(self, chunk_items: List[List[Dict[str, Any]]]) -> None:
+        """
+        Read the manifest if there is one, checking that it was written for the
+        same chunks of items. Otherwise, start a new one.
+        """
+        fingerprints = [_fingerprint(items) for items in chunk_items]
+        try:
+            with open(self.filename) as fp:
+                doc = json.load(fp)
+        except FileNotFoundError:
+            self.chunks = [
+                {
+                    "chunk": index,
+                    "item_count": len(items),
+                    "fingerprint": fingerprint,
+                    "submission_id": None,
+                    "task_id": None,
+                }
+                for index, (items, fingerprint) in enumerate(
+                    zip(chunk_items, fingerprints)
+                )
+            ]
+            self.save()
+            return
+        except ValueError:
+            raise click.UsageError(
+                f"'{self.filename}' is not a valid transfer chunk manifest"
+            )
+
+        if (
+            doc.get("version") != MANIFEST_VERSION
+            or doc.get("identity") != self.identity
+            or [c["fingerprint"] for c in doc["chunks"]] != fingerprints
+        ):
+            raise click.UsageError(
+                f"'{self.filename}' is a manifest for a different transfer. "
+                "Use a new manifest file or repeat the original command."
+            )
+        self.chunks = doc["chunks"]
+        log.info(
+            "resuming chunked transfer from '%s' (%d of %d chunks submitted)",
+            self.filename,
+            sum(1 for c in self.chunks if c["task_id"]),
+            len(self.chunks),
+        )
+
+    def save(self) -> None:
+        tmp_filename = self.filename + ".tmp"
+        with open(tmp_filename, "w") as fp:
+            json.dump(
+                {
+                    "version": MANIFEST_VERSION,
+                    "identity": self.identity,
+                    "chunks": self.chunks,
+                },
+                fp,
+                indent=2,
+            )
+        os.replace(tmp_filename, self.filename)
+
+    def update(self, index: int, **kwargs: Any) -> None:
+        """Update the record of a chunk and save the manifest"""
+        with self._lock:
+            self.chunks[index].update(kwargs)
+            self.save()
+
+
+class ChunkedTransferSubmission:
+    """
+    Submit the items of a transfer as several tasks of up to ``chunk_size``
+    items each, with up to ``max_workers`` submissions in flight at once.
+
+    Every chunk is submitted with the options of the original transfer, and with
+    its own submission ID, recorded in a :class:`ChunkManifest`. The transfer
+    document needs no submission ID of its own. When a manifest
+    from an earlier, partially completed run is found, the chunks which already
+    have tasks are skipped.
+
+    :param transfer_client: The client to use for the submissions
+    :param transfer_data: The complete transfer document
+    :param chunk_size: The maximum number of items in each task
+    :param manifest_filename: The path of the manifest file
+    :param max_workers: The maximum number of concurrent submissions
+    """
+
+    def __init__(
+        self,
+        transfer_client: globus_sdk.TransferClient,
+        transfer_data: globus_sdk.TransferData,
+        *,
+        chunk_size: int,
+        manifest_filename: str,
+        max_workers: int = 1,
+    ) -> None:
+        self.transfer_client = transfer_client
+        self.transfer_data = transfer_data
+        self.max_workers = max_workers
+
+        items = transfer_data["DATA"]
+        self.chunk_items = [
+            items[start : start + chunk_size]
+            for start in range(0, len(items), chunk_size)
+        ]
+        self.manifest = ChunkManifest(
+            manifest_filename,
+            {
+                # a resume with different options (label, sync level, deadline,
+                # and so on) would mix two sets of options in one transfer
+                "options": {
+                    k: v
+                    for k, v in transfer_data.items()
+                    if k not in _UNFINGERPRINTED_OPTIONS
+                },
+                "chunk_size": chunk_size,
+            },
+        )
+        # the number of chunks which could not be submitted
+        self.failed = 0
+
+    def _chunk_document(self, index: int, submission_id: str) -> Dict[str, Any]:
+        items = self.chunk_items[index]
+        doc = dict(self.transfer_data)
+        doc["DATA"] = items
+        doc["submission_id"] = submission_id
+        # filter rules only apply to recursive items, and chunks with no recursive
+        # items do not need them
+        if not any(item["recursive"] for item in items):
+            doc.pop("filter_rules", None)
+        return doc
+
+    def _submit_chunk(self, index: int) -> Dict[str, Any]:
+        chunk = self.manifest.chunks[index]
+        submission_id = chunk["submission_id"]
+        if not submission_id:
+            submission_id = self.transfer_client.get_submission_id()["value"]
+            self.manifest.update(index, submission_id=submission_id)
+
+        res = self.transfer_client.submit_transfer(
+            self._chunk_document(index, submission_id)
+        )
+        self.manifest.update(index, task_id=res["task_id"])
+        return {"status": res["code"], "message": res["message"]}
+
+    def submit(self) -> Iterator[Dict[str, Any]]:
+        """
+        Submit the chunks which do not have tasks yet, producing a record for
+        each chunk as its submission completes. Chunks which were submitted in an
+        earlier run are produced first.
+        """
+        self.manifest.load_or_create(self.chunk_items)
+
+        pending = []
+        for chunk in self.manifest.chunks:
+            if chunk["task_id"]:
+                yield self._record(chunk, "Resumed", "Submitted by an earlier run")
+            else:
+                pending.append(chunk["chunk"])
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = {
+                executor.submit(self._submit_chunk, index): index for index in pending
+            }
+            for future in as_completed(futures):
+                chunk = self.manifest.chunks[futures[future]]
+                try:
+                    result = future.result()
+                except globus_sdk.GlobusAPIError as err:
+                    self.failed += 1
+                    yield self._record(chunk, "Failed", err.message)
+                except globus_sdk.NetworkError as err:
+                    self.failed += 1
+                    yield self._record(chunk, "Failed", str(err))
+                else:
+                    yield self._record(chunk, result["status"], result["message"])
+
+    @staticmethod
+    def _record(
+        chunk: Dict[str, Any], status: str, message: Optional[str]
+    ) -> Dict[str, Any]:
+        return {
+            "chunk": chunk["chunk"],
+            "item_count": chunk["item_count"],
+            "submission_id": chunk["submission_id"],
+            "task_id": chunk["task_id"],
+            "status": status,
+            "message": message,
+        }
@@ -1,10 +1,10 @@
 import logging
 import textwrap
 import uuid
-from typing import Any, Dict, Tuple, Union
+from typing import Any, Dict, Iterable, Optional, Tuple, Union
 
 import click
-from globus_sdk import GlobusHTTPResponse, TransferClient
+from globus_sdk import DeleteData, GlobusHTTPResponse, TransferClient, TransferData
 from globus_sdk.transport import (
     RetryCheckFlags,
     RetryCheckResult,
@@ -14,8 +14,12 @@ from globus_sdk.transport import (
 
 from globus_cli.login_manager import get_client_login, is_client_login
 
+from .activation_cache import ActivationCache
 from .data import display_name_or_cname
+from .ls_cache import LsCache
+from .rate_limit import AdaptiveRateLimiter
 from .recursive_ls import RecursiveLsResponse
+from .streaming_data import StreamingJSONRequestEncoder, StreamingTransferData
 
 log = logging.getLogger(__name__)
 
@@ -46,12 +50,101 @@ class CustomTransferClient(TransferClient):
         super().__init__(*args, **kwargs)
         self.transport.register_retry_check(_retry_client_consent)
 
+        # all requests made by this client, including every page of paginated calls
+        # and every listing of a recursive ls, share one rate limiter
+        # its feedback check goes first so that it sees every response, even those
+        # for which another check decides to retry
+        self.rate_limiter = AdaptiveRateLimiter()
+        self.transport.retry_checks.insert(0, self.rate_limiter.check_response)
+        # report the limiter's totals when the command which made the client ends
+        ctx = click.get_current_context(silent=True)
+        if ctx is not None:
+            ctx.call_on_close(self.rate_limiter.log_summary)
+
+        # commands which opt in to caching listings set this
+        self.ls_cache: Optional[LsCache] = None
+
+        # the encoders are shared by all transports unless they are copied
+        self.transport.encoders = {
+            **self.transport.encoders,
+            "json_stream": StreamingJSONRequestEncoder(),
+        }
+
+    def request(self, *args, **kwargs) -> GlobusHTTPResponse:
+        self.rate_limiter.acquire()
+        return super().request(*args, **kwargs)
+
+    def operation_ls(self, endpoint_id, path=None, **kwargs):
+        # a cached listing is a CachedLsResponse rather than a GlobusHTTPResponse
+        if self.ls_cache is None:
+            return super().operation_ls(endpoint_id, path, **kwargs)
+
+        cached = self.ls_cache.get(endpoint_id, path, kwargs)
+        if cached is not None:
+            return cached
+        res = super().operation_ls(endpoint_id, path, **kwargs)
+        self.ls_cache.put(endpoint_id, path, kwargs, res.data)
+        return res
+
+    def _invalidate_ls_cache(self, endpoint_id, changed_paths: Iterable[str]) -> None:
+        # listings may have been cached by an earlier command, so use the cache
+        # even if this command did not opt in to it
+        cache = self.ls_cache or LsCache.open_existing()
+        if cache is not None:
+            cache.invalidate(endpoint_id, changed_paths)
+            if cache is not self.ls_cache:
+                cache.close()
+
+    def operation_mkdir(self, endpoint_id, path, **kwargs) -> GlobusHTTPResponse:
+        res = super().operation_mkdir(endpoint_id, path, **kwargs)
+        self._invalidate_ls_cache(endpoint_id, [path])
+        return res
+
+    def operation_rename(
+        self, endpoint_id, oldpath, newpath, **kwargs
+    ) -> GlobusHTTPResponse:
+        res = super().operation_rename(endpoint_id, oldpath, newpath, **kwargs)
+        self._invalidate_ls_cache(endpoint_id, [oldpath, newpath])
+        return res
+
+    def endpoint_deactivate(self, endpoint_id, **kwargs) -> GlobusHTTPResponse:
+        res = super().endpoint_deactivate(endpoint_id, **kwargs)
+        # a cached activation result would let commands skip autoactivation
+        ActivationCache.open_default().invalidate(endpoint_id)
+        return res
+
+    def submit_transfer(
+        self, data: Union[Dict[str, Any], TransferData, StreamingTransferData]
+    ) -> GlobusHTTPResponse:
+        # a streaming document is sent a chunk at a time, rather than as one string
+        if isinstance(data, StreamingTransferData):
+            log.info("TransferClient.submit_transfer(...) (streaming)")
+            # the SDK's annotation does not allow for custom encodings of objects
+            return self.post(
+                "/transfer", data=data, encoding="json_stream"  # type: ignore
+            )
+        return super().submit_transfer(data)
+
+    def submit_delete(self, data: Union[Dict[str, Any], DeleteData]):
+        res = super().submit_delete(data)
+        # the task runs asynchronously, but it is likely to have started by the
+        # time that the paths are listed again
+        self._invalidate_ls_cache(
+            data["endpoint"], (item["path"] for item in data["DATA"])
+        )
+        return res
+
     # TODO: Remove this function when endpoints natively support recursive ls
     def recursive_operation_ls(
         self,
         endpoint_id: Union[str, uuid.UUID],
         params: Dict[str, Any],
         depth: int = 3,
+        max_workers: int = 1,
+        checkpoint_file: Optional[str] = None,
+        filter_items_only: bool = False,
+        compact_items: bool = False,
+        sort_by_name: bool = False,
     ) -> RecursiveLsResponse:
         """
         Makes recursive calls to ``GET /operation/endpoint/<endpoint_id>/ls``
@@ -65,15 +158,35 @@ class CustomTransferClient(TransferClient):
             in params, the start path is determined by this endpoint.
         :param params: Parameters that will be passed through as query params.
         :param depth: The maximum file depth the recursive ls will go to.
+        :param max_workers: The maximum number of concurrent ls calls to make.
+        :param checkpoint_file: A file in which to save the progress of the listing,
+            and from which to resume it if it already exists.
+        :param filter_items_only: Apply any filter in params to the items listed,
+            but walk every directory regardless of the filter.
+        :param compact_items: Produce items as ``ListingItem`` objects, which use
+            less memory than dicts.
+        :param sort_by_name: Sort the items of each directory by name, and walk
+            subdirectories in that order.
         """
         endpoint_id = str(endpoint_id)
         log.info(
-            "TransferClient.recursive_operation_ls(%s, %s, %s)",
+            "TransferClient.recursive_operation_ls(%s, %s, %s, %s)",
             endpoint_id,
             depth,
+            max_workers,
+            params,
+        )
+        return RecursiveLsResponse(
+            self,
+            endpoint_id,
             params,
+            max_depth=depth,
+            max_workers=max_workers,
+            checkpoint_file=checkpoint_file,
+            filter_items_only=filter_items_only,
+            compact_items=compact_items,
+            sort_by_name=sort_by_name,
         )
-        return RecursiveLsResponse(self, endpoint_id, params, max_depth=depth)
 
     def get_endpoint_w_server_list(
         self, endpoint_id
@@ -0,0 +1,212 @@
+import fnmatch
+import json
+import logging
+import posixpath
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Sequence, Set, Tuple
+
+import globus_sdk
+
+if TYPE_CHECKING:
+    from .client import CustomTransferClient
+
+log = logging.getLogger(__name__)
+
+# directories with fewer items than this in the batch are not listed, as there
+# would be little or nothing to gain from collapsing them
+COALESCE_MIN_ITEMS = 2
+
+# the number of concurrent listings
+COALESCE_WORKERS = 4
+
+# (source dir, destination dir, checksum algorithm)
+GROUP_KEY_T = Tuple[str, str, Optional[str]]
+
+
+class _Group:
+    __slots__ = ("files", "dirs", "indices")
+
+    def __init__(self) -> None:
+        # the names of the files and of the (already collapsed) subdirectories of
+        # the directory which are transferred by the batch
+        self.files: Set[str] = set()
+        self.dirs: Set[str] = set()
+        # the positions of the batch items which a recursive item would replace
+        self.indices: List[int] = []
+
+
+def _split(path: str) -> Optional[Tuple[str, str]]:
+    parent, name = posixpath.split(path)
+    if not parent or not name or name in (".", ".."):
+        return None
+    return parent, name
+
+
+def _depth(path: str) -> int:
+    return path.rstrip("/").count("/")
+
+
+def _payload_size(items: Sequence[Dict[str, Any]]) -> int:
+    return len(json.dumps(items, separators=(",", ":")))
+
+
+class BatchCoalescer:
+    """
+    Replace the items of a batch which transfer every entry of a source directory
+    with a single recursive item for that directory.
+
+    Items are grouped by the directories which contain their source and
+    destination paths, and only items which keep the name of their source are
+    grouped (so that a recursive transfer of the source directory to the
+    destination directory is equivalent). For each group, the source directory is
+    listed, and if every entry in the listing is covered by the batch, the group
+    is collapsed. Groups are collapsed from the deepest directories up, so a
+    directory whose subdirectories were all collapsed can be collapsed in turn.
+
+    Directories are left alone, and their items are kept, if they contain
+    anything the batch does not transfer (including empty subdirectories, which a
+    recursive item would create), anything which is neither a file nor a
+    directory, or anything which matches an exclude pattern. Items with external
+    checksums are never collapsed.
+
+    :param transfer_client: The client to use for listing
+    :param source_endpoint: The source endpoint ID
+    :param items: The items of the batch
+    :param exclude: The exclude patterns of the transfer
+    :param min_items: Only list directories with at least this many batch items
+    :param max_workers: The number of concurrent listings
+    """
+
+    def __init__(
+        self,
+        transfer_client: "CustomTransferClient",
+        source_endpoint: str,
+        items: List[Dict[str, Any]],
+        *,
+        exclude: Sequence[str] = (),
+        min_items: int = COALESCE_MIN_ITEMS,
+        max_workers: int = COALESCE_WORKERS,
+    ) -> None:
+        self.transfer_client = transfer_client
+        self.source_endpoint = source_endpoint
+        self.items = items
+        self.exclude = exclude
+        self.min_items = min_items
+        self.max_workers = max_workers
+
+        self.directories_listed = 0
+        self.directories_collapsed = 0
+        self.payload_bytes_before = 0
+        self.payload_bytes_after = 0
+
+    def _group_key(self, item: Dict[str, Any]) -> Optional[Tuple[GROUP_KEY_T, str]]:
+        if item.get("external_checksum"):
+            return None
+        source = _split(item["source_path"])
+        dest = _split(item["destination_path"])
+        if source is None or dest is None or source[1] != dest[1]:
+            return None
+        return (source[0], dest[0], item.get("checksum_algorithm")), source[1]
+
+    def _is_covered(self, key: GROUP_KEY_T, group: _Group) -> bool:
+        source_dir = key[0]
+        try:
+            res = self.transfer_client.operation_ls(
+                self.source_endpoint, path=source_dir, show_hidden=1
+            )
+        except globus_sdk.TransferAPIError as err:
+            log.info("not coalescing '%s', listing failed: %s", source_dir, err)
+            return False
+
+        for entry in res:
+            name = entry["name"]
+            if any(fnmatch.fnmatchcase(name, p) for p in self.exclude):
+                return False
+            if entry["type"] == "file":
+                if name not in group.files:
+                    return False
+            elif entry["type"] == "dir":
+                if name not in group.dirs:
+                    return False
+            else:
+                return False
+        return True
+
+    def coalesce(self) -> List[Dict[str, Any]]:
+        """
+        Produce the items of the batch after collapsing the directories which are
+        completely covered. Each recursive item takes the place of the first item
+        which it replaces.
+        """
+        self.payload_bytes_before = _payload_size(self.items)
+
+        groups: Dict[GROUP_KEY_T, _Group] = {}
+        for index, item in enumerate(self.items):
+            found = self._group_key(item)
+            if found is None:
+                continue
+            key, name = found
+            group = groups.setdefault(key, _Group())
+            if item["recursive"]:
+                group.dirs.add(name)
+            else:
+                group.files.add(name)
+            group.indices.append(index)
+
+        # the recursive items which replace collapsed groups, by the position of
+        # the first item they replace
+        replacements: Dict[int, Dict[str, Any]] = {}
+        removed: Set[int] = set()
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            while groups:
+                # a group can only gain items from deeper groups, so each level is
+                # complete once all of the deeper levels have been processed
+                depth = max(_depth(key[0]) for key in groups)
+                level = [
+                    (key, group)
+                    for key, group in groups.items()
+                    if _depth(key[0]) == depth
+                    and len(group.files) + len(group.dirs) >= self.min_items
+                ]
+                for key in [key for key in groups if _depth(key[0]) == depth]:
+                    del groups[key]
+
+                self.directories_listed += len(level)
+                covered = executor.map(lambda kg: self._is_covered(*kg), level)
+                for (key, group), is_covered in zip(level, covered):
+                    if not is_covered:
+                        continue
+                    self.directories_collapsed += 1
+                    source_dir, dest_dir, checksum_algorithm = key
+                    # this also drops the recursive items of collapsed subdirectories
+                    for i in group.indices:
+                        replacements.pop(i, None)
+                    removed.update(group.indices)
+
+                    first = min(group.indices)
+                    item = {
+                        "DATA_TYPE": "transfer_item",
+                        "source_path": source_dir,
+                        "destination_path": dest_dir,
+                        "recursive": True,
+                        "external_checksum": None,
+                        "checksum_algorithm": checksum_algorithm,
+                    }
+                    replacements[first] = item
+
+                    # the collapsed directory is now an item of its parent
+                    found = self._group_key(item)
+                    if found is not None:
+                        parent_key, name = found
+                        parent = groups.setdefault(parent_key, _Group())
+                        parent.dirs.add(name)
+                        parent.indices.append(first)
+
+        result = [
+            replacements.get(i, item)
+            for i, item in enumerate(self.items)
+            if i in replacements or i not in removed
+        ]
+        self.payload_bytes_after = _payload_size(result)
+        return result
@@ -0,0 +1,120 @@
+import posixpath
+from typing import Any, Dict, Iterable, Iterator, List, Mapping
+
+
+class _OpenDir:
+    __slots__ = ("path", "depth", "size", "file_count", "dir_count", "unvisited")
+
+    def __init__(self, path: str, depth: int) -> None:
+        self.path = path
+        self.depth = depth
+        self.size = 0
+        self.file_count = 0
+        self.dir_count = 0
+        # the names of subdirectories which have been seen in this directory's
+        # listing, but whose own contents have not been seen yet, in listing order
+        # (a dict is used as an ordered set)
+        self.unvisited: Dict[str, None] = {}
+
+
+def _is_within(path: str, dir_path: str) -> bool:
+    return not dir_path or path == dir_path or path.startswith(dir_path + "/")
+
+
+class DiskUsageAggregator:
+    """
+    Sum the sizes and counts of the items produced by a recursive ls, as they are
+    produced.
+
+    The items of a recursive ls arrive in depth-first order, with names relative
+    to the starting directory, so a directory's totals are final as soon as an
+    item from outside of it arrives. Only the running totals of the directories
+    which are still open (the current directory and its ancestors) are kept in
+    memory.
+
+    :param walk_depth: The depth limit of the recursive ls, used to tell empty
+        directories apart from directories which were never listed
+    :param report_depth: Produce totals for directories up to this many levels
+        below the starting directory
+    """
+
+    def __init__(self, *, walk_depth: int, report_depth: int) -> None:
+        self.walk_depth = walk_depth
+        self.report_depth = report_depth
+        # the number of directories whose contents were not counted because they
+        # were below the depth limit of the walk
+        self.unlisted_dirs = 0
+
+    def aggregate(self, items: Iterable[Mapping[str, Any]]) -> Iterator[Dict[str, Any]]:
+        """
+        Consume the items of a recursive ls, producing a record of the totals for
+        each directory as it is completed. The totals for the starting directory
+        (with a path of ".") are produced last.
+        """
+        stack: List[_OpenDir] = [_OpenDir("", 0)]
+
+        for item in items:
+            name = item["name"]
+            parent_path = posixpath.dirname(name)
+
+            while not _is_within(parent_path, stack[-1].path):
+                yield from self._close(stack)
+            while stack[-1].path != parent_path:
+                top = stack[-1]
+                rel = parent_path[len(top.path) :].lstrip("/")
+                child_name = rel.split("/", 1)[0]
+                yield from self._visit(top, child_name)
+                stack.append(
+                    _OpenDir(posixpath.join(top.path, child_name), top.depth + 1)
+                )
+
+            current = stack[-1]
+            if item["type"] == "dir":
+                current.dir_count += 1
+                if current.depth < self.walk_depth:
+                    current.unvisited[posixpath.basename(name)] = None
+                else:
+                    self.unlisted_dirs += 1
+            else:
+                current.file_count += 1
+                current.size += item.get("size") or 0
+
+        while stack:
+            yield from self._close(stack)
+
+    def _visit(self, parent: _OpenDir, child_name: str) -> Iterator[Dict[str, Any]]:
+        """
+        Mark a subdirectory as visited. Subdirectories are walked in listing order,
+        so any which were listed before it but never produced any items are empty.
+        """
+        while parent.unvisited:
+            name = next(iter(parent.unvisited))
+            del parent.unvisited[name]
+            if name == child_name:
+                return
+            if parent.depth < self.report_depth:
+                yield self._record(posixpath.join(parent.path, name), 0, 0, 0)
+
+    def _close(self, stack: List[_OpenDir]) -> Iterator[Dict[str, Any]]:
+        closed = stack.pop()
+        yield from self._visit(closed, "")
+        if closed.depth <= self.report_depth:
+            yield self._record(
+                closed.path or ".", closed.size, closed.file_count, closed.dir_count
+            )
+        if stack:
+            parent = stack[-1]
+            parent.size += closed.size
+            parent.file_count += closed.file_count
+            parent.dir_count += closed.dir_count
+
+    @staticmethod
+    def _record(
+        path: str, size: int, file_count: int, dir_count: int
+    ) -> Dict[str, Any]:
+        return {
+            "path": path,
+            "size": size,
+            "file_count": file_count,
+            "dir_count": dir_count,
+        }
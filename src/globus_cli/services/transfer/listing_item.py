@@ -0,0 +1,96 @@
+import sys
+from collections.abc import Mapping
+from typing import Any, Dict, Iterator, Optional
+
+# the fields of an operation_ls item, each of which has a slot in a ListingItem
+LISTING_ITEM_FIELDS = (
+    "DATA_TYPE",
+    "name",
+    "type",
+    "size",
+    "permissions",
+    "user",
+    "group",
+    "last_modified",
+    "link_target",
+    "link_size",
+    "link_user",
+    "link_group",
+    "link_last_modified",
+)
+
+_FIELD_SET = frozenset(LISTING_ITEM_FIELDS)
+
+# fields whose values are drawn from a small set and repeated across a listing,
+# so a single shared copy of each value is kept
+_INTERNED_FIELDS = frozenset(
+    ("DATA_TYPE", "type", "permissions", "user", "group", "link_user", "link_group")
+)
+
+_MISSING = object()
+
+
+class ListingItem(Mapping):
+    """
+    A compact, read-only representation of an item from an operation_ls listing.
+
+    Large recursive listings can produce millions of items. As dicts, every item
+    carries its own hash table and its own copies of strings like the user, group,
+    and permissions. A ListingItem stores the known fields in slots, interns the
+    repeated string values, and only allocates a dict for unexpected fields.
+
+    It is a Mapping with the same keys and values as the original item, so it can
+    be used wherever the item dict was. Like a response, its ``data`` attribute is
+    a plain dict, for serialization.
+
+    :param item: The item, as returned by the API
+    :param name: A name to use in place of the item's name
+    """
+
+    __slots__ = LISTING_ITEM_FIELDS + ("_extra",)
+
+    _extra: Optional[Dict[str, Any]]
+
+    def __init__(self, item: Dict[str, Any], name: Optional[str] = None) -> None:
+        extra = None
+        for key, value in item.items():
+            if key in _INTERNED_FIELDS and isinstance(value, str):
+                value = sys.intern(value)
+            if key in _FIELD_SET:
+                object.__setattr__(self, key, value)
+            else:
+                if extra is None:
+                    extra = {}
+                extra[key] = value
+        if name is not None:
+            object.__setattr__(self, "name", name)
+        object.__setattr__(self, "_extra", extra)
+
+    def __setattr__(self, key: str, value: Any) -> None:
+        raise AttributeError("ListingItem is read-only")
+
+    def __getitem__(self, key: str) -> Any:
+        if key in _FIELD_SET:
+            value = getattr(self, key, _MISSING)
+            if value is not _MISSING:
+                return value
+        elif self._extra is not None and key in self._extra:
+            return self._extra[key]
+        raise KeyError(key)
+
+    def __iter__(self) -> Iterator[str]:
+        for key in LISTING_ITEM_FIELDS:
+            if hasattr(self, key):
+                yield key
+        if self._extra is not None:
+            yield from self._extra
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def __repr__(self) -> str:
+        return f"ListingItem({self.data!r})"
+
+    @property
+    def data(self) -> Dict[str, Any]:
+        return dict(self.items())
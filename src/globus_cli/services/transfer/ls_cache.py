@@ -0,0 +1,217 @@
+import json
+import logging
+import os
+import posixpath
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Iterable, Iterator, Optional
+
+from globus_cli.login_manager.tokenstore import _get_data_dir
+from globus_cli.utils import CLIStubResponse
+
+log = logging.getLogger(__name__)
+
+LS_CACHE_FILENAME = "ls_cache.db"
+
+# the maximum total size (of the JSON documents) of all cached listings
+LS_CACHE_MAX_BYTES = 64 * 1024 * 1024
+
+
+def _cache_filename() -> str:
+    # kept in the same directory as the token storage
+    return os.path.join(_get_data_dir(), LS_CACHE_FILENAME)
+
+
+def _normalize_path(path: Optional[str]) -> str:
+    # "" is the endpoint's default directory
+    if not path:
+        return ""
+    return path.rstrip("/") or "/"
+
+
+class CachedLsResponse(CLIStubResponse):
+    """
+    An operation_ls result read from the cache. Like the IterableTransferResponse
+    it replaces, iterating over it yields the items of the listing.
+    """
+
+    data: Dict[str, Any]
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self.data["DATA"])
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return self.data.get(key, default)
+
+
+class LsCache:
+    """
+    A local cache of operation_ls results, stored in a SQLite database.
+
+    Listings are keyed by the login namespace, endpoint, requested path, and the
+    other ls params. Listings older than ``ttl`` seconds are never returned, and
+    when the cached listings total more than ``max_bytes``, the least recently used
+    ones are evicted.
+
+    Changes made through the CLI invalidate listings with :meth:`invalidate`. A
+    listing is also recorded under the absolute path reported by the service, so
+    that a change to ``/home/user/foo`` is seen by a cached listing of ``~/foo``.
+
+    :param filename: The path of the cache database
+    :param namespace: Keeps the listings seen by different logins apart
+    :param ttl: The maximum age (in seconds) of a listing which will be returned
+    :param refresh: Never return cached listings, but still store new ones
+    :param max_bytes: The maximum total size of the cached listings
+    """
+
+    def __init__(
+        self,
+        filename: str,
+        *,
+        namespace: str = "",
+        ttl: float = 0,
+        refresh: bool = False,
+        max_bytes: int = LS_CACHE_MAX_BYTES,
+    ) -> None:
+        self.filename = filename
+        self.namespace = namespace
+        self.ttl = ttl
+        self.refresh = refresh
+        self.max_bytes = max_bytes
+
+        # recursive listings may use the cache from several threads
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(filename, check_same_thread=False)
+        # the cache is disposable, so favor speed over durability
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=OFF")
+        with self._db:
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS listing ("
+                "namespace TEXT, endpoint_id TEXT, path TEXT, params TEXT, "
+                "resolved_path TEXT, doc TEXT, size INTEGER, "
+                "created REAL, last_used REAL, "
+                "PRIMARY KEY (namespace, endpoint_id, path, params))"
+            )
+            self._db.execute(
+                "CREATE INDEX IF NOT EXISTS listing_last_used ON listing (last_used)"
+            )
+        (total,) = self._db.execute("SELECT TOTAL(size) FROM listing").fetchone()
+        self._total_bytes = int(total)
+
+    @classmethod
+    def open_default(cls, **kwargs: Any) -> "LsCache":
+        """Open the cache in the CLI's data directory, creating it if necessary"""
+        os.makedirs(os.path.dirname(_cache_filename()), exist_ok=True)
+        return cls(_cache_filename(), **kwargs)
+
+    @classmethod
+    def open_existing(cls) -> Optional["LsCache"]:
+        """Open the cache in the CLI's data directory, if there is one"""
+        if not os.path.exists(_cache_filename()):
+            return None
+        return cls(_cache_filename())
+
+    def close(self) -> None:
+        self._db.close()
+
+    def _key(self, endpoint_id: str, path: Optional[str], params: Dict[str, Any]):
+        return (
+            self.namespace,
+            str(endpoint_id),
+            _normalize_path(path),
+            json.dumps(params, sort_keys=True, default=str),
+        )
+
+    def get(
+        self, endpoint_id: str, path: Optional[str], params: Dict[str, Any]
+    ) -> Optional[CachedLsResponse]:
+        """Get a cached listing, or None if there is no fresh one"""
+        if self.refresh:
+            return None
+        key = self._key(endpoint_id, path, params)
+        now = time.time()
+        with self._lock, self._db:
+            row = self._db.execute(
+                "SELECT rowid, doc, created FROM listing "
+                "WHERE namespace=? AND endpoint_id=? AND path=? AND params=?",
+                key,
+            ).fetchone()
+            if row is None:
+                return None
+            rowid, doc, created = row
+            if now - created >= self.ttl:
+                return None
+            self._db.execute(
+                "UPDATE listing SET last_used=? WHERE rowid=?", (now, rowid)
+            )
+        log.debug("ls cache hit for %s:%s %s", endpoint_id, path, params)
+        return CachedLsResponse(json.loads(doc))
+
+    def put(
+        self,
+        endpoint_id: str,
+        path: Optional[str],
+        params: Dict[str, Any],
+        data: Dict[str, Any],
+    ) -> None:
+        """Store a listing, evicting the least recently used ones if necessary"""
+        key = self._key(endpoint_id, path, params)
+        doc = json.dumps(data, separators=(",", ":"))
+        if len(doc) > self.max_bytes:
+            return
+        now = time.time()
+        with self._lock, self._db:
+            old = self._db.execute(
+                "SELECT size FROM listing "
+                "WHERE namespace=? AND endpoint_id=? AND path=? AND params=?",
+                key,
+            ).fetchone()
+            self._db.execute(
+                "INSERT OR REPLACE INTO listing VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                key + (_normalize_path(data.get("path")), doc, len(doc), now, now),
+            )
+            self._total_bytes += len(doc) - (old[0] if old else 0)
+            if self._total_bytes > self.max_bytes:
+                self._evict()
+
+    def _evict(self) -> None:
+        evicted = []
+        for rowid, size in self._db.execute(
+            "SELECT rowid, size FROM listing ORDER BY last_used ASC"
+        ):
+            if self._total_bytes <= self.max_bytes:
+                break
+            evicted.append((rowid,))
+            self._total_bytes -= size
+        self._db.executemany("DELETE FROM listing WHERE rowid=?", evicted)
+        log.debug("ls cache evicted %d listings", len(evicted))
+
+    def invalidate(self, endpoint_id: str, changed_paths: Iterable[str]) -> None:
+        """
+        Drop the cached listings (for all logins) which may be affected by changes
+        to the given paths: the listing of each path's parent directory, and the
+        listings of the path itself and anything under it.
+        """
+        endpoint_id = str(endpoint_id)
+        exact, subtrees = [], []
+        for changed_path in changed_paths:
+            path = _normalize_path(changed_path)
+            for target in (posixpath.dirname(path), path):
+                exact.append((endpoint_id, target, target))
+            prefix = path if path.endswith("/") else path + "/"
+            subtrees.append((endpoint_id, len(prefix), prefix, len(prefix), prefix))
+        with self._lock, self._db:
+            self._db.executemany(
+                "DELETE FROM listing WHERE endpoint_id=? "
+                "AND (path=? OR resolved_path=?)",
+                exact,
+            )
+            self._db.executemany(
+                "DELETE FROM listing WHERE endpoint_id=? "
+                "AND (substr(path, 1, ?)=? OR substr(resolved_path, 1, ?)=?)",
+                subtrees,
+            )
+            (total,) = self._db.execute("SELECT TOTAL(size) FROM listing").fetchone()
+            self._total_bytes = int(total)
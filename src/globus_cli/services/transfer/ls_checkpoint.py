@@ -0,0 +1,123 @@
+import json
+import logging
+import os
+import time
+from typing import TYPE_CHECKING, Any, Dict, Iterable, Iterator, Optional, TextIO
+
+import click
+
+if TYPE_CHECKING:
+    from .recursive_ls import QUEUE_ENTRY_T
+
+log = logging.getLogger(__name__)
+
+# the minimum number of seconds between checkpoint writes during a walk
+CHECKPOINT_INTERVAL = 30
+
+CHECKPOINT_VERSION = 3
+
+
+class RecursiveLsCheckpoint:
+    """
+    On-disk state for a resumable recursive ls.
+
+    The checkpoint records the directories still waiting to be listed (the
+    frontier). A directory is only removed from the frontier once all of its
+    contents have been emitted, so resuming never skips part of a directory, and
+    only repeats the contents of a directory which was interrupted partway
+    through.
+
+    The file holds a JSON header on its first line, and then one queue entry per
+    line, so that the queue can be written and read back one entry at a time
+    rather than held in memory (see DirectoryFrontier).
+
+    Writes go to a temporary file which is then renamed over the checkpoint, so an
+    interruption during a write leaves the previous checkpoint intact.
+
+    :param filename: The path of the checkpoint file
+    :param identity: A description of the listing (endpoint, params, depth). A
+        checkpoint can only be resumed by a listing with the same identity.
+    """
+
+    def __init__(self, filename: str, identity: Dict[str, Any]) -> None:
+        self.filename = filename
+        # normalize through JSON so that it compares equal to a loaded identity
+        self.identity = json.loads(json.dumps(identity))
+        self._last_save = time.monotonic()
+
+    def _invalid(self) -> click.UsageError:
+        return click.UsageError(
+            f"'{self.filename}' is not a valid recursive ls checkpoint"
+        )
+
+    def load(self) -> Optional[Iterator["QUEUE_ENTRY_T"]]:
+        """
+        Check the checkpoint, returning an iterator over its queue or None if
+        there is no checkpoint to resume from.
+
+        The queue entries are read from the file as the iterator is consumed.
+        """
+        try:
+            fp = open(self.filename)
+        except FileNotFoundError:
+            return None
+        try:
+            header = json.loads(fp.readline())
+        except ValueError:
+            fp.close()
+            raise self._invalid()
+
+        if not isinstance(header, dict) or (
+            header.get("version") != CHECKPOINT_VERSION
+            or header.get("identity") != self.identity
+        ):
+            fp.close()
+            raise click.UsageError(
+                f"'{self.filename}' is a checkpoint for a different listing. "
+                "Use a new checkpoint file or repeat the original command."
+            )
+        log.info("resuming recursive ls from '%s'", self.filename)
+        return self._read_queue(fp)
+
+    def _read_queue(self, fp: TextIO) -> Iterator["QUEUE_ENTRY_T"]:
+        with fp:
+            for line in fp:
+                try:
+                    abs_path, rel_path, depth = json.loads(line)
+                except (TypeError, ValueError):
+                    raise self._invalid()
+                yield (abs_path, rel_path, depth)
+
+    def save(self, queue: Iterable["QUEUE_ENTRY_T"]) -> None:
+        queue_len = 0
+        tmp_filename = self.filename + ".tmp"
+        with open(tmp_filename, "w") as fp:
+            json.dump(
+                {"version": CHECKPOINT_VERSION, "identity": self.identity},
+                fp,
+                separators=(",", ":"),
+            )
+            fp.write("\n")
+            for entry in queue:
+                json.dump(entry, fp, separators=(",", ":"))
+                fp.write("\n")
+                queue_len += 1
+        os.replace(tmp_filename, self.filename)
+        self._last_save = time.monotonic()
+        log.debug(
+            "saved recursive ls checkpoint to '%s' (%d dirs pending)",
+            self.filename,
+            queue_len,
+        )
+
+    def maybe_save(self, queue: Iterable["QUEUE_ENTRY_T"]) -> None:
+        """Save the checkpoint if CHECKPOINT_INTERVAL has passed since the last one"""
+        if time.monotonic() - self._last_save >= CHECKPOINT_INTERVAL:
+            self.save(queue)
+
+    def remove(self) -> None:
+        """Remove the checkpoint, once the walk is complete"""
+        try:
+            os.remove(self.filename)
+        except FileNotFoundError:
+            pass
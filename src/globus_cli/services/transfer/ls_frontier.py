@@ -0,0 +1,154 @@
+import logging
+import sqlite3
+from collections import deque
+from typing import TYPE_CHECKING, Deque, Iterable, Iterator, Optional
+
+if TYPE_CHECKING:
+    from .recursive_ls import QUEUE_ENTRY_T
+
+log = logging.getLogger(__name__)
+
+# the default number of queue entries held in memory before spilling to disk
+FRONTIER_MEMORY_LIMIT = 100_000
+
+# the number of entries read back from disk at a time
+_READ_BATCH_SIZE = 1000
+
+
+class DirectoryFrontier:
+    """
+    The stack of directories waiting to be listed in a recursive ls.
+
+    It supports the subset of the ``deque`` interface used by the walk (entries
+    are pushed and popped on the right), but holds at most ``memory_limit`` entries
+    in memory. Beyond that, the oldest entries -- the ones furthest from being
+    listed -- are spilled to a temporary SQLite database, and are read back in
+    batches as the entries above them are consumed.
+
+    SQLite's private temporary databases are deleted when their connection closes,
+    so nothing is left behind on disk. The database is only created on the first
+    spill.
+
+    :param memory_limit: The maximum number of entries to keep in memory
+    """
+
+    def __init__(self, memory_limit: int = FRONTIER_MEMORY_LIMIT) -> None:
+        self._memory_limit = max(memory_limit, 2)
+        # the top of the stack
+        self._memory: Deque["QUEUE_ENTRY_T"] = deque()
+        # the bottom of the stack, ordered by rowid
+        self._db: Optional[sqlite3.Connection] = None
+        self._disk_count = 0
+
+    def __len__(self) -> int:
+        return len(self._memory) + self._disk_count
+
+    def __bool__(self) -> bool:
+        return len(self) > 0
+
+    def __getitem__(self, index: int) -> "QUEUE_ENTRY_T":
+        # only peeking at the top of the stack is supported
+        if index != -1:
+            raise IndexError("DirectoryFrontier only supports index -1")
+        self._unspill()
+        return self._memory[-1]
+
+    def __iter__(self) -> Iterator["QUEUE_ENTRY_T"]:
+        """Iterate from the bottom of the stack to the top, like a deque"""
+        yield from self._iter_disk(descending=False)
+        yield from list(self._memory)
+
+    def __reversed__(self) -> Iterator["QUEUE_ENTRY_T"]:
+        """
+        Iterate from the top of the stack to the bottom, in pop order
+
+        Callers usually only look at the first few entries, so the in-memory
+        entries are not copied, and the stack must not be modified until the
+        iteration is finished.
+        """
+        yield from reversed(self._memory)
+        yield from self._iter_disk(descending=True)
+
+    def append(self, entry: "QUEUE_ENTRY_T") -> None:
+        self._memory.append(entry)
+        if len(self._memory) > self._memory_limit:
+            self._spill()
+
+    def extend(self, entries: Iterable["QUEUE_ENTRY_T"]) -> None:
+        for entry in entries:
+            self.append(entry)
+
+    def pop(self) -> "QUEUE_ENTRY_T":
+        self._unspill()
+        return self._memory.pop()
+
+    def close(self) -> None:
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+            self._disk_count = 0
+
+    def _get_db(self) -> sqlite3.Connection:
+        if self._db is None:
+            # an empty filename is a private temporary on-disk database
+            self._db = sqlite3.connect("")
+            self._db.execute(
+                "CREATE TABLE frontier ("
+                "id INTEGER PRIMARY KEY, abs_path TEXT, rel_path TEXT, depth INTEGER)"
+            )
+        return self._db
+
+    def _spill(self) -> None:
+        """Move the bottom half of the in-memory entries to disk"""
+        count = len(self._memory) // 2
+        # these entries are above everything already on disk, and rowids are
+        # assigned in increasing order, so stack order is preserved
+        self._get_db().executemany(
+            "INSERT INTO frontier (abs_path, rel_path, depth) VALUES (?, ?, ?)",
+            (self._memory.popleft() for _ in range(count)),
+        )
+        self._disk_count += count
+        log.debug(
+            "recursive ls frontier spilled %d entries to disk (%d on disk)",
+            count,
+            self._disk_count,
+        )
+
+    def _unspill(self) -> None:
+        """If memory is empty, read a batch of entries back from disk"""
+        if self._memory or not self._disk_count:
+            return
+        db = self._get_db()
+        rows = db.execute(
+            "SELECT id, abs_path, rel_path, depth FROM frontier "
+            "ORDER BY id DESC LIMIT ?",
+            (_READ_BATCH_SIZE,),
+        ).fetchall()
+        db.execute("DELETE FROM frontier WHERE id >= ?", (rows[-1][0],))
+        self._disk_count -= len(rows)
+        self._memory.extend((a, r, d) for (_, a, r, d) in reversed(rows))
+
+    def _iter_disk(self, *, descending: bool) -> Iterator["QUEUE_ENTRY_T"]:
+        # read in batches using the last seen rowid, rather than holding a cursor
+        # open, so that the stack can be modified between items
+        if self._db is None:
+            return
+        if descending:
+            query = (
+                "SELECT id, abs_path, rel_path, depth FROM frontier "
+                "WHERE id < ? ORDER BY id DESC LIMIT ?"
+            )
+            last_id = float("inf")
+        else:
+            query = (
+                "SELECT id, abs_path, rel_path, depth FROM frontier "
+                "WHERE id > ? ORDER BY id ASC LIMIT ?"
+            )
+            last_id = float("-inf")
+        while self._db is not None:
+            rows = self._db.execute(query, (last_id, _READ_BATCH_SIZE)).fetchall()
+            if not rows:
+                return
+            for _, abs_path, rel_path, depth in rows:
+                yield (abs_path, rel_path, depth)
+            last_id = rows[-1][0]
@@ -0,0 +1,175 @@
+import logging
+import threading
+import time
+from typing import Optional
+
+from globus_sdk.transport import RetryCheckResult, RetryContext
+
+log = logging.getLogger(__name__)
+
+# statuses which indicate that the service wants clients to slow down
+THROTTLE_STATUSES = (429, 503)
+
+
+def _parse_retry_after(ctx: RetryContext) -> Optional[float]:
+    if ctx.response is None:
+        return None
+    val = ctx.response.headers.get("Retry-After")
+    if not val:
+        return None
+    try:
+        return float(val)
+    except ValueError:
+        return None
+
+
+class AdaptiveRateLimiter:
+    """
+    A token bucket rate limiter which adjusts its rate based on how the service is
+    responding.
+
+    Every request takes one token from the bucket, which refills at ``rate`` tokens
+    per second up to a maximum of ``burst``. When the bucket is empty, callers sleep
+    until a token would be available, so short sequences of calls never wait.
+
+    The rate is adjusted by feedback from responses:
+
+    - a throttling response (429 or 503) or a network error halves the rate, and a
+      ``Retry-After`` header blocks all callers for the requested time
+    - a response received in under ``healthy_latency`` seconds increases the rate
+    - a slower response decreases the rate slightly
+
+    It is safe to share a limiter between threads.
+
+    :param rate: The initial number of requests per second
+    :param min_rate: The rate will never be lowered below this value
+    :param max_rate: The rate will never be raised above this value
+    :param burst: The size of the token bucket
+    :param healthy_latency: Responses faster than this (in seconds) speed up the rate
+    """
+
+    backoff_factor = 0.5
+    slow_factor = 0.9
+    speedup_increment = 0.5
+
+    def __init__(
+        self,
+        *,
+        rate: float = 10.0,
+        min_rate: float = 0.5,
+        max_rate: float = 50.0,
+        burst: int = 25,
+        healthy_latency: float = 1.0,
+    ) -> None:
+        self.rate = rate
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.burst = burst
+        self.healthy_latency = healthy_latency
+
+        # totals, for reporting
+        self.total_requests = 0
+        self.total_throttled = 0
+        self.total_waits = 0
+        self.total_sleep = 0.0
+
+        self._lock = threading.Lock()
+        self._tokens = float(burst)
+        self._last_refill = time.monotonic()
+        self._blocked_until = 0.0
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(
+            float(self.burst), self._tokens + (now - self._last_refill) * self.rate
+        )
+        self._last_refill = now
+
+    def acquire(self) -> None:
+        """
+        Take a token from the bucket, sleeping if none is available.
+
+        The token is reserved before sleeping (the bucket may go negative), so
+        concurrent callers queue up behind one another rather than all waking at
+        once.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self._tokens -= 1
+            delay = max(-self._tokens / self.rate, self._blocked_until - now, 0.0)
+            self.total_requests += 1
+            if delay > 0:
+                self.total_waits += 1
+                self.total_sleep += delay
+            rate, total_sleep = self.rate, self.total_sleep
+
+        if delay > 0:
+            log.debug(
+                "rate limiter sleeping %.3fs (rate=%.2f/s, total sleep=%.3fs)",
+                delay,
+                rate,
+                total_sleep,
+            )
+            time.sleep(delay)
+
+    def _set_rate(self, new_rate: float, reason: str) -> None:
+        new_rate = min(self.max_rate, max(self.min_rate, new_rate))
+        if new_rate != self.rate:
+            log.debug(
+                "rate limiter adjusted rate %.2f/s -> %.2f/s (%s, "
+                "total requests=%d, total sleep=%.3fs)",
+                self.rate,
+                new_rate,
+                reason,
+                self.total_requests,
+                self.total_sleep,
+            )
+            self.rate = new_rate
+
+    def log_summary(self) -> None:
+        """Log the totals of the limiter's activity, if any requests were made"""
+        with self._lock:
+            if not self.total_requests:
+                return
+            log.debug(
+                "rate limiter summary: requests=%d, throttled responses=%d, "
+                "waits=%d, total sleep=%.3fs, final rate=%.2f/s",
+                self.total_requests,
+                self.total_throttled,
+                self.total_waits,
+                self.total_sleep,
+                self.rate,
+            )
+
+    def check_response(self, ctx: RetryContext) -> RetryCheckResult:
+        """
+        A retry check which never makes a decision, but which observes every
+        response (and network error) to adjust the rate.
+        """
+        with self._lock:
+            if ctx.response is None:
+                if ctx.exception is not None:
+                    self._set_rate(self.rate * self.backoff_factor, "network error")
+            elif ctx.response.status_code in THROTTLE_STATUSES:
+                status = ctx.response.status_code
+                self.total_throttled += 1
+                self._set_rate(self.rate * self.backoff_factor, f"HTTP {status}")
+                # give up any saved burst, so that callers slow down immediately
+                self._tokens = min(self._tokens, 0.0)
+                retry_after = _parse_retry_after(ctx)
+                if retry_after is not None:
+                    log.debug("rate limiter honoring Retry-After=%s", retry_after)
+                    self._blocked_until = max(
+                        self._blocked_until, time.monotonic() + retry_after
+                    )
+            else:
+                latency = ctx.response.elapsed.total_seconds()
+                if latency < self.healthy_latency:
+                    self._set_rate(
+                        self.rate + self.speedup_increment, "healthy latency"
+                    )
+                else:
+                    self._set_rate(
+                        self.rate * self.slow_factor, f"slow response {latency:.3f}s"
+                    )
+        return RetryCheckResult.no_decision
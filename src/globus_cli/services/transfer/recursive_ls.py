@@ -1,35 +1,33 @@
 # TDOD: Remove this file when endpoints natively support recursive ls
 
 import logging
-import time
-from collections import deque
-from typing import Any, Deque, Dict, Iterator, Optional, Tuple, cast
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Dict, Generator, Iterator, List, Mapping, Optional, Tuple, cast
 
 from globus_sdk import TransferClient
+from globus_sdk.services.transfer.response import IterableTransferResponse
 
-log = logging.getLogger(__name__)
-
-ITEM_T = Dict[str, Any]
-QUEUE_T = Deque[Tuple[Optional[str], str, int]]
+from .listing_item import ListingItem
+from .ls_checkpoint import RecursiveLsCheckpoint
+from .ls_frontier import FRONTIER_MEMORY_LIMIT, DirectoryFrontier
 
-# constants for controlling client-side rate limiting
-SLEEP_FREQUENCY = 25
-SLEEP_LEN = 1
+log = logging.getLogger(__name__)
 
+ITEM_T = Mapping[str, Any]
+QUEUE_ENTRY_T = Tuple[Optional[str], str, int]
+QUEUE_T = DirectoryFrontier
+# the listing of a directory's items, and the listing used to find its subdirs
+# (these are the same listing unless the subdirs are found with a separate call)
+LISTING_T = Tuple[IterableTransferResponse, IterableTransferResponse]
+# the listing of a directory's items, and the queue entries of its subdirs
+RESULT_T = Tuple[IterableTransferResponse, List[QUEUE_ENTRY_T]]
 
-def _client_side_limiter() -> Iterator[None]:
-    counter = 0
-    while True:
-        counter += 1
-        # rate limit based on number of ls calls we have made
-        if counter % SLEEP_FREQUENCY == 0:
-            log.debug(
-                "recursive_operation_ls sleeping %s seconds to rate limit itself.",
-                SLEEP_LEN,
-            )
-            time.sleep(SLEEP_LEN)
+# the filter used to list only the subdirectories of a directory
+DIRS_ONLY_FILTER = "type:dir"
 
-        yield
+# when listing in parallel, the number of completed-but-unconsumed listings which
+# may be held in memory is capped at this multiple of the number of workers
+PREFETCH_FACTOR = 4
 
 
 class RecursiveLsResponse:
@@ -39,9 +37,23 @@ class RecursiveLsResponse:
     Used for iterating over potentially very large file systems without keeping the
     whole filesystem tree in memory.
 
-    Uses an internal queue for BFS of the filesystem.
+    Uses an internal queue for BFS of the filesystem. At most
+    ``max_frontier_in_memory`` queue entries are held in memory; any more are
+    spilled to disk, so memory use does not grow with the width of the tree.
 
-    Rate limits calls to reduce the changes of connection errors.
+    Calls are rate limited by the client (see ``AdaptiveRateLimiter``) to reduce the
+    chances of connection errors.
+
+    When ``max_workers`` is greater than 1, directories which are waiting in the
+    queue are listed ahead of time by a pool of worker threads. Results are still
+    consumed in queue order, so the items produced are identical to (and in the same
+    order as) a serial walk.
+
+    When ``checkpoint_file`` is given, the state of the walk is saved to it
+    periodically and when the walk is interrupted. If the file already exists, the
+    walk resumes from its queue. A directory stays in the queue until all of its
+    items have been produced, so only a directory which was interrupted partway
+    through is repeated. The file is removed when the walk completes.
 
     :param client: `TransferClient`` used for making the operation_ls calls.
     :param endpoint_id: The endpoint that will be recursively ls'ed.
@@ -49,6 +61,22 @@ class RecursiveLsResponse:
     :param max_depth: The maximum depth the recursive ls will go into the filesys
     :param filter_after_first: If True, any filter in ``ls_params`` will be applied
         to all calls. If False, any filter will be removed after the first ls.
+    :param filter_items_only: If True, any filter in ``ls_params`` only selects the
+        items produced, and does not stop directories from being walked. Each
+        directory is listed twice: once with the filter, for its items, and once
+        with a ``type:dir`` filter, to find its subdirectories. Both listings are
+        small when the filter is selective, unlike an unfiltered listing.
+    :param max_workers: The maximum number of operation_ls calls to have in flight
+        at any one time. The default of 1 makes all calls serially.
+    :param checkpoint_file: A file used to save and resume the state of the walk
+    :param max_frontier_in_memory: The number of queue entries to keep in memory
+        before spilling to disk
+    :param compact_items: If True, produce items as read-only ``ListingItem``
+        objects rather than dicts, reducing the memory used by callers which hold
+        on to many items
+    :param sort_by_name: If True, sort the items of each directory by name, and
+        walk subdirectories in that order, so that the order of the items does not
+        depend on the order of the listings returned by the endpoint
     """
 
     def __init__(
@@ -59,12 +87,37 @@ class RecursiveLsResponse:
         *,
         max_depth: int = 3,
         filter_after_first: bool = True,
+        filter_items_only: bool = False,
+        max_workers: int = 1,
+        checkpoint_file: Optional[str] = None,
+        max_frontier_in_memory: int = FRONTIER_MEMORY_LIMIT,
+        compact_items: bool = False,
+        sort_by_name: bool = False,
     ) -> None:
         self._client = client
         self._endpoint_id = endpoint_id
         self._ls_params = ls_params
         self._max_depth = max_depth
         self._filter_after_first = filter_after_first
+        self._filter_items_only = filter_items_only
+        self._max_workers = max_workers
+        self._max_frontier_in_memory = max_frontier_in_memory
+        self._compact_items = compact_items
+        self._sort_by_name = sort_by_name
+
+        self._checkpoint: Optional[RecursiveLsCheckpoint] = None
+        if checkpoint_file is not None:
+            self._checkpoint = RecursiveLsCheckpoint(
+                checkpoint_file,
+                {
+                    "endpoint_id": endpoint_id,
+                    "ls_params": ls_params,
+                    "max_depth": max_depth,
+                    "filter_after_first": filter_after_first,
+                    "filter_items_only": filter_items_only,
+                    "sort_by_name": sort_by_name,
+                },
+            )
 
         start_path = cast(Optional[str], ls_params.get("path"))
         log.info(
@@ -88,11 +141,54 @@ class RecursiveLsResponse:
             self._first_elem = None
 
     def __iter__(self) -> Iterator[ITEM_T]:
-        if self._first_elem is not None:
-            yield self._first_elem
-            yield from self._generator
+        try:
+            if self._first_elem is not None:
+                yield self._first_elem
+                yield from self._generator
+        finally:
+            # if the consumer stops early, end the walk now (saving any
+            # checkpoint) rather than whenever the generator is collected
+            self._generator.close()
+
+    def _params_for(self, abs_path: Optional[str], depth: int) -> Dict[str, Any]:
+        """
+        Build the operation_ls params for a listing of the given path.
 
-    def _iterable_func(self, start_path: Optional[str]) -> Iterator[ITEM_T]:
+        A copy is made for each call so that concurrent listings cannot see one
+        another's paths.
+        """
+        params = dict(self._ls_params)
+        # set the target path to the absolute path if it exists
+        if abs_path is not None:
+            params["path"] = abs_path
+        # if filter_after_first is False, stop filtering after the first
+        # ls call has been made
+        if depth > 0 and not self._filter_after_first:
+            params.pop("filter", None)
+        return params
+
+    def _ls(self, abs_path: Optional[str], depth: int) -> LISTING_T:
+        params = self._params_for(abs_path, depth)
+        res = self._client.operation_ls(self._endpoint_id, **params)
+        if not (self._filter_items_only and "filter" in params):
+            return res, res
+        params["filter"] = DIRS_ONLY_FILTER
+        return res, self._client.operation_ls(self._endpoint_id, **params)
+
+    def _ls_entry(self, entry: QUEUE_ENTRY_T) -> RESULT_T:
+        """
+        List the directory of a queue entry, and find the entries of its subdirs.
+
+        The subdirs are found once, with the listing, so that a listing which has
+        been prefetched can be looked ahead through cheaply.
+        """
+        abs_path, _, depth = entry
+        res, dirs_res = self._ls(abs_path, depth)
+        return res, list(self._child_entries(entry, dirs_res))
+
+    def _iterable_func(
+        self, start_path: Optional[str]
+    ) -> Generator[ITEM_T, None, None]:
         """
         An internal function which has generator semantics. Defined using the
         `yield` syntax.
@@ -101,57 +197,171 @@ class RecursiveLsResponse:
         We rely on the implicit StopIteration built into this type of function
         to propagate through the final `next()` call.
         """
-        # iterator used for client-side limiting
-        limiter = _client_side_limiter()
-
         # queue of (absolute_path, relative_path, depth) tuples.
-        dir_queue: QUEUE_T = deque()
-        # initialized with the start path (if any) and a depth of 0
-        dir_queue.append((start_path, "", 0))
-
-        # BFS is not done until the queue is empty
-        while dir_queue:
-            next(limiter)
-            log.debug(
-                "recursive_operation_ls BFS queue not empty, getting next path now."
-            )
+        dir_queue: QUEUE_T = DirectoryFrontier(self._max_frontier_in_memory)
+        resumed = self._checkpoint.load() if self._checkpoint else None
+        if resumed is not None:
+            # streamed from the file, so that the frontier can spill as it fills
+            dir_queue.extend(resumed)
+        else:
+            # initialized with the start path (if any) and a depth of 0
+            dir_queue.append((start_path, "", 0))
+        completed = False
+
+        # listings which have been handed to the worker pool ahead of time, keyed
+        # by the queue entry which they will satisfy
+        prefetched: Dict[QUEUE_ENTRY_T, "Future[RESULT_T]"] = {}
+        executor: Optional[ThreadPoolExecutor] = None
+        if self._max_workers > 1:
+            executor = ThreadPoolExecutor(max_workers=self._max_workers)
+
+        try:
+            # BFS is not done until the queue is empty
+            while dir_queue:
+                if self._checkpoint is not None:
+                    self._checkpoint.maybe_save(dir_queue)
 
-            # get path and current depth from the queue
-            abs_path, rel_path, depth = dir_queue.pop()
-
-            # set the target path to the popped absolute path if it exists
-            if abs_path is not None:
-                self._ls_params["path"] = abs_path
-
-            # do the operation_ls with the updated params
-            res = self._client.operation_ls(self._endpoint_id, **self._ls_params)
-            res_data = res["DATA"]
-
-            # add to the queue if there are additional listings to do
-            # and we are not at the depth limit
-            if depth < self._max_depth:
-                # queue data includes the dir's name in the absolute and relative paths
-                # and increases the depth by one.
-                dir_queue.extend(
-                    [
-                        (
-                            res["path"] + item["name"],
-                            (rel_path + "/" if rel_path else "") + item["name"],
-                            depth + 1,
-                        )
-                        # data is reversed to maintain any "orderby" ordering
-                        for item in reversed(res_data)
-                        if item["type"] == "dir"
-                    ]
+                if executor is not None:
+                    self._await_next(executor, dir_queue, prefetched)
+                log.debug(
+                    "recursive_operation_ls BFS queue not empty, getting next path now."
                 )
 
-            # if filter_after_first is False, stop filtering after the first
-            # ls call has been made
-            if not self._filter_after_first:
-                self._ls_params.pop("filter", None)
+                # get path and current depth from the top of the queue
+                # it is not removed until its items have all been produced, so that
+                # an interrupted walk saves a queue which lists it again, and at
+                # most this one directory is repeated on resume
+                entry = dir_queue[-1]
+                _, rel_path, _ = entry
+
+                # do the operation_ls with the updated params, unless it was
+                # already started by a worker
+                future = prefetched.pop(entry, None)
+                if future is not None:
+                    res, children = future.result()
+                else:
+                    res, children = self._ls_entry(entry)
+                res_data = self._listing_items(res)
+
+                # for each item in the response data update the item's name with
+                # the relative path from the queue, and yield the item
+                for item in res_data:
+                    name = (rel_path + "/" if rel_path else "") + item["name"]
+                    if self._compact_items:
+                        yield ListingItem(item, name)
+                    else:
+                        item["name"] = name
+                        yield cast(ITEM_T, item)
 
-            # for each item in the response data update the item's name with
-            # the relative path popped from the queue, and yield the item
-            for item in res_data:
-                item["name"] = (rel_path + "/" if rel_path else "") + item["name"]
-                yield cast(ITEM_T, item)
+                # replace the entry with its subdirs, if there are additional
+                # listings to do and we are not at the depth limit
+                # data is reversed to maintain any "orderby" ordering
+                dir_queue.pop()
+                dir_queue.extend(reversed(children))
+            completed = True
+        finally:
+            if executor is not None:
+                # if iteration stopped early (an error or the consumer went away),
+                # don't start any listings which are still waiting for a worker
+                for future in prefetched.values():
+                    future.cancel()
+                executor.shutdown(wait=False)
+            if self._checkpoint is not None:
+                if completed:
+                    self._checkpoint.remove()
+                else:
+                    self._checkpoint.save(dir_queue)
+            dir_queue.close()
+
+    def _listing_items(self, res: IterableTransferResponse) -> List[Dict[str, Any]]:
+        items: List[Dict[str, Any]] = res["DATA"]
+        if self._sort_by_name:
+            items = sorted(items, key=lambda item: cast(str, item["name"]))
+        return items
+
+    def _child_entries(
+        self, entry: QUEUE_ENTRY_T, res: IterableTransferResponse
+    ) -> Iterator[QUEUE_ENTRY_T]:
+        """
+        Produce the queue entries for the subdirectories found by a listing, in the
+        order in which they will be popped off of the queue.
+
+        Queue data includes the dir's name in the absolute and relative paths and
+        increases the depth by one.
+        """
+        _, rel_path, depth = entry
+        if depth >= self._max_depth:
+            return
+        for item in self._listing_items(res):
+            if item["type"] == "dir":
+                yield (
+                    res["path"] + item["name"],
+                    (rel_path + "/" if rel_path else "") + item["name"],
+                    depth + 1,
+                )
+
+    def _upcoming(
+        self,
+        dir_queue: QUEUE_T,
+        prefetched: Dict[QUEUE_ENTRY_T, "Future[RESULT_T]"],
+    ) -> Iterator[QUEUE_ENTRY_T]:
+        """
+        Produce queue entries in the order in which they will be listed.
+
+        This is the queue in pop order, except that wherever a listing has already
+        finished, the subdirectories it found are produced right after it, as they
+        will be once that listing is consumed.
+        """
+        stack: List[Iterator[QUEUE_ENTRY_T]] = [reversed(dir_queue)]
+        while stack:
+            entry = next(stack[-1], None)
+            if entry is None:
+                stack.pop()
+                continue
+            yield entry
+            future = prefetched.get(entry)
+            if future is not None and future.done() and not future.exception():
+                stack.append(iter(future.result()[1]))
+
+    def _await_next(
+        self,
+        executor: ThreadPoolExecutor,
+        dir_queue: QUEUE_T,
+        prefetched: Dict[QUEUE_ENTRY_T, "Future[RESULT_T]"],
+    ) -> None:
+        """
+        Wait for the listing at the top of the queue to finish.
+
+        Every listing which finishes in the meantime may reveal more directories, so
+        the prefetch is refreshed each time one does, keeping the workers busy.
+        """
+        self._prefetch(executor, dir_queue, prefetched)
+        next_future = prefetched.get(dir_queue[-1])
+        while next_future is not None and not next_future.done():
+            wait(
+                [f for f in prefetched.values() if not f.done()],
+                return_when=FIRST_COMPLETED,
+            )
+            self._prefetch(executor, dir_queue, prefetched)
+
+    def _prefetch(
+        self,
+        executor: ThreadPoolExecutor,
+        dir_queue: QUEUE_T,
+        prefetched: Dict[QUEUE_ENTRY_T, "Future[RESULT_T]"],
+    ) -> None:
+        """
+        Start listings for the directories which will be consumed next.
+
+        Any directory which is in the queue, or which was found by a listing that is
+        waiting to be consumed, will be listed eventually, so work started here is
+        never wasted. The number of outstanding listings is capped to keep memory
+        bounded.
+        """
+        max_prefetched = self._max_workers * PREFETCH_FACTOR
+        for idx, entry in enumerate(self._upcoming(dir_queue, prefetched)):
+            if idx >= max_prefetched or len(prefetched) >= max_prefetched:
+                break
+            if entry in prefetched:
+                continue
+            prefetched[entry] = executor.submit(self._ls_entry, entry)
@@ -0,0 +1,130 @@
+import json
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import globus_sdk
+import requests
+from globus_sdk.transport.encoders import RequestEncoder
+
+# the number of items serialized into each chunk of a request body
+STREAM_ITEMS_PER_CHUNK = 1000
+
+# (source_path, destination_path, recursive, external_checksum, checksum_algorithm)
+STREAM_ITEM_T = Tuple[str, str, bool, Optional[str], Optional[str]]
+
+
+def _item_doc(item: STREAM_ITEM_T) -> Dict[str, Any]:
+    source_path, destination_path, recursive, external_checksum, algorithm = item
+    return {
+        "DATA_TYPE": "transfer_item",
+        "source_path": source_path,
+        "destination_path": destination_path,
+        "recursive": recursive,
+        "external_checksum": external_checksum,
+        "checksum_algorithm": algorithm,
+    }
+
+
+class StreamingTransferData:
+    """
+    The items of a transfer, held compactly, and serialized into a request body
+    a chunk at a time when the transfer is submitted.
+
+    A ``TransferData`` keeps a dict for every item, and submitting it builds the
+    whole document as one JSON string. Here, items are kept as tuples, and the
+    body is produced piece by piece as it is sent, so that neither a dict per
+    item nor a copy of the full document is ever held in memory. Whether any of
+    the items are recursive is tracked as they are added.
+
+    The options of the transfer are read from ``transfer_data``. Commands which
+    need every item as a dict (for instance, to display them) can move the items
+    into ``transfer_data`` with :meth:`materialize`. Either way, the object can be
+    passed to ``CustomTransferClient.submit_transfer``.
+
+    Iterating over the object produces the chunks of the request body. It can be
+    iterated more than once, so that a request can be retried.
+
+    :param transfer_data: The transfer document, holding the transfer options
+    """
+
+    def __init__(self, transfer_data: globus_sdk.TransferData) -> None:
+        self.transfer_data = transfer_data
+        self._items: List[STREAM_ITEM_T] = []
+        self.has_recursive_items = any(
+            item.get("recursive") for item in transfer_data["DATA"]
+        )
+
+    @property
+    def item_count(self) -> int:
+        return len(self.transfer_data["DATA"]) + len(self._items)
+
+    def add_item(
+        self,
+        source_path: str,
+        destination_path: str,
+        *,
+        recursive: bool = False,
+        external_checksum: Optional[str] = None,
+        checksum_algorithm: Optional[str] = None,
+    ) -> None:
+        """Add an item, with the same parameters as ``TransferData.add_item``"""
+        self._items.append(
+            (
+                source_path,
+                destination_path,
+                recursive,
+                external_checksum,
+                checksum_algorithm,
+            )
+        )
+        if recursive:
+            self.has_recursive_items = True
+
+    def materialize(self) -> globus_sdk.TransferData:
+        """
+        Move the items into ``transfer_data`` as dicts, and return it.
+        """
+        self.transfer_data["DATA"].extend(_item_doc(item) for item in self._items)
+        self._items = []
+        return self.transfer_data
+
+    def __iter__(self) -> Iterator[bytes]:
+        options = {k: v for k, v in self.transfer_data.items() if k != "DATA"}
+        head = json.dumps(options)[:-1]
+        if options:
+            head += ", "
+        yield (head + '"DATA": [').encode()
+
+        separator = ""
+        materialized = self.transfer_data["DATA"]
+        for start in range(0, len(materialized), STREAM_ITEMS_PER_CHUNK):
+            chunk = materialized[start : start + STREAM_ITEMS_PER_CHUNK]
+            yield (separator + json.dumps(chunk)[1:-1]).encode()
+            separator = ", "
+        for start in range(0, len(self._items), STREAM_ITEMS_PER_CHUNK):
+            chunk_docs = [
+                _item_doc(item)
+                for item in self._items[start : start + STREAM_ITEMS_PER_CHUNK]
+            ]
+            yield (separator + json.dumps(chunk_docs)[1:-1]).encode()
+            separator = ", "
+
+        yield b"]}"
+
+
+class StreamingJSONRequestEncoder(RequestEncoder):
+    """
+    Send an iterable of the chunks of a JSON document as the request body.
+
+    The body has no known length, so it is sent with chunked transfer encoding.
+    """
+
+    def encode(
+        self,
+        method: str,
+        url: str,
+        params: Optional[Dict[str, Any]],
+        data: Any,
+        headers: Dict[str, str],
+    ) -> requests.Request:
+        headers = {"Content-Type": "application/json", **headers}
+        return requests.Request(method, url, data=data, params=params, headers=headers)
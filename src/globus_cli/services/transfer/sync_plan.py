@@ -0,0 +1,190 @@
+import fnmatch
+import logging
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Iterable,
+    Iterator,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+)
+
+import globus_sdk
+
+if TYPE_CHECKING:
+    from .client import CustomTransferClient
+
+log = logging.getLogger(__name__)
+
+# directories deeper than this are not walked, and are transferred with a
+# recursive item instead (leaving the comparison of their contents to the service)
+PLAN_SYNC_MAX_DEPTH = 32
+
+# the number of concurrent listings on each side of the sync
+PLAN_SYNC_WORKERS = 4
+
+MERGE_KEY_T = Tuple[Tuple[str, ...], str]
+
+
+def merge_key(name: str) -> MERGE_KEY_T:
+    """
+    The position of an item in a recursive listing which is sorted by name.
+
+    Such a listing produces the sorted items of a directory, and then walks its
+    subdirectories in sorted order, so items are ordered first by the components
+    of the directory which contains them, and then by their own names.
+    """
+    parts = name.split("/")
+    return tuple(parts[:-1]), parts[-1]
+
+
+def _needs_transfer(
+    source: Mapping[str, Any], dest: Mapping[str, Any], sync_level: Optional[str]
+) -> bool:
+    if dest["type"] != source["type"]:
+        return True
+    if sync_level == "exists":
+        return False
+    # the contents of files cannot be compared from listings, so files which
+    # are present on both sides are left for the service to compare
+    if sync_level == "checksum":
+        return True
+    size_differs = dest.get("size") != source.get("size")
+    # like the "mtime" sync level, only a newer source file is transferred
+    # the timestamps have a fixed format, so they compare correctly as strings
+    is_newer = (source.get("last_modified") or "") > (dest.get("last_modified") or "")
+    if sync_level == "size":
+        return size_differs
+    if sync_level == "mtime":
+        return is_newer
+    return size_differs or is_newer
+
+
+class SyncPlanner:
+    """
+    Find the files which need to be transferred to bring a destination directory
+    up to date with a source directory.
+
+    Both directories are walked with sorted recursive listings, concurrently, and
+    the two streams of items are merged. Only the items at the front of each
+    stream are held in memory, so the memory used does not depend on the size of
+    the trees. A file is transferred if it is missing from the destination, or
+    if it differs according to ``sync_level``:
+
+    - "exists": never
+    - "size": if the sizes differ
+    - "mtime": if the source has a newer modification time
+    - "checksum": always, as only the service can compare the contents
+    - None: if the sizes differ or the source has a newer modification time
+
+    Files which are only present on the destination are left alone. Directories
+    which are below the walk depth limit, and a destination which does not exist
+    at all, are transferred with recursive items.
+
+    :param transfer_client: The client to use for listing
+    :param source_endpoint: The source endpoint ID
+    :param source_path: The source directory
+    :param dest_endpoint: The destination endpoint ID
+    :param dest_path: The destination directory
+    :param exclude: Name patterns for files and directories to skip, as with the
+        exclude filter rules of a transfer
+    :param sync_level: The sync level of the transfer, which selects how files
+        are compared
+    :param max_depth: The depth limit of the walks
+    :param max_workers: The number of concurrent listings on each side
+    """
+
+    def __init__(
+        self,
+        transfer_client: "CustomTransferClient",
+        source_endpoint: str,
+        source_path: str,
+        dest_endpoint: str,
+        dest_path: str,
+        *,
+        exclude: Sequence[str] = (),
+        sync_level: Optional[str] = None,
+        max_depth: int = PLAN_SYNC_MAX_DEPTH,
+        max_workers: int = PLAN_SYNC_WORKERS,
+    ) -> None:
+        self.transfer_client = transfer_client
+        self.source_endpoint = source_endpoint
+        self.source_path = source_path
+        self.dest_endpoint = dest_endpoint
+        self.dest_path = dest_path
+        self.exclude = exclude
+        self.sync_level = sync_level
+        self.max_depth = max_depth
+        self.max_workers = max_workers
+
+        # counts of the source files which were compared, and which differed
+        self.files_compared = 0
+        self.files_differing = 0
+
+    def _walk(self, endpoint_id: str, path: str) -> Iterable[Mapping[str, Any]]:
+        return self.transfer_client.recursive_operation_ls(
+            endpoint_id,
+            {"path": path, "show_hidden": 1},
+            depth=self.max_depth,
+            max_workers=self.max_workers,
+            compact_items=True,
+            sort_by_name=True,
+        )
+
+    def _is_excluded(self, name: str) -> bool:
+        return any(
+            fnmatch.fnmatchcase(part, pattern)
+            for part in name.split("/")
+            for pattern in self.exclude
+        )
+
+    def plan(self) -> Iterator[Tuple[str, bool]]:
+        """
+        Produce ``(name, recursive)`` for each item which needs to be transferred,
+        with names relative to the source and destination directories. A name of
+        "" stands for the source directory itself.
+        """
+        source_items = self._walk(self.source_endpoint, self.source_path)
+        try:
+            dest_items = self._walk(self.dest_endpoint, self.dest_path)
+        except globus_sdk.TransferAPIError as err:
+            if err.code != "ClientError.NotFound":
+                raise
+            log.info("sync destination does not exist, transferring everything")
+            yield "", True
+            return
+
+        dest_iter = iter(dest_items)
+        dest = next(dest_iter, None)
+        dest_key = merge_key(dest["name"]) if dest is not None else None
+
+        for source in source_items:
+            name = source["name"]
+            if self._is_excluded(name):
+                continue
+            source_key = merge_key(name)
+            # skip past destination items which have no source counterpart
+            while dest_key is not None and dest_key < source_key:
+                dest = next(dest_iter, None)
+                dest_key = merge_key(dest["name"]) if dest is not None else None
+            match = dest if dest_key == source_key else None
+
+            if source["type"] == "dir":
+                # a directory at the depth limit was not walked, so its contents
+                # are compared by the service instead
+                if name.count("/") + 1 > self.max_depth:
+                    yield name, True
+            elif source["type"] == "file":
+                self.files_compared += 1
+                if match is None or _needs_transfer(source, match, self.sync_level):
+                    self.files_differing += 1
+                    yield name, False
+
+
+def join_sync_path(base: str, name: str) -> str:
+    """Join a directory and a name produced by :meth:`SyncPlanner.plan`"""
+    if not name:
+        return base
+    return base.rstrip("/") + "/" + name
@@ -0,0 +1,312 @@
+import json
+import logging
+import os
+import sqlite3
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional, Sequence
+
+import globus_sdk
+
+from globus_cli.login_manager.tokenstore import _get_data_dir
+
+from .task_wait import TASK_LIST_BATCH_SIZE, TERMINAL_TASK_STATUSES
+
+log = logging.getLogger(__name__)
+
+TASK_DB_FILENAME = "task_db.db"
+
+# the number of tasks in each page of task_list results, and the number of
+# results of a single query which task_list can page through
+TASK_LIST_PAGE_SIZE = 1000
+TASK_LIST_MAX_RESULTS = 1000
+
+# the columns which are copied out of each task document, so that they can be
+# indexed and queried
+TASK_COLUMNS = (
+    "task_id",
+    "type",
+    "status",
+    "label",
+    "source_endpoint_id",
+    "destination_endpoint_id",
+    "request_time",
+    "completion_time",
+)
+
+# the columns with an index, for the filters of task list
+INDEXED_COLUMNS = (
+    "status",
+    "label",
+    "source_endpoint_id",
+    "destination_endpoint_id",
+    "request_time",
+    "completion_time",
+)
+
+
+def _db_filename() -> str:
+    # kept in the same directory as the token storage
+    return os.path.join(_get_data_dir(), TASK_DB_FILENAME)
+
+
+def _normalize_time(value: Optional[str]) -> Optional[str]:
+    """
+    Convert a time from a task document (like "2021-09-02T18:04:47+00:00") to the
+    "YYYY-MM-DD HH:MM:SS" form used in the filters of task_list, so that times
+    compare correctly as strings. Task documents give all times in UTC.
+    """
+    if not value:
+        return None
+    return value[:19].replace("T", " ")
+
+
+def _label_pattern(pattern: str) -> str:
+    # '*' is the wild-card of inexact label filters, and LIKE ignores case
+    escaped = pattern.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return escaped.replace("*", "%")
+
+
+class TaskDatabase:
+    """
+    A local mirror of the current user's task documents, stored in a SQLite
+    database, which can be queried without calling the Transfer service.
+
+    :meth:`sync` brings the mirror up to date: it fetches the tasks requested
+    since the newest one which was already stored, and fetches again the tasks
+    which were not yet complete. The fields used by the filters of task list are
+    kept in indexed columns beside the full documents.
+
+    :param filename: The path of the database
+    :param namespace: Keeps the tasks of different logins apart
+    """
+
+    def __init__(self, filename: str, *, namespace: str = "") -> None:
+        self.filename = filename
+        self.namespace = namespace
+
+        self._db = sqlite3.connect(filename)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        with self._db:
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS task ("
+                "namespace TEXT, "
+                + ", ".join(f"{column} TEXT" for column in TASK_COLUMNS)
+                + ", doc TEXT, PRIMARY KEY (namespace, task_id))"
+            )
+            for column in INDEXED_COLUMNS:
+                self._db.execute(
+                    f"CREATE INDEX IF NOT EXISTS task_{column} "
+                    f"ON task (namespace, {column})"
+                )
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS sync_state ("
+                "namespace TEXT PRIMARY KEY, last_request_time TEXT)"
+            )
+
+        # the number of task_list calls made by the last sync
+        self.api_calls = 0
+
+    @classmethod
+    def open_default(cls, **kwargs: Any) -> "TaskDatabase":
+        """Open the database in the CLI's data directory, creating it if necessary"""
+        os.makedirs(os.path.dirname(_db_filename()), exist_ok=True)
+        return cls(_db_filename(), **kwargs)
+
+    @classmethod
+    def open_existing(cls, **kwargs: Any) -> Optional["TaskDatabase"]:
+        """Open the database in the CLI's data directory, if there is one"""
+        if not os.path.exists(_db_filename()):
+            return None
+        return cls(_db_filename(), **kwargs)
+
+    def close(self) -> None:
+        self._db.close()
+
+    @property
+    def last_request_time(self) -> Optional[str]:
+        """The request time of the newest task seen by the last complete sync"""
+        row = self._db.execute(
+            "SELECT last_request_time FROM sync_state WHERE namespace=?",
+            (self.namespace,),
+        ).fetchone()
+        return row[0] if row else None
+
+    def _store(self, tasks: Iterable[Mapping[str, Any]]) -> None:
+        rows = []
+        for task in tasks:
+            values: List[Any] = [task.get(column) for column in TASK_COLUMNS]
+            values[TASK_COLUMNS.index("request_time")] = _normalize_time(
+                task.get("request_time")
+            )
+            values[TASK_COLUMNS.index("completion_time")] = _normalize_time(
+                task.get("completion_time")
+            )
+            rows.append(
+                [self.namespace]
+                + values
+                + [json.dumps(task, separators=(",", ":"), sort_keys=True)]
+            )
+        with self._db:
+            self._db.executemany(
+                "INSERT OR REPLACE INTO task VALUES "
+                f"(?, {', '.join('?' for _ in TASK_COLUMNS)}, ?)",
+                rows,
+            )
+
+    def sync(self, transfer_client: globus_sdk.TransferClient) -> Dict[str, int]:
+        """
+        Fetch the tasks which are new or were incomplete, returning the number of
+        tasks of each kind which were stored.
+
+        Tasks are stored a page at a time. The high-water mark of the sync is only
+        recorded when it completes, so an interrupted sync is repeated, rather
+        than skipping tasks, the next time. The request_time filter is inclusive,
+        so the tasks requested in the same second as the newest stored task are
+        fetched again, and replace their stored copies.
+        """
+        self.api_calls = 0
+        since = self.last_request_time
+
+        # incomplete tasks are fetched again with batched task_id filters, and
+        # read before any new tasks are stored, so that those are not fetched twice
+        incomplete = [
+            task_id
+            for (task_id,) in self._db.execute(
+                "SELECT task_id FROM task WHERE namespace=? "
+                f"AND status NOT IN ({', '.join('?' for _ in TERMINAL_TASK_STATUSES)})",
+                (self.namespace,) + TERMINAL_TASK_STATUSES,
+            )
+        ]
+        for start in range(0, len(incomplete), TASK_LIST_BATCH_SIZE):
+            batch = incomplete[start : start + TASK_LIST_BATCH_SIZE]
+            self.api_calls += 1
+            res = transfer_client.task_list(limit=len(batch), filter={"task_id": batch})
+            self._store(res)
+
+        # task_list can only page through the first TASK_LIST_MAX_RESULTS results of
+        # a query, so tasks are fetched newest first, in windows of request_time
+        # which each end at the oldest task of the window before
+        (stored_before,) = self._db.execute(
+            "SELECT COUNT(*) FROM task WHERE namespace=?", (self.namespace,)
+        ).fetchone()
+        before = ""
+        while True:
+            oldest = self._sync_window(transfer_client, since or "", before)
+            if oldest is None:
+                break
+            if oldest == before:
+                log.warning(
+                    "more than %d tasks were requested at %s, some were not synced",
+                    TASK_LIST_MAX_RESULTS,
+                    oldest,
+                )
+                break
+            before = oldest
+
+        with self._db:
+            self._db.execute(
+                "INSERT OR REPLACE INTO sync_state "
+                "SELECT ?, MAX(request_time) FROM task WHERE namespace=?",
+                (self.namespace, self.namespace),
+            )
+        (stored_after,) = self._db.execute(
+            "SELECT COUNT(*) FROM task WHERE namespace=?", (self.namespace,)
+        ).fetchone()
+        new_tasks = stored_after - stored_before
+        return {"new": new_tasks, "refreshed": len(incomplete)}
+
+    def _sync_window(
+        self, transfer_client: globus_sdk.TransferClient, after: str, before: str
+    ) -> Optional[str]:
+        """
+        Store the tasks requested between ``after`` and ``before`` (inclusive, and
+        either may be empty). If there are more than can be paged through, return
+        the request time of the oldest task which was stored, so that the rest can
+        be fetched in another window.
+        """
+        task_filter: Dict[str, Any] = {"type": ["TRANSFER", "DELETE"]}
+        if after or before:
+            task_filter["request_time"] = [after, before]
+        offset = 0
+        oldest = None
+        while offset < TASK_LIST_MAX_RESULTS:
+            self.api_calls += 1
+            page = transfer_client.task_list(
+                limit=min(TASK_LIST_PAGE_SIZE, TASK_LIST_MAX_RESULTS - offset),
+                offset=offset,
+                filter=task_filter,
+                query_params={"orderby": "request_time DESC"},
+            )
+            tasks = page["DATA"]
+            self._store(tasks)
+            offset += len(tasks)
+            log.debug("task sync stored %d tasks requested before '%s'", offset, before)
+            if not tasks or offset >= page["total"]:
+                return None
+            oldest = _normalize_time(tasks[-1]["request_time"])
+        return oldest
+
+    def query(
+        self,
+        *,
+        task_ids: Sequence[str] = (),
+        statuses: Sequence[str] = (),
+        task_type: Optional[str] = None,
+        labels: Sequence[str] = (),
+        not_labels: Sequence[str] = (),
+        inexact: bool = True,
+        requested_after: Optional[str] = None,
+        requested_before: Optional[str] = None,
+        completed_after: Optional[str] = None,
+        completed_before: Optional[str] = None,
+        limit: Optional[int] = None,
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Produce the stored task documents which match the filters of task list,
+        newest first. Times are strings in the form "YYYY-MM-DD HH:MM:SS".
+        """
+        clauses = ["namespace=?"]
+        params: List[Any] = [self.namespace]
+
+        def add_in(column: str, values: Sequence[str]) -> None:
+            clauses.append(f"{column} IN ({', '.join('?' for _ in values)})")
+            params.extend(values)
+
+        if task_ids:
+            add_in("task_id", [str(x) for x in task_ids])
+        if statuses:
+            add_in("status", statuses)
+        if task_type:
+            add_in("type", [task_type])
+
+        # labels must match every given pattern, and tasks without labels are
+        # treated as having an empty one
+        for label, negate in [(x, False) for x in labels] + [
+            (x, True) for x in not_labels
+        ]:
+            if inexact:
+                clause = "COALESCE(label, '') LIKE ? ESCAPE '\\'"
+                params.append(_label_pattern(label))
+            else:
+                clause = "COALESCE(label, '') = ?"
+                params.append(label)
+            clauses.append(f"NOT ({clause})" if negate else clause)
+
+        for column, op, value in (
+            ("request_time", ">=", requested_after),
+            ("request_time", "<=", requested_before),
+            ("completion_time", ">=", completed_after),
+            ("completion_time", "<=", completed_before),
+        ):
+            if value:
+                clauses.append(f"{column} {op} ?")
+                params.append(value)
+
+        sql = (
+            f"SELECT doc FROM task WHERE {' AND '.join(clauses)} "
+            "ORDER BY request_time DESC"
+        )
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+        for (doc,) in self._db.execute(sql, params):
+            yield json.loads(doc)
@@ -0,0 +1,114 @@
+import logging
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+import globus_sdk
+
+log = logging.getLogger(__name__)
+
+# the number of events in each task_event_list call made while following
+FOLLOW_PAGE_SIZE = 100
+
+# task_event_list can only page through this many of the most recent events
+TASK_EVENT_LIST_MAX_RESULTS = 1000
+
+
+class TaskEventFollower:
+    """
+    Fetch the events of a task which have not been seen before, like ``tail -f``.
+
+    The follower keeps a high-water mark: the time of the newest event it has
+    seen. As task_event_list returns the newest events first, each poll stops
+    paging as soon as it reaches an event older than the mark, so only new events
+    (and one page at most of old ones) are downloaded. Events at the time of the
+    mark are told apart by their time and code, which are remembered for that
+    time only.
+
+    :param transfer_client: The client to use for the task_event_list calls
+    :param task_id: The ID of the task
+    :param event_filter: A filter for task_event_list, such as "is_error:1"
+    :param page_size: The number of events in each task_event_list call
+    """
+
+    def __init__(
+        self,
+        transfer_client: globus_sdk.TransferClient,
+        task_id: str,
+        *,
+        event_filter: str = "",
+        page_size: int = FOLLOW_PAGE_SIZE,
+    ) -> None:
+        self.transfer_client = transfer_client
+        self.task_id = task_id
+        self.event_filter = event_filter
+        self.page_size = page_size
+
+        self.high_water: Optional[str] = None
+        self._seen_at_high_water: Set[Tuple[str, str]] = set()
+        # the number of task_event_list calls which have been made
+        self.api_calls = 0
+
+    def _is_new(self, event: Dict[str, Any]) -> bool:
+        if self.high_water is None or event["time"] > self.high_water:
+            return True
+        return (
+            event["time"] == self.high_water
+            and (event["time"], event["code"]) not in self._seen_at_high_water
+        )
+
+    def poll(self, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Get the events which are new since the last poll, oldest first.
+
+        :param limit: Only get this many of the newest events. Any more events at
+            the same time as the oldest of them are also included, so that the
+            events at one time are never split between polls.
+        """
+        new_events: List[Dict[str, Any]] = []
+        # events which arrive during the poll push older events onto later pages,
+        # so the same event can be seen twice
+        seen: Set[Tuple[str, str]] = set()
+        # once the limit is reached, only events at this time are still taken
+        cutoff_time: Optional[str] = None
+        offset = 0
+        done = False
+        while not done and offset < TASK_EVENT_LIST_MAX_RESULTS:
+            self.api_calls += 1
+            res = self.transfer_client.task_event_list(
+                self.task_id,
+                limit=min(self.page_size, TASK_EVENT_LIST_MAX_RESULTS - offset),
+                offset=offset,
+                query_params={"filter": self.event_filter},
+            )
+            events = res["DATA"]
+            for event in events:
+                # older events were seen by an earlier poll
+                if self.high_water is not None and event["time"] < self.high_water:
+                    done = True
+                    break
+                if cutoff_time is not None and event["time"] != cutoff_time:
+                    done = True
+                    break
+                key = (event["time"], event["code"])
+                if key in seen or not self._is_new(event):
+                    continue
+                seen.add(key)
+                new_events.append(event)
+                if limit is not None and len(new_events) >= limit:
+                    cutoff_time = event["time"]
+            offset += len(events)
+            if not events or offset >= res["total"]:
+                done = True
+        if not done:
+            log.warning(
+                "more than %d events since the last poll, some were not shown",
+                TASK_EVENT_LIST_MAX_RESULTS,
+            )
+
+        for event in new_events:
+            if self.high_water is None or event["time"] > self.high_water:
+                self.high_water = event["time"]
+                self._seen_at_high_water = set()
+            if event["time"] == self.high_water:
+                self._seen_at_high_water.add((event["time"], event["code"]))
+        new_events.reverse()
+        return new_events
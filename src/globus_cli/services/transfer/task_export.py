@@ -0,0 +1,142 @@
+import json
+import logging
+import os
+from typing import Any, Callable, Dict, Iterable, Mapping, Optional
+
+import click
+
+log = logging.getLogger(__name__)
+
+RESUME_FILE_SUFFIX = ".resume"
+
+RESUME_VERSION = 1
+
+# the key of the pagination marker in the pages of task_successful_transfers and
+# task_skipped_errors
+NEXT_MARKER_KEY = "next_marker"
+
+
+class ResumableNDJSONExport:
+    """
+    Write the items of a paginated listing to a file as NDJSON, a page at a time.
+
+    After each page is written, the marker of the next page and the size of the
+    export are recorded in a resume file (the export filename with
+    ``RESUME_FILE_SUFFIX`` added). If an export is interrupted, running it again
+    truncates anything written after the last recorded page, and continues from
+    the recorded marker, so that no item is repeated or dropped. The resume file
+    is removed when the export completes.
+
+    Only one page of items is held in memory at a time.
+
+    Writes of the resume file go to a temporary file which is then renamed over
+    it, so an interruption during a write leaves the previous state intact.
+
+    :param filename: The path of the export file
+    :param identity: A description of the listing (task ID, kind of listing). An
+        export can only be resumed by a listing with the same identity.
+    """
+
+    def __init__(self, filename: str, identity: Dict[str, Any]) -> None:
+        self.filename = filename
+        self.resume_filename = filename + RESUME_FILE_SUFFIX
+        # normalize through JSON so that it compares equal to a loaded identity
+        self.identity = json.loads(json.dumps(identity))
+        # the number of items in the export, including any written before resuming
+        self.item_count = 0
+        self.resumed = False
+
+    def _load(self) -> Optional[Dict[str, Any]]:
+        try:
+            with open(self.resume_filename) as fp:
+                doc = json.load(fp)
+        except FileNotFoundError:
+            return None
+        except ValueError:
+            raise click.UsageError(
+                f"'{self.resume_filename}' is not a valid export resume file"
+            )
+
+        if not isinstance(doc, dict) or (
+            doc.get("version") != RESUME_VERSION or doc.get("identity") != self.identity
+        ):
+            raise click.UsageError(
+                f"'{self.resume_filename}' is the resume file of a different "
+                "export. Use a new export file or repeat the original command."
+            )
+        return doc
+
+    def _save(self, marker: Optional[str], offset: int) -> None:
+        doc = {
+            "version": RESUME_VERSION,
+            "identity": self.identity,
+            "marker": marker,
+            "offset": offset,
+            "items": self.item_count,
+        }
+        tmp_filename = self.resume_filename + ".tmp"
+        with open(tmp_filename, "w") as fp:
+            json.dump(doc, fp, separators=(",", ":"))
+        os.replace(tmp_filename, self.resume_filename)
+
+    def run(
+        self, get_pages: Callable[[Optional[str]], Iterable[Mapping[str, Any]]]
+    ) -> int:
+        """
+        Export the listing, returning the number of items in the export.
+
+        :param get_pages: Produces the pages of the listing, starting at the page
+            with the given marker (or at the first page, if it is None)
+        """
+        state = self._load()
+        if state is None:
+            marker = None
+            fp = open(self.filename, "wb")
+        else:
+            marker = state["marker"]
+            self.item_count = state["items"]
+            self.resumed = True
+            log.info(
+                "resuming export to '%s' after %d items", self.filename, state["items"]
+            )
+            try:
+                fp = open(self.filename, "r+b")
+            except FileNotFoundError:
+                raise click.UsageError(
+                    f"cannot resume the export to '{self.filename}', as the file "
+                    f"no longer exists. Remove '{self.resume_filename}' to restart it."
+                )
+            # drop any part of a page which was written after the last save
+            fp.truncate(state["offset"])
+            fp.seek(state["offset"])
+
+        with fp:
+            # record the start of the export, so that an interruption during the
+            # first page can be resumed too
+            if state is None:
+                self._save(None, 0)
+
+            for page in get_pages(marker):
+                items = page["DATA"]
+                fp.write(
+                    b"".join(
+                        (
+                            json.dumps(item, separators=(",", ":"), sort_keys=True)
+                            + "\n"
+                        ).encode()
+                        for item in items
+                    )
+                )
+                # the items must be on disk before the resume file says so
+                fp.flush()
+                os.fsync(fp.fileno())
+                self.item_count += len(items)
+
+                marker = page.get(NEXT_MARKER_KEY)
+                if marker is None:
+                    break
+                self._save(marker, fp.tell())
+                log.debug("exported %d items to '%s'", self.item_count, self.filename)
+
+        os.remove(self.resume_filename)
+        return self.item_count
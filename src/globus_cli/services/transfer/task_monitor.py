@@ -0,0 +1,154 @@
+import time
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional
+
+import globus_sdk
+
+from .task_wait import TASK_LIST_BATCH_SIZE, TERMINAL_TASK_STATUSES
+
+# the counters of a task document which are copied into each sample
+MONITOR_COUNTERS = (
+    "bytes_transferred",
+    "files",
+    "files_transferred",
+    "subtasks_total",
+    "subtasks_succeeded",
+    "subtasks_pending",
+    "subtasks_retrying",
+    "subtasks_failed",
+)
+
+# the counters whose rates are computed, and the names of the rates
+MONITOR_RATES = (
+    ("bytes_transferred", "bytes_per_second"),
+    ("files_transferred", "files_per_second"),
+    ("subtasks_succeeded", "subtasks_per_second"),
+)
+
+
+class _TaskSample:
+    __slots__ = ("row", "sampled_at")
+
+    def __init__(self, row: Dict[str, Any], sampled_at: float) -> None:
+        # the row which was last reported for the task
+        self.row = row
+        # the clock reading when the task's counters were last read
+        self.sampled_at = sampled_at
+
+
+class ThroughputMonitor:
+    """
+    Sample the progress of many tasks at once, and compute their throughput.
+
+    Each call to :meth:`sample` checks all of the tasks which have not completed,
+    with a task_list call for each batch of task IDs. The rates of each task (in
+    bytes, files, and subtasks per second) are the changes in its counters since
+    the previous sample, divided by the time between the samples. Only the last
+    sample of each task is kept, so memory use does not grow over time.
+
+    Completed tasks are not checked again, and report rates of 0. Task IDs which
+    are not in the results of task_list, including tasks which were found by an
+    earlier sample but are missing from a later one, are dropped, and recorded
+    in ``not_found``.
+
+    :param transfer_client: The client to use for the task_list calls
+    :param task_ids: The IDs of the tasks to monitor
+    :param batch_size: The maximum number of task IDs in each task_list call
+    :param clock: The source of the times of samples, in seconds
+    """
+
+    def __init__(
+        self,
+        transfer_client: globus_sdk.TransferClient,
+        task_ids: Iterable[str],
+        *,
+        batch_size: int = TASK_LIST_BATCH_SIZE,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.transfer_client = transfer_client
+        self.batch_size = batch_size
+        self.clock = clock
+        # a dict is used as an ordered set, until each task is first sampled
+        self._samples: Dict[str, Optional[_TaskSample]] = dict.fromkeys(task_ids)
+        self.not_found: List[str] = []
+        # the number of task_list calls which have been made
+        self.api_calls = 0
+
+    @property
+    def done(self) -> bool:
+        """Whether all of the tasks have completed"""
+        return all(
+            sample is not None and sample.row["status"] in TERMINAL_TASK_STATUSES
+            for sample in self._samples.values()
+        )
+
+    def _update(self, task: Mapping[str, Any], now: float) -> None:
+        previous = self._samples[task["task_id"]]
+        row: Dict[str, Any] = {
+            "task_id": task["task_id"],
+            "status": task["status"],
+            "label": task.get("label"),
+        }
+        for counter in MONITOR_COUNTERS:
+            row[counter] = task.get(counter) or 0
+        for counter, rate in MONITOR_RATES:
+            if previous is None or now <= previous.sampled_at:
+                row[rate] = None
+            else:
+                row[rate] = (row[counter] - previous.row[counter]) / (
+                    now - previous.sampled_at
+                )
+        self._samples[task["task_id"]] = _TaskSample(row, now)
+
+    def sample(self) -> List[Dict[str, Any]]:
+        """
+        Check the tasks which have not completed, and produce a row for each
+        task, in the order in which the task IDs were given.
+        """
+        active = []
+        for task_id, sample in self._samples.items():
+            if sample is None or sample.row["status"] not in TERMINAL_TASK_STATUSES:
+                active.append(task_id)
+            else:
+                # tasks which completed before this sample make no more progress
+                for _, rate in MONITOR_RATES:
+                    if sample.row[rate] is not None:
+                        sample.row[rate] = 0.0
+        for start in range(0, len(active), self.batch_size):
+            batch = active[start : start + self.batch_size]
+            self.api_calls += 1
+            res = self.transfer_client.task_list(
+                limit=len(batch), filter={"task_id": batch}
+            )
+            now = self.clock()
+            found = set()
+            for task in res:
+                if task["task_id"] in self._samples:
+                    found.add(task["task_id"])
+                    self._update(task, now)
+            # a task which is no longer listed would otherwise keep its last
+            # (incomplete) row forever, and the monitor would never be done
+            for task_id in batch:
+                if task_id not in found:
+                    del self._samples[task_id]
+                    self.not_found.append(task_id)
+
+        return [sample.row for sample in self._samples.values() if sample is not None]
+
+    @staticmethod
+    def totals(rows: Iterable[Mapping[str, Any]]) -> Dict[str, Any]:
+        """Add up the counters and rates of the rows of a sample"""
+        result: Dict[str, Any] = {"tasks": 0, "active_tasks": 0}
+        for counter in MONITOR_COUNTERS:
+            result[counter] = 0
+        for _, rate in MONITOR_RATES:
+            result[rate] = None
+        for row in rows:
+            result["tasks"] += 1
+            if row["status"] not in TERMINAL_TASK_STATUSES:
+                result["active_tasks"] += 1
+            for counter in MONITOR_COUNTERS:
+                result[counter] += row[counter]
+            for _, rate in MONITOR_RATES:
+                if row[rate] is not None:
+                    result[rate] = (result[rate] or 0) + row[rate]
+        return result
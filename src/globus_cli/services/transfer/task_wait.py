@@ -0,0 +1,97 @@
+import random
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional
+
+import globus_sdk
+
+# the number of task IDs given in the filter of each task_list call
+TASK_LIST_BATCH_SIZE = 50
+
+TERMINAL_TASK_STATUSES = ("SUCCEEDED", "FAILED")
+
+# the first delay between polls, which grows by POLLING_BACKOFF_FACTOR each time
+POLLING_INITIAL_INTERVAL = 1.0
+POLLING_BACKOFF_FACTOR = 2.0
+# the largest fraction by which a delay is randomly shortened
+POLLING_JITTER = 0.1
+
+
+class PollingSchedule:
+    """
+    The delays between the polls of a task wait.
+
+    Short tasks are noticed quickly by polling often at first, and long tasks are
+    not polled more than needed, as the delay grows exponentially up to the
+    ``ceiling``. Each delay is shortened by a random amount (of up to
+    ``POLLING_JITTER``), so that many waits which start together do not poll in
+    lockstep.
+
+    :param ceiling: The longest delay between polls, in seconds
+    :param rng: The source of randomness for the jitter
+    """
+
+    def __init__(self, ceiling: float, *, rng: Optional[random.Random] = None):
+        self.ceiling = ceiling
+        self.reset()
+        self._rng = rng or random.Random()
+
+    def reset(self) -> None:
+        """Go back to polling often, as at the start of the schedule"""
+        self._next_base = min(POLLING_INITIAL_INTERVAL, self.ceiling)
+
+    def next_delay(self) -> float:
+        base = self._next_base
+        self._next_base = min(self.ceiling, base * POLLING_BACKOFF_FACTOR)
+        return base * (1 - POLLING_JITTER * self._rng.random())
+
+
+class TaskListPoller:
+    """
+    Check on the status of many tasks at once, with a task_list call for each
+    batch of task IDs rather than a get_task call for each task.
+
+    Each call to :meth:`poll` checks all of the tasks which have not completed
+    yet, and produces the documents of those which have. Task IDs which are not
+    in the results of task_list (because they do not exist, or belong to another
+    user) are dropped, and recorded in ``not_found``.
+
+    :param transfer_client: The client to use for the task_list calls
+    :param task_ids: The IDs of the tasks to check on
+    :param batch_size: The maximum number of task IDs in each task_list call
+    """
+
+    def __init__(
+        self,
+        transfer_client: globus_sdk.TransferClient,
+        task_ids: Iterable[str],
+        *,
+        batch_size: int = TASK_LIST_BATCH_SIZE,
+    ) -> None:
+        self.transfer_client = transfer_client
+        self.batch_size = batch_size
+        # a dict is used as an ordered set
+        self.pending: Dict[str, None] = dict.fromkeys(task_ids)
+        self.not_found: List[str] = []
+        # the number of task_list calls which have been made
+        self.api_calls = 0
+
+    def poll(self) -> Iterator[Mapping[str, Any]]:
+        """
+        Check the pending tasks, producing the document of each task which has
+        completed, in the order in which the task IDs were given.
+        """
+        task_ids = list(self.pending)
+        for start in range(0, len(task_ids), self.batch_size):
+            batch = task_ids[start : start + self.batch_size]
+            self.api_calls += 1
+            res = self.transfer_client.task_list(
+                limit=len(batch), filter={"task_id": batch}
+            )
+            tasks = {task["task_id"]: task for task in res}
+            for task_id in batch:
+                task = tasks.get(task_id)
+                if task is None:
+                    del self.pending[task_id]
+                    self.not_found.append(task_id)
+                elif task["status"] in TERMINAL_TASK_STATUSES:
+                    del self.pending[task_id]
+                    yield task
@@ -7,6 +7,7 @@ from .context import (
     is_verbose,
     out_is_terminal,
     outformat_is_json,
+    outformat_is_ndjson,
     outformat_is_text,
     outformat_is_unix,
     term_is_interactive,
@@ -21,6 +22,7 @@ from .output_formatter import (
     FORMAT_TEXT_RECORD_LIST,
     FORMAT_TEXT_TABLE,
     FormatField,
+    api_fields_param,
     formatted_print,
 )
 
@@ -39,6 +41,7 @@ __all__ = [
     "PrintableErrorField",
     "write_error_info",
     "formatted_print",
+    "api_fields_param",
     "FormatField",
     "FORMAT_SILENT",
     "FORMAT_JSON",
@@ -51,6 +54,7 @@ __all__ = [
     "err_is_terminal",
     "term_is_interactive",
     "outformat_is_json",
+    "outformat_is_ndjson",
     "outformat_is_text",
     "outformat_is_unix",
     "get_jmespath_expression",
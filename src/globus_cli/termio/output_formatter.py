@@ -7,7 +7,13 @@ from globus_sdk import GlobusHTTPResponse
 from globus_cli.utils import CLIStubResponse
 
 from .awscli_text import unix_formatted_print
-from .context import get_jmespath_expression, outformat_is_json, outformat_is_unix
+from .context import (
+    get_jmespath_expression,
+    outformat_is_json,
+    outformat_is_ndjson,
+    outformat_is_text,
+    outformat_is_unix,
+)
 
 FORMAT_SILENT = "silent"
 FORMAT_JSON = "json"
@@ -27,21 +33,34 @@ class FormatField:
     :param key: a str for indexing into print data or a callable which
         produces a string given the print data
     :param wrap_enabled: in record output, is this field allowed to wrap
+    :param api_fields: the top-level fields of the print data which a callable
+        key reads, so that only those need to be requested from an API. For str
+        keys, this is found from the key
     """
 
-    def __init__(self, name, key, wrap_enabled=False):
+    def __init__(self, name, key, wrap_enabled=False, api_fields=None):
         self.name = name
         self.keyfunc = _key_to_keyfunc(key)
         self.wrap_enabled = wrap_enabled
+        if isinstance(key, str):
+            self.api_fields = (key.split(".")[0],)
+        else:
+            self.api_fields = tuple(api_fields) if api_fields is not None else None
 
     @classmethod
     def coerce(cls, rawfield):
-        """given a (FormatField|tuple), convert to a FormatField"""
+        """
+        given a (FormatField|tuple), convert to a FormatField
+
+        tuples are (name, key) or (name, key, api_fields)
+        """
         if isinstance(rawfield, cls):
             return rawfield
         elif isinstance(rawfield, tuple):
             if len(rawfield) == 2:
                 return cls(rawfield[0], rawfield[1])
+            if len(rawfield) == 3:
+                return cls(rawfield[0], rawfield[1], api_fields=rawfield[2])
             raise ValueError("cannot coerce tuple of bad length")
         raise TypeError(
             "FormatField.coerce must be given a field or tuple, "
@@ -78,6 +97,28 @@ def _key_to_keyfunc(k):
     return k
 
 
+def api_fields_param(fields, explicit=None):
+    """
+    Choose the value of the "fields" query param of an API call whose results are
+    printed with ``fields``, or None if whole documents must be requested.
+
+    Text output only needs the fields which it shows, along with any ``explicit``
+    fields, but only if every field says which parts of the data it reads. Other
+    output formats print whole documents, so only the ``explicit`` fields (if
+    any) are requested.
+    """
+    if not outformat_is_text():
+        return ",".join(explicit) if explicit else None
+
+    needed = list(explicit or ())
+    for field in fields:
+        api_fields = FormatField.coerce(field).api_fields
+        if api_fields is None:
+            return None
+        needed.extend(api_fields)
+    return ",".join(dict.fromkeys(needed))
+
+
 def _jmespath_preprocess(res):
     jmespath_expr = get_jmespath_expression()
 
@@ -97,6 +138,38 @@ def print_json_response(res):
     click.echo(res)
 
 
+def _ndjson_records(res, json_converter=None):
+    """
+    Split response data into the records which are printed as lines of NDJSON.
+
+    Documents (responses, dicts) are converted with any ``json_converter`` and
+    produce one record for each element of their "DATA" list, or one record for
+    the whole document if they have none. Any other iterable is streamed item by
+    item and is never converted, so that it is never held in memory all at once.
+    """
+    if res is None or isinstance(res, (dict, CLIStubResponse, GlobusHTTPResponse)):
+        doc = json_converter(res) if json_converter else res
+        if isinstance(doc, (CLIStubResponse, GlobusHTTPResponse)):
+            doc = doc.data
+        if isinstance(doc, dict) and isinstance(doc.get("DATA"), list):
+            yield from doc["DATA"]
+        elif isinstance(doc, list):
+            yield from doc
+        else:
+            yield doc
+    else:
+        for item in res:
+            yield getattr(item, "data", item)
+
+
+def print_ndjson_response(res, json_converter=None):
+    jmespath_expr = get_jmespath_expression()
+    for record in _ndjson_records(res, json_converter):
+        if jmespath_expr is not None:
+            record = jmespath_expr.search(record)
+        click.echo(json.dumps(record, separators=(",", ":"), sort_keys=True))
+
+
 def print_unix_response(res):
     res = _jmespath_preprocess(res)
     try:
@@ -230,7 +303,8 @@ def formatted_print(
 
     ``json_converter`` is a callable that does preprocessing of JSON output. It
     must take ``response_data`` and produce another dict or dict-like object
-    (json/unix output only)
+    (json/unix output only, and NDJSON output when ``response_data`` is a
+    document rather than an iterable of items)
 
     ``fields`` is an iterable of fields. They may be expressed as FormatField
     objects, (fieldname, key_string) tuples, or (fieldname, key_func) tuples.
@@ -319,6 +393,8 @@ def formatted_print(
 
     if outformat_is_json():
         _print_as_json()
+    elif outformat_is_ndjson():
+        print_ndjson_response(response_data, json_converter)
     elif outformat_is_unix():
         _print_as_unix()
     else:
@@ -1,12 +1,26 @@
 import inspect
 import json
 import shlex
-from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, TextIO, cast
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    TextIO,
+    cast,
+)
 
 import click
 
 from globus_cli.types import DATA_CONTAINER_T, FIELD_LIST_T
 
+if TYPE_CHECKING:
+    from globus_cli.parsing.batch_line import BatchLineParser
+
 
 def get_current_option_help(
     *, filter_names: Optional[Iterable[str]] = None
@@ -161,7 +175,11 @@ class PagingWrapper:
             yielded += 1
 
 
-def shlex_process_stream(process_command: click.Command, stream: TextIO) -> None:
+def shlex_process_stream(
+    process_command: click.Command,
+    stream: TextIO,
+    fast_parser: Optional["BatchLineParser"] = None,
+) -> None:
     """
     Use shlex to process stdin line-by-line.
     Also prints help text.
@@ -169,11 +187,15 @@ def shlex_process_stream(process_command: click.Command, stream: TextIO) -> None
     Requires that @process_command be a Click command object, used for
     processing single lines of input. helptext is prepended to the standard
     message printed to interactive sessions.
+
+    If @fast_parser is given, it is tried first for each line, and only the lines
+    which it does not handle are passed to @process_command.
     """
-    # use readlines() rather than implicit file read line looping to force
-    # python to properly capture EOF (otherwise, EOF acts as a flush and
-    # things get weird)
-    for line in stream.readlines():
+    # read one line at a time, so that the whole of a large batch is never held
+    # in memory
+    for line in stream:
+        if fast_parser is not None and fast_parser.process_line(line):
+            continue
         # get the argument vector:
         # do a shlex split to handle quoted paths with spaces in them
         # also lets us have comments with #
@@ -119,6 +119,37 @@ def patch_tokenstorage(monkeypatch, test_token_storage):
     )
 
 
+@pytest.fixture(autouse=True)
+def ls_cache_file(monkeypatch, tmp_path):
+    """Keep the ls cache out of the real data dir."""
+    filename = str(tmp_path / "ls_cache.db")
+    monkeypatch.setattr(
+        "globus_cli.services.transfer.ls_cache._cache_filename", lambda: filename
+    )
+    return filename
+
+
+@pytest.fixture(autouse=True)
+def activation_cache_file(monkeypatch, tmp_path):
+    """Keep the activation cache out of the real data dir."""
+    filename = str(tmp_path / "activation_cache.json")
+    monkeypatch.setattr(
+        "globus_cli.services.transfer.activation_cache._cache_filename",
+        lambda: filename,
+    )
+    return filename
+
+
+@pytest.fixture(autouse=True)
+def task_db_file(monkeypatch, tmp_path):
+    """Keep the local task database out of the real data dir."""
+    filename = str(tmp_path / "task_db.db")
+    monkeypatch.setattr(
+        "globus_cli.services.transfer.task_db._db_filename", lambda: filename
+    )
+    return filename
+
+
 @pytest.fixture
 def add_gcs_login(test_token_storage):
     def func(gcs_id):
@@ -0,0 +1,115 @@
+import json
+
+import pytest
+import responses
+from globus_sdk._testing import load_response_set
+
+TRANSFER_URL = "https://transfer.api.globus.org/v0.10"
+
+
+def _add_autoactivate(ep_id, code="AlreadyActivated", expires_in=3600):
+    responses.add(
+        responses.POST,
+        f"{TRANSFER_URL}/endpoint/{ep_id}/autoactivate",
+        json={
+            "code": code,
+            "expires_in": expires_in,
+            "oauth_server": None,
+            "DATA": [],
+        },
+    )
+
+
+def _autoactivate_calls():
+    return [
+        c
+        for c in responses.calls
+        if c.request.url.split("?")[0].endswith("/autoactivate")
+    ]
+
+
+@pytest.fixture
+def enable_cache(monkeypatch):
+    monkeypatch.setenv("GLOBUS_CLI_ACTIVATION_CACHE_TTL", "300")
+
+
+def test_activation_is_not_cached_by_default(run_line, go_ep1_id):
+    _add_autoactivate(go_ep1_id)
+    load_response_set("cli.rename_result")
+
+    run_line(f"globus rename {go_ep1_id} foo/bar /baz/buzz")
+    run_line(f"globus rename {go_ep1_id} foo/bar /baz/buzz")
+    assert len(_autoactivate_calls()) == 2
+
+
+def test_activation_is_cached_between_commands(run_line, go_ep1_id, enable_cache):
+    _add_autoactivate(go_ep1_id)
+    load_response_set("cli.rename_result")
+
+    run_line(f"globus rename {go_ep1_id} foo/bar /baz/buzz")
+    run_line(f"globus rename {go_ep1_id} foo/bar /baz/buzz")
+    assert len(_autoactivate_calls()) == 1
+
+    # deactivating the endpoint drops the cached result
+    responses.add(
+        responses.POST,
+        f"{TRANSFER_URL}/endpoint/{go_ep1_id}/deactivate",
+        json={"code": "Deactivated", "message": "Endpoint deactivated"},
+    )
+    run_line(f"globus endpoint deactivate {go_ep1_id}")
+    run_line(f"globus rename {go_ep1_id} foo/bar /baz/buzz")
+    assert len(_autoactivate_calls()) == 2
+
+
+@pytest.mark.parametrize(
+    "expires_in, ttl, cached",
+    [(30, "300", False), (3600, "0", False), (-1, "300", True)],
+)
+def test_activation_cache_limits(
+    run_line, monkeypatch, go_ep1_id, expires_in, ttl, cached
+):
+    monkeypatch.setenv("GLOBUS_CLI_ACTIVATION_CACHE_TTL", ttl)
+    _add_autoactivate(go_ep1_id, expires_in=expires_in)
+    load_response_set("cli.rename_result")
+
+    run_line(f"globus rename {go_ep1_id} foo/bar /baz/buzz")
+    run_line(f"globus rename {go_ep1_id} foo/bar /baz/buzz")
+    assert len(_autoactivate_calls()) == (1 if cached else 2)
+
+
+def test_activation_cache_ttl_env_is_checked(run_line, monkeypatch, go_ep1_id):
+    monkeypatch.setenv("GLOBUS_CLI_ACTIVATION_CACHE_TTL", "soon")
+    load_response_set("cli.rename_result")
+    result = run_line(
+        f"globus rename {go_ep1_id} foo/bar /baz/buzz", assert_exit_code=2
+    )
+    assert "couldn't parse GLOBUS_CLI_ACTIVATION_CACHE_TTL" in result.stderr
+
+
+def test_transfer_activates_both_endpoints(
+    run_line, go_ep1_id, go_ep2_id, enable_cache
+):
+    load_response_set("cli.get_submission_id")
+    _add_autoactivate(go_ep1_id)
+    _add_autoactivate(go_ep2_id, code="AutoActivationFailed")
+    result = run_line(
+        f"globus transfer {go_ep1_id}:/a {go_ep2_id}:/b", assert_exit_code=1
+    )
+    assert "could not be auto-activated" in result.stderr
+    assert go_ep2_id in result.stderr
+    assert sorted(
+        c.request.url.split("/")[-2] for c in _autoactivate_calls()
+    ) == sorted([go_ep1_id, go_ep2_id])
+
+    # only the endpoint which was activated is cached
+    _add_autoactivate(go_ep2_id)
+    responses.add(
+        responses.POST,
+        f"{TRANSFER_URL}/transfer",
+        json={"code": "Accepted", "message": "ok", "task_id": "task-id"},
+    )
+    run_line(f"globus transfer {go_ep1_id}:/a {go_ep2_id}:/b")
+    assert [c.request.url.split("/")[-2] for c in _autoactivate_calls()][2:] == [
+        go_ep2_id
+    ]
+    assert json.loads(b"".join(responses.calls[-1].request.body))["DATA"]
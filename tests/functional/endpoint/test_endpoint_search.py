@@ -0,0 +1,29 @@
+import responses
+from globus_sdk._testing import load_response_set
+
+
+def _endpoint_search_params():
+    return [
+        call.request.params
+        for call in responses.calls
+        if "/endpoint_search" in call.request.url
+    ]
+
+
+def test_endpoint_search_requests_only_shown_fields(run_line):
+    load_response_set("cli.endpoint_operations")
+    result = run_line("globus endpoint search 'Tutorial'")
+    assert "Display Name" in result.output
+    assert _endpoint_search_params()[0]["fields"] == (
+        "id,owner_string,display_name,canonical_name"
+    )
+
+
+def test_endpoint_search_json_requests_all_fields(run_line):
+    load_response_set("cli.endpoint_operations")
+    run_line("globus endpoint search 'Tutorial' -F json")
+    assert "fields" not in _endpoint_search_params()[0]
+
+    responses.calls.reset()
+    run_line("globus endpoint search 'Tutorial' -F json --fields id")
+    assert _endpoint_search_params()[0]["fields"] == "id"
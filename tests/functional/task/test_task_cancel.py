@@ -1,6 +1,12 @@
+import json
+import uuid
+
 import pytest
+import responses
 from globus_sdk._testing import load_response_set
 
+TRANSFER_URL = "https://transfer.api.globus.org/v0.10"
+
 
 @pytest.mark.parametrize("cli_arg", ("task_id", "--all"))
 def test_cancel(run_line, cli_arg):
@@ -10,3 +16,69 @@ def test_cancel(run_line, cli_arg):
         cli_arg = meta["task_id"]
     result = run_line(f"globus task cancel {cli_arg}")
     assert "cancelled successfully" in result.output
+
+
+def _register_cancel_all(task_ids, failing=()):
+    responses.add(
+        responses.GET,
+        f"{TRANSFER_URL}/task_list",
+        json={
+            "DATA": [{"task_id": i} for i in task_ids + task_ids[:1]],
+            "DATA_TYPE": "task_list",
+            "length": len(task_ids) + 1,
+            "limit": 1000,
+            "offset": 0,
+            "total": len(task_ids) + 1,
+        },
+    )
+    for i in task_ids:
+        if i in failing:
+            responses.add(
+                responses.POST,
+                f"{TRANSFER_URL}/task/{i}/cancel",
+                status=409,
+                json={"code": "Conflict", "message": "Task already completed"},
+            )
+        else:
+            responses.add(
+                responses.POST,
+                f"{TRANSFER_URL}/task/{i}/cancel",
+                json={"code": "Canceled", "message": f"Cancelled {i[-2:]}"},
+            )
+
+
+def _cancel_calls():
+    return [c.request.url for c in responses.calls if c.request.url.endswith("/cancel")]
+
+
+def test_cancel_all_concurrently(run_line):
+    task_ids = [str(uuid.UUID(int=i)) for i in range(1, 21)]
+    _register_cancel_all(task_ids, failing=task_ids[3:4])
+
+    result = run_line("globus task cancel --all --max-parallel 4", assert_exit_code=1)
+    lines = result.output.splitlines()
+    assert len(lines) == 20
+    assert [line.split(" ")[1] for line in lines] == [f"({i}" for i in range(1, 21)]
+    assert f"{task_ids[3]} " in "\n".join(line for line in lines if "already" in line)
+    # every task is cancelled exactly once, even if it is listed twice
+    assert sorted(_cancel_calls()) == sorted(
+        f"{TRANSFER_URL}/task/{i}/cancel" for i in task_ids
+    )
+
+
+def test_cancel_all_json_keeps_task_order(run_line):
+    task_ids = [str(uuid.UUID(int=i)) for i in range(1, 6)]
+    _register_cancel_all(task_ids)
+
+    result = run_line("globus task cancel --all -F json")
+    doc = json.loads(result.output)
+    assert doc["task_ids"] == task_ids
+    assert [r["message"] for r in doc["results"]] == [
+        f"Cancelled {i[-2:]}" for i in task_ids
+    ]
+    assert len(_cancel_calls()) == 5
+
+
+def test_max_parallel_requires_all(run_line):
+    result = run_line("globus task cancel --max-parallel 2 TASK_ID", assert_exit_code=2)
+    assert "--max-parallel can only be used with --all" in result.stderr
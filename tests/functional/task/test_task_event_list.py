@@ -1,8 +1,118 @@
+import json
+import urllib.parse
+import uuid
+
+import responses
 from globus_sdk._testing import load_response_set
 
+TRANSFER_URL = "https://transfer.api.globus.org/v0.10"
+
 
 def test_task_event_list_success(run_line):
     meta = load_response_set("cli.task_event_list").metadata
     task_id = meta["task_id"]
     result = run_line(f"globus task event-list {task_id}")
     assert "Canceled by the task owner" in result.output
+
+
+def _event(time, code, is_error=False):
+    return {
+        "DATA_TYPE": "event",
+        "code": code,
+        "description": code.lower(),
+        "details": f"{code} details",
+        "is_error": is_error,
+        "time": f"2021-10-06T16:{time}+00:00",
+    }
+
+
+def _register_followed_task(task_id, event_lists, statuses):
+    """
+    Serve each list of events (newest first) in ``event_lists`` for successive
+    task_event_list calls, and each status in ``statuses`` for successive
+    get_task calls
+    """
+    event_calls = []
+
+    def event_callback(request):
+        query = urllib.parse.parse_qs(urllib.parse.urlparse(request.url).query)
+        events = event_lists[min(len(event_calls), len(event_lists) - 1)]
+        event_calls.append(query)
+        offset, limit = int(query["offset"][0]), int(query["limit"][0])
+        doc = {
+            "DATA": events[offset : offset + limit],
+            "offset": offset,
+            "limit": limit,
+            "total": len(events),
+        }
+        return (200, {}, json.dumps(doc))
+
+    status_iter = iter(statuses)
+
+    def task_callback(request):
+        return (200, {}, json.dumps({"task_id": task_id, "status": next(status_iter)}))
+
+    responses.add_callback(
+        responses.GET,
+        f"{TRANSFER_URL}/task/{task_id}/event_list",
+        callback=event_callback,
+        match_querystring=None,
+    )
+    responses.add_callback(
+        responses.GET,
+        f"{TRANSFER_URL}/task/{task_id}",
+        callback=task_callback,
+        match_querystring=None,
+    )
+    return event_calls
+
+
+def test_task_event_list_follow(run_line, mocksleep):
+    task_id = str(uuid.uuid1())
+    first = [_event("00:02", "FAULT", True), _event("00:01", "STARTED")]
+    # a second event at the same time as the newest one already seen
+    second = [_event("00:03", "PROGRESS"), _event("00:02", "PERMISSION_DENIED")]
+    last = [_event("00:04", "SUCCEEDED")]
+    event_calls = _register_followed_task(
+        task_id,
+        [first, second + first, second + first, second + first, last + second + first],
+        ["ACTIVE", "SUCCEEDED"],
+    )
+
+    result = run_line(f"globus task event-list --follow {task_id}")
+    assert [line.split(" | ")[1] for line in result.output.splitlines()] == [
+        "STARTED",
+        "FAULT",
+        "PERMISSION_DENIED",
+        "PROGRESS",
+        "SUCCEEDED",
+    ]
+    assert "2021-10-06T16:00:02+00:00 | FAULT | True | FAULT details" in result.output
+    assert len(event_calls) == 5
+
+    # polling slows down while there are no new events, and speeds up after them
+    delays = [c[0][0] for c in mocksleep.call_args_list]
+    assert len(delays) == 3
+    assert 0.8 < delays[0] <= 1 and 0.8 < delays[1] <= 1
+    assert 1.8 < delays[2] <= 2
+
+
+def test_task_event_list_follow_ndjson_failed_task(run_line):
+    task_id = str(uuid.uuid1())
+    events = [_event("00:02", "FAULT", True), _event("00:01", "STARTED")]
+    _register_followed_task(task_id, [events], ["FAILED"])
+
+    result = run_line(
+        f"globus task event-list --follow --limit 1 -F ndjson {task_id}",
+        assert_exit_code=1,
+    )
+    assert [json.loads(line)["code"] for line in result.output.splitlines()] == [
+        "FAULT"
+    ]
+
+
+def test_task_event_list_follow_requires_streaming_format(run_line):
+    result = run_line(
+        f"globus task event-list --follow -F json {uuid.uuid1()}", assert_exit_code=2
+    )
+    assert "--follow can only be used with" in result.stderr
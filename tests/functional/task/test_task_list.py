@@ -13,3 +13,38 @@ def test_task_list_success(run_line):
     )
     assert "completion_time" not in filters
     assert "request_time" not in filters
+
+
+def test_task_list_requests_only_shown_fields(run_line):
+    load_response_set("cli.task_list")
+    run_line("globus task list")
+    assert responses.calls[0].request.params["fields"] == (
+        "task_id,status,type,source_endpoint_display_name,"
+        "destination_endpoint_display_name,label"
+    )
+
+
+def test_task_list_json_requests_all_fields(run_line):
+    load_response_set("cli.task_list")
+    run_line("globus task list -F json")
+    assert "fields" not in responses.calls[0].request.params
+
+
+def test_task_list_explicit_fields(run_line):
+    load_response_set("cli.task_list")
+    run_line("globus task list -F json --fields task_id,bytes_transferred")
+    assert responses.calls[0].request.params["fields"] == "task_id,bytes_transferred"
+
+    # text output still requests the fields which it shows
+    responses.calls.reset()
+    run_line("globus task list --fields bytes_transferred,status")
+    assert responses.calls[0].request.params["fields"] == (
+        "bytes_transferred,status,task_id,type,source_endpoint_display_name,"
+        "destination_endpoint_display_name,label"
+    )
+
+
+def test_task_list_debug_logs_rate_limiter_summary(run_line):
+    load_response_set("cli.task_list")
+    result = run_line("globus task list --debug")
+    assert "rate limiter summary: requests=1, throttled responses=0" in result.stderr
@@ -0,0 +1,121 @@
+import json
+import urllib.parse
+import uuid
+
+import responses
+
+TRANSFER_URL = "https://transfer.api.globus.org/v0.10"
+
+
+def _register_task_list(samples):
+    """
+    Serve task_list with successive lists of task documents from ``samples``,
+    limited to the task IDs in the filter when there is one
+    """
+    calls = []
+
+    def callback(request):
+        query = urllib.parse.parse_qs(urllib.parse.urlparse(request.url).query)
+        tasks = samples[min(len(calls), len(samples) - 1)]
+        calls.append(query["filter"][0])
+        clauses = dict(clause.split(":", 1) for clause in query["filter"][0].split("/"))
+        if "task_id" in clauses:
+            task_ids = clauses["task_id"].split(",")
+            tasks = [t for t in tasks if t["task_id"] in task_ids]
+        return (200, {}, json.dumps({"DATA": tasks}))
+
+    responses.add_callback(
+        responses.GET,
+        f"{TRANSFER_URL}/task_list",
+        callback=callback,
+        match_querystring=None,
+    )
+    return calls
+
+
+def _task(task_id, status, bytes_transferred, files_transferred):
+    return {
+        "task_id": task_id,
+        "status": status,
+        "label": None,
+        "bytes_transferred": bytes_transferred,
+        "files": 4,
+        "files_transferred": files_transferred,
+        "subtasks_total": 4,
+        "subtasks_succeeded": files_transferred,
+        "subtasks_pending": 4 - files_transferred,
+        "subtasks_retrying": 0,
+        "subtasks_failed": 0,
+    }
+
+
+def test_task_monitor_ndjson(run_line, mocksleep):
+    a, b = str(uuid.uuid1()), str(uuid.uuid1())
+    calls = _register_task_list(
+        [
+            [_task(a, "ACTIVE", 0, 0), _task(b, "ACTIVE", 0, 0)],
+            [_task(a, "ACTIVE", 2000, 2), _task(b, "SUCCEEDED", 4000, 4)],
+            [_task(a, "SUCCEEDED", 4000, 4)],
+        ]
+    )
+
+    result = run_line(f"globus task monitor --interval 2 -F ndjson {a} {b.upper()}")
+    samples = [json.loads(line) for line in result.output.splitlines()]
+    assert len(samples) == 3
+    assert samples[0]["totals"]["bytes_per_second"] is None
+    assert [t["task_id"] for t in samples[0]["tasks"]] == [a, b]
+    assert samples[-1]["totals"]["active_tasks"] == 0
+    assert samples[-1]["totals"]["bytes_transferred"] == 8000
+    # one batched call per check, and completed tasks are not checked again
+    assert calls == [f"task_id:{a},{b}", f"task_id:{a},{b}", f"task_id:{a}"]
+    assert [c[0][0] for c in mocksleep.call_args_list] == [2, 2]
+
+
+def test_task_monitor_active_tasks_text(run_line):
+    a = str(uuid.uuid1())
+    calls = _register_task_list([[_task(a, "ACTIVE", 0, 1)]])
+
+    result = run_line("globus task monitor --count 1")
+    assert calls[0] == "status:ACTIVE,INACTIVE/type:TRANSFER,DELETE"
+    lines = result.output.splitlines()
+    assert [h.strip() for h in lines[0].split(" | ")] == [
+        "Task ID",
+        "Status",
+        "Files",
+        "Subtasks",
+        "Transferred",
+        "Bytes/s",
+        "Files/s",
+    ]
+    assert lines[2].startswith(a)
+    assert lines[3].startswith("TOTAL")
+    assert "1/1 ACTIVE" in lines[3]
+    assert len(lines) == 4
+
+
+def test_task_monitor_redraws_on_terminal(run_line, monkeypatch, mocksleep):
+    monkeypatch.setattr(
+        "globus_cli.commands.task.monitor.out_is_terminal", lambda: True
+    )
+    a, b = str(uuid.uuid1()), str(uuid.uuid1())
+    _register_task_list(
+        [
+            [_task(a, "ACTIVE", 0, 0), _task(b, "ACTIVE", 0, 0)],
+            # b goes missing, which also stops the monitor from waiting on it
+            [_task(a, "SUCCEEDED", 4000, 4)],
+        ]
+    )
+
+    result = run_line(f"globus task monitor {a} {b}")
+    tables = result.stdout.split("\x1b[H\x1b[2J")
+    # the screen is cleared before each table
+    assert tables[0] == ""
+    assert len(tables) == 3
+    assert b in tables[1] and b not in tables[2]
+    # reported after the last table, where it is not cleared
+    assert result.stderr == f"Task {b} was not found\n"
+
+
+def test_task_monitor_requires_streaming_format(run_line):
+    result = run_line(f"globus task monitor -F json {uuid.uuid1()}", assert_exit_code=2)
+    assert "can only be used with" in result.stderr
@@ -1,9 +1,57 @@
+import json
+import urllib.parse
 import uuid
 
+import pytest
+import responses
 from globus_sdk._testing import load_response_set
 
 ID_ZERO = uuid.UUID(int=0)
 
+TRANSFER_URL = "https://transfer.api.globus.org/v0.10"
+
+
+def _register_successful_transfer_pages(task_id, pages, fail_on_marker=None):
+    """
+    Serve each list of paths in ``pages`` as a page of successful transfers,
+    failing instead when the page with ``fail_on_marker`` is requested
+    """
+
+    def callback(request):
+        query = urllib.parse.parse_qs(urllib.parse.urlparse(request.url).query)
+        index = int(query.get("marker", ["0"])[0])
+        if index == fail_on_marker:
+            return (400, {}, json.dumps({"code": "BadRequest", "message": "nope"}))
+        next_index = index + 1
+        doc = {
+            "DATA": [
+                {
+                    "DATA_TYPE": "successful_transfer",
+                    "source_path": path,
+                    "destination_path": path,
+                }
+                for path in pages[index]
+            ],
+            "marker": str(index),
+            "next_marker": str(next_index) if next_index < len(pages) else None,
+        }
+        return (200, {}, json.dumps(doc))
+
+    responses.add_callback(
+        responses.GET,
+        f"{TRANSFER_URL}/task/{task_id}/successful_transfers",
+        callback=callback,
+        match_querystring=None,
+    )
+
+
+def _page_requests():
+    return [
+        call.request.url
+        for call in responses.calls
+        if "/successful_transfers" in call.request.url
+    ]
+
 
 def test_skipped_errors(run_line):
     """
@@ -28,3 +76,79 @@ def test_mutex_options(run_line):
         "--successful-transfers and --skipped-errors are mutually exclusive"
         in result.stderr
     )
+
+
+def test_export_successful_transfers_resumes(run_line, tmp_path):
+    """
+    Interrupt an --export of successful transfers with an API error, then confirm
+    that rerunning it continues from the page which failed
+    """
+    task_id = str(uuid.uuid1())
+    export_file = tmp_path / "transferred.ndjson"
+    resume_file = tmp_path / "transferred.ndjson.resume"
+    pages = [["/a", "/b"], ["/c"], ["/d", "/e"]]
+    line = f"globus task show --successful-transfers --export {export_file} {task_id}"
+
+    _register_successful_transfer_pages(task_id, pages, fail_on_marker=2)
+    run_line(line, assert_exit_code=1)
+    assert len(_page_requests()) == 3
+    assert json.loads(resume_file.read_text())["marker"] == "2"
+    # a partial page written after the last save is dropped on resume
+    with open(export_file, "a") as fp:
+        fp.write('{"source_path": "/d"')
+
+    responses.reset()
+    _register_successful_transfer_pages(task_id, pages)
+    result = run_line(line + " -F json")
+    assert json.loads(result.output) == {
+        "task_id": task_id,
+        "filename": str(export_file),
+        "items": 5,
+        "resumed": True,
+    }
+    # only the page which failed was fetched again
+    assert len(_page_requests()) == 1
+    assert "marker=2" in _page_requests()[0]
+
+    lines = export_file.read_text().splitlines()
+    assert [json.loads(x)["source_path"] for x in lines] == [
+        "/a",
+        "/b",
+        "/c",
+        "/d",
+        "/e",
+    ]
+    assert not resume_file.exists()
+
+
+def test_export_skipped_errors(run_line, tmp_path):
+    meta = load_response_set("cli.skipped_error_list").metadata
+    export_file = tmp_path / "errors.ndjson"
+
+    result = run_line(
+        f"globus task show --skipped-errors --export {export_file} {meta['task_id']}"
+    )
+    assert "Items:       2" in result.output
+    assert [
+        json.loads(x)["error_code"] for x in export_file.read_text().splitlines()
+    ] == ["FILE_NOT_FOUND", "PERMISSION_DENIED"]
+
+
+def test_export_resume_file_for_different_export(run_line, tmp_path):
+    export_file = tmp_path / "transferred.ndjson"
+    (tmp_path / "transferred.ndjson.resume").write_text(
+        json.dumps({"version": 1, "identity": {}, "marker": "1", "offset": 0})
+    )
+    result = run_line(
+        f"globus task show -t --export {export_file} {ID_ZERO}", assert_exit_code=2
+    )
+    assert "is the resume file of a different export" in result.stderr
+
+
+@pytest.mark.parametrize("extra_args", ["", "--skipped-errors --successful-transfers"])
+def test_export_usage_errors(run_line, tmp_path, extra_args):
+    result = run_line(
+        f"globus task show {extra_args} --export {tmp_path / 'x'} {ID_ZERO}",
+        assert_exit_code=2,
+    )
+    assert result.stderr
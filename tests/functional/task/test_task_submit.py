@@ -1,5 +1,9 @@
+import itertools
 import json
+import uuid
 
+import pytest
+import responses
 from globus_sdk._testing import load_response_set
 
 
@@ -70,3 +74,411 @@ def test_exlude_recursive_batch_file(run_line, go_ep1_id, go_ep2_id, tmp_path):
         assert_exit_code=2,
     )
     assert "--exclude can only be used with --recursive transfers" in result.stderr
+
+
+def _register_chunked_transfer_responses(fail_submission_ids=()):
+    """
+    Register /submission_id and /transfer responses for chunked submissions,
+    returning a list which collects the submitted documents.
+    Submissions with IDs in `fail_submission_ids` get an error response.
+    """
+    base_url = "https://transfer.api.globus.org/v0.10"
+    submission_ids = (str(uuid.UUID(int=n)) for n in itertools.count(1))
+    submitted = []
+
+    def submission_id_callback(request):
+        return (200, {}, json.dumps({"value": next(submission_ids)}))
+
+    def transfer_callback(request):
+        doc = json.loads(request.body)
+        if doc["submission_id"] in fail_submission_ids:
+            return (503, {}, json.dumps({"code": "ServiceUnavailable"}))
+        submitted.append(doc)
+        return (
+            202,
+            {},
+            json.dumps(
+                {
+                    "code": "Accepted",
+                    "message": "The transfer has been accepted",
+                    "task_id": "task-" + doc["submission_id"],
+                    "submission_id": doc["submission_id"],
+                }
+            ),
+        )
+
+    responses.add_callback(
+        responses.GET,
+        f"{base_url}/submission_id",
+        callback=submission_id_callback,
+        match_querystring=None,
+    )
+    responses.add_callback(
+        responses.POST,
+        f"{base_url}/transfer",
+        callback=transfer_callback,
+        match_querystring=None,
+    )
+    return submitted
+
+
+def test_chunked_transfer(run_line, go_ep1_id, go_ep2_id, tmp_path):
+    load_response_set("cli.transfer_activate_success")
+    submitted = _register_chunked_transfer_responses()
+    manifest = tmp_path / "manifest.json"
+
+    result = run_line(
+        [
+            "globus",
+            "transfer",
+            "-F",
+            "json",
+            "--batch",
+            "-",
+            "--chunk-size",
+            "2",
+            "--chunk-manifest",
+            str(manifest),
+            f"{go_ep1_id}:/src/",
+            f"{go_ep2_id}:/dst/",
+        ],
+        stdin="".join(f"file{i} file{i}\n" for i in range(5)),
+    )
+
+    # each chunk is a separate task, with its own submission ID, and no other
+    # submission IDs are fetched
+    submission_id_calls = [
+        c for c in responses.calls if "/submission_id" in c.request.url
+    ]
+    assert len(submission_id_calls) == 3
+    assert sorted(len(doc["DATA"]) for doc in submitted) == [1, 2, 2]
+    assert len({doc["submission_id"] for doc in submitted}) == 3
+    assert sorted(item["source_path"] for doc in submitted for item in doc["DATA"]) == [
+        f"/src/file{i}" for i in range(5)
+    ]
+
+    records = sorted(json.loads(result.output)["DATA"], key=lambda r: r["chunk"])
+    assert [r["item_count"] for r in records] == [2, 2, 1]
+    assert all(r["status"] == "Accepted" for r in records)
+
+    # the manifest maps each chunk to its task
+    chunks = json.loads(manifest.read_text())["chunks"]
+    assert [(c["submission_id"], c["task_id"]) for c in chunks] == [
+        (r["submission_id"], r["task_id"]) for r in records
+    ]
+    assert all(c["task_id"] == "task-" + c["submission_id"] for c in chunks)
+
+
+def test_chunked_transfer_resume(run_line, go_ep1_id, go_ep2_id, tmp_path):
+    load_response_set("cli.transfer_activate_success")
+    # submission IDs are only fetched for chunks, so this one is used by the
+    # second chunk, which fails on the first run
+    failing_id = str(uuid.UUID(int=2))
+    submitted = _register_chunked_transfer_responses(fail_submission_ids={failing_id})
+    manifest = tmp_path / "manifest.json"
+    cmd = [
+        "globus",
+        "transfer",
+        "-F",
+        "json",
+        "--batch",
+        "-",
+        "--chunk-size",
+        "2",
+        "--chunk-manifest",
+        str(manifest),
+        "--chunk-parallel",
+        "1",
+        f"{go_ep1_id}:/src/",
+        f"{go_ep2_id}:/dst/",
+    ]
+    batch = "".join(f"file{i} file{i}\n" for i in range(6))
+
+    result = run_line(cmd, stdin=batch, assert_exit_code=1)
+    assert "1 chunks could not be submitted" in result.stderr
+    assert len(submitted) == 2
+    chunks = json.loads(manifest.read_text())["chunks"]
+    assert [c["task_id"] is None for c in chunks] == [False, True, False]
+    # the submission ID was recorded before the failed submission
+    assert chunks[1]["submission_id"] == failing_id
+
+    # on the second run, only the failed chunk is submitted, with the same ID
+    del submitted[:]
+    responses.reset()
+    load_response_set("cli.transfer_activate_success")
+    submitted = _register_chunked_transfer_responses()
+    result = run_line(cmd, stdin=batch)
+    assert [doc["submission_id"] for doc in submitted] == [failing_id]
+    records = sorted(json.loads(result.output)["DATA"], key=lambda r: r["chunk"])
+    assert [r["status"] for r in records] == ["Resumed", "Accepted", "Resumed"]
+    chunks = json.loads(manifest.read_text())["chunks"]
+    assert all(c["task_id"] for c in chunks)
+
+    # a different batch cannot be resumed from the manifest
+    result = run_line(cmd, stdin="other other\n", assert_exit_code=2)
+    assert "is a manifest for a different transfer" in result.stderr
+    # and neither can a transfer with different options
+    result = run_line(
+        cmd[:-2] + ["--label", "other"] + cmd[-2:], stdin=batch, assert_exit_code=2
+    )
+    assert "is a manifest for a different transfer" in result.stderr
+
+
+def test_chunked_transfer_usage_errors(run_line, go_ep1_id, go_ep2_id, tmp_path):
+    load_response_set("cli.get_submission_id")
+    result = run_line(
+        f"globus transfer --chunk-size 2 {go_ep1_id}:/a {go_ep2_id}:/b",
+        assert_exit_code=2,
+    )
+    assert "--chunk-size can only be used with --batch" in result.stderr
+
+    result = run_line(
+        f"globus transfer --batch - --chunk-size 2 {go_ep1_id} {go_ep2_id}",
+        stdin="a b\n",
+        assert_exit_code=2,
+    )
+    assert "--chunk-size requires --chunk-manifest" in result.stderr
+
+
+def _add_sync_listing(ep_id, path, items, status=200):
+    responses.add(
+        responses.GET,
+        f"https://transfer.api.globus.org/v0.10/operation/endpoint/{ep_id}/ls",
+        match=[
+            responses.matchers.query_param_matcher({"path": path, "show_hidden": "1"})
+        ],
+        status=status,
+        json={
+            "DATA": [
+                {
+                    "name": name,
+                    "type": type_,
+                    "size": size,
+                    "last_modified": f"2022-01-0{day} 00:00:00+00:00",
+                }
+                for name, type_, size, day in items
+            ],
+            "DATA_TYPE": "file_list",
+            "path": path.rstrip("/") + "/",
+        },
+    )
+
+
+def test_plan_sync(run_line, go_ep1_id, go_ep2_id):
+    load_response_set("cli.get_submission_id")
+    load_response_set("cli.transfer_activate_success")
+    # the listings are not in name order
+    _add_sync_listing(
+        go_ep1_id,
+        "/src/",
+        [
+            ("z.txt", "file", 5, 1),
+            ("sub", "dir", 0, 1),
+            ("b.txt", "file", 20, 1),
+            ("a.txt", "file", 10, 1),
+            ("skip.tmp", "file", 10, 1),
+        ],
+    )
+    _add_sync_listing(
+        go_ep1_id, "/src/sub", [("d.txt", "file", 2, 2), ("c.txt", "file", 1, 1)]
+    )
+    _add_sync_listing(
+        go_ep2_id,
+        "/dst/",
+        [
+            ("sub", "dir", 0, 1),
+            ("extra.txt", "file", 1, 1),
+            ("b.txt", "file", 21, 1),
+            ("a.txt", "file", 10, 1),
+        ],
+    )
+    _add_sync_listing(
+        go_ep2_id, "/dst/sub", [("c.txt", "file", 1, 1), ("d.txt", "file", 2, 1)]
+    )
+
+    result = run_line(
+        "globus transfer -F json --dry-run --plan-sync --exclude *.tmp "
+        f"{go_ep1_id}:/src/ {go_ep2_id}:/dst/"
+    )
+    doc = json.loads(result.stdout)
+    # b.txt differs in size, sub/d.txt is newer on the source, and z.txt is missing
+    assert [
+        (item["source_path"], item["destination_path"], item["recursive"])
+        for item in doc["DATA"]
+    ] == [
+        ("/src/b.txt", "/dst/b.txt", False),
+        ("/src/z.txt", "/dst/z.txt", False),
+        ("/src/sub/d.txt", "/dst/sub/d.txt", False),
+    ]
+    assert "filter_rules" not in doc
+    assert "3 of 5 files need to be transferred" in result.stderr
+
+
+def test_plan_sync_missing_destination(run_line, go_ep1_id, go_ep2_id):
+    load_response_set("cli.get_submission_id")
+    load_response_set("cli.transfer_activate_success")
+    _add_sync_listing(go_ep1_id, "/src/", [("a.txt", "file", 10, 1)])
+    responses.add(
+        responses.GET,
+        f"https://transfer.api.globus.org/v0.10/operation/endpoint/{go_ep2_id}/ls",
+        status=404,
+        json={"code": "ClientError.NotFound", "message": "Directory not found"},
+    )
+
+    result = run_line(
+        "globus transfer -F json --dry-run --plan-sync "
+        f"{go_ep1_id}:/src/ {go_ep2_id}:/dst/"
+    )
+    doc = json.loads(result.stdout)
+    assert [
+        (item["source_path"], item["destination_path"], item["recursive"])
+        for item in doc["DATA"]
+    ] == [("/src/", "/dst/", True)]
+
+
+def test_plan_sync_up_to_date(run_line, go_ep1_id, go_ep2_id):
+    load_response_set("cli.get_submission_id")
+    load_response_set("cli.transfer_activate_success")
+    _add_sync_listing(go_ep1_id, "/src/", [("a.txt", "file", 10, 1)])
+    _add_sync_listing(go_ep2_id, "/dst/", [("a.txt", "file", 10, 2)])
+
+    result = run_line(
+        f"globus transfer --plan-sync {go_ep1_id}:/src/ {go_ep2_id}:/dst/"
+    )
+    assert result.stdout == ""
+    assert "The destination is up to date" in result.stderr
+
+
+@pytest.mark.parametrize(
+    "sync_level, expect_names",
+    [
+        (None, ["a.txt", "c.txt"]),
+        ("exists", []),
+        ("size", ["c.txt"]),
+        ("mtime", ["a.txt"]),
+        ("checksum", ["a.txt", "b.txt", "c.txt"]),
+    ],
+)
+def test_plan_sync_uses_sync_level(
+    run_line, go_ep1_id, go_ep2_id, sync_level, expect_names
+):
+    load_response_set("cli.get_submission_id")
+    load_response_set("cli.transfer_activate_success")
+    # a.txt is newer on the source, and c.txt differs in size
+    _add_sync_listing(
+        go_ep1_id,
+        "/src/",
+        [("a.txt", "file", 10, 2), ("b.txt", "file", 10, 1), ("c.txt", "file", 11, 1)],
+    )
+    _add_sync_listing(
+        go_ep2_id,
+        "/dst/",
+        [("a.txt", "file", 10, 1), ("b.txt", "file", 10, 1), ("c.txt", "file", 10, 2)],
+    )
+
+    sync_level_opt = f"--sync-level {sync_level} " if sync_level else ""
+    result = run_line(
+        f"globus transfer -F json --dry-run --plan-sync {sync_level_opt}"
+        f"{go_ep1_id}:/src/ {go_ep2_id}:/dst/"
+    )
+    doc = json.loads(result.stdout)
+    assert [item["source_path"] for item in doc["DATA"]] == [
+        f"/src/{name}" for name in expect_names
+    ]
+
+
+def test_plan_sync_rejects_delete(run_line, go_ep1_id, go_ep2_id):
+    result = run_line(
+        f"globus transfer --plan-sync --delete {go_ep1_id}:/src/ {go_ep2_id}:/dst/",
+        assert_exit_code=2,
+    )
+    assert "--plan-sync cannot be used with" in result.stderr
+    assert "--delete" in result.stderr
+
+
+def test_coalesce_batch(run_line, go_ep1_id, go_ep2_id):
+    load_response_set("cli.get_submission_id")
+    load_response_set("cli.transfer_activate_success")
+    _add_sync_listing(go_ep1_id, "/src/a", [("x", "file", 1, 1), ("y", "file", 1, 1)])
+    _add_sync_listing(go_ep1_id, "/src/b", [("x", "file", 1, 1), ("z", "file", 1, 1)])
+
+    batch_input = "a/x a/x\na/y a/y\nb/x b/x\nb/y b/y\n"
+    result = run_line(
+        "globus transfer -F json --batch - --coalesce --dry-run "
+        f"{go_ep1_id}:/src/ {go_ep2_id}:/dst/",
+        stdin=batch_input,
+    )
+    assert [
+        (item["source_path"], item["destination_path"], item["recursive"])
+        for item in json.loads(result.stdout)["DATA"]
+    ] == [
+        ("/src/a", "/dst/a", True),
+        ("/src/b/x", "/dst/b/x", False),
+        ("/src/b/y", "/dst/b/y", False),
+    ]
+    assert "Coalesced 4 items into 3 (1 of 2 directories listed" in result.stderr
+
+    result = run_line(
+        f"globus transfer --coalesce {go_ep1_id}:/a {go_ep2_id}:/b",
+        assert_exit_code=2,
+    )
+    assert "--coalesce can only be used with --batch" in result.stderr
+
+
+def test_coalesce_batch_with_exclude(run_line, go_ep1_id, go_ep2_id):
+    # a batch of only files is accepted with --exclude once it coalesces into
+    # a recursive item
+    load_response_set("cli.get_submission_id")
+    load_response_set("cli.transfer_activate_success")
+    _add_sync_listing(go_ep1_id, "/src/a", [("x", "file", 1, 1), ("y", "file", 1, 1)])
+
+    result = run_line(
+        "globus transfer -F json --batch - --coalesce --exclude *.tmp --dry-run "
+        f"{go_ep1_id}:/src/ {go_ep2_id}:/dst/",
+        stdin="a/x a/x\na/y a/y\n",
+    )
+    data = json.loads(result.stdout)
+    assert [
+        (item["source_path"], item["destination_path"], item["recursive"])
+        for item in data["DATA"]
+    ] == [("/src/a", "/dst/a", True)]
+    assert data["filter_rules"] == [
+        {"DATA_TYPE": "filter_rule", "method": "exclude", "name": "*.tmp"}
+    ]
+
+
+def test_coalesce_rejects_delete(run_line, go_ep1_id, go_ep2_id):
+    result = run_line(
+        "globus transfer --batch - --coalesce --delete "
+        f"{go_ep1_id}:/src/ {go_ep2_id}:/dst/",
+        stdin="a/x a/x\n",
+        assert_exit_code=2,
+    )
+    assert "--coalesce cannot be used with --delete" in result.stderr
+    # nothing was listed or submitted
+    assert not responses.calls
+
+
+def test_batch_transfer_is_streamed(run_line, go_ep1_id, go_ep2_id):
+    load_response_set("cli.get_submission_id")
+    load_response_set("cli.transfer_activate_success")
+    responses.add(
+        responses.POST,
+        "https://transfer.api.globus.org/v0.10/transfer",
+        json={"code": "Accepted", "message": "ok", "task_id": "task-id"},
+    )
+
+    result = run_line(
+        f"globus transfer --batch - {go_ep1_id}:/s/ {go_ep2_id}:/d/",
+        stdin="a a\n-r b b\n",
+    )
+    assert "task-id" in result.output
+
+    request = responses.calls[-1].request
+    assert request.headers["Transfer-Encoding"] == "chunked"
+    doc = json.loads(b"".join(request.body))
+    assert [
+        (item["source_path"], item["destination_path"], item["recursive"])
+        for item in doc["DATA"]
+    ] == [("/s/a", "/d/a", False), ("/s/b", "/d/b", True)]
+    assert doc["source_endpoint"] == go_ep1_id
@@ -0,0 +1,164 @@
+import json
+import urllib.parse
+import uuid
+
+import responses
+
+from globus_cli.services.transfer import task_db
+
+TRANSFER_URL = "https://transfer.api.globus.org/v0.10"
+
+
+def _task(n, status="SUCCEEDED", label=None):
+    return {
+        "DATA_TYPE": "task",
+        "task_id": str(uuid.UUID(int=n)),
+        "type": "TRANSFER",
+        "status": status,
+        "label": label,
+        "source_endpoint_id": "ep1",
+        "source_endpoint_display_name": "Endpoint 1",
+        "destination_endpoint_id": "ep2",
+        "destination_endpoint_display_name": "Endpoint 2",
+        "request_time": f"2021-09-02T18:{n:02d}:00+00:00",
+        "completion_time": (
+            f"2021-09-02T19:{n:02d}:00+00:00" if status == "SUCCEEDED" else None
+        ),
+    }
+
+
+def _register_task_list(tasks):
+    """
+    Serve task_list from the task documents in ``tasks``, with the task_id and
+    request_time filters, newest first
+    """
+
+    def callback(request):
+        query = urllib.parse.parse_qs(urllib.parse.urlparse(request.url).query)
+        clauses = dict(clause.split(":", 1) for clause in query["filter"][0].split("/"))
+        found = sorted(tasks, key=lambda t: t["request_time"], reverse=True)
+        if "task_id" in clauses:
+            task_ids = clauses["task_id"].split(",")
+            found = [t for t in found if t["task_id"] in task_ids]
+        if "request_time" in clauses:
+            after, before = clauses["request_time"].split(",")
+            found = [
+                t
+                for t in found
+                if (not after or task_db._normalize_time(t["request_time"]) >= after)
+                and (not before or task_db._normalize_time(t["request_time"]) <= before)
+            ]
+        offset = int(query.get("offset", ["0"])[0])
+        limit = int(query.get("limit", ["10"])[0])
+        doc = {
+            "DATA": found[offset : offset + limit],
+            "offset": offset,
+            "limit": limit,
+            "total": len(found),
+        }
+        return (200, {}, json.dumps(doc))
+
+    responses.add_callback(
+        responses.GET,
+        f"{TRANSFER_URL}/task_list",
+        callback=callback,
+        match_querystring=None,
+    )
+
+
+def _task_list_filters():
+    queries = [
+        urllib.parse.parse_qs(urllib.parse.urlparse(call.request.url).query)
+        for call in responses.calls
+        if "/task_list" in call.request.url
+    ]
+    return [query["filter"][0] for query in queries]
+
+
+def test_sync_is_incremental(run_line):
+    tasks = [_task(1), _task(2, status="ACTIVE"), _task(3)]
+    _register_task_list(tasks)
+    result = run_line("globus task sync -F json")
+    assert json.loads(result.output) == {
+        "new": 3,
+        "refreshed": 0,
+        "last_request_time": "2021-09-02 18:03:00",
+    }
+
+    # the active task has completed, and a new task was submitted
+    tasks[1] = _task(2)
+    tasks.append(_task(4, status="ACTIVE"))
+    responses.calls.reset()
+    result = run_line("globus task sync -F json")
+    assert json.loads(result.output) == {
+        "new": 1,
+        "refreshed": 1,
+        "last_request_time": "2021-09-02 18:04:00",
+    }
+    # only the incomplete task and the tasks since the last sync were fetched
+    assert _task_list_filters() == [
+        f"task_id:{_task(2)['task_id']}",
+        "type:TRANSFER,DELETE/request_time:2021-09-02 18:03:00,",
+    ]
+
+    result = run_line("globus task list --local -F json --filter-status SUCCEEDED")
+    assert [t["task_id"] for t in json.loads(result.output)["DATA"]] == [
+        _task(n)["task_id"] for n in (3, 2, 1)
+    ]
+
+
+def test_sync_pages_past_the_result_limit(run_line, monkeypatch):
+    monkeypatch.setattr(task_db, "TASK_LIST_PAGE_SIZE", 2)
+    monkeypatch.setattr(task_db, "TASK_LIST_MAX_RESULTS", 4)
+    _register_task_list([_task(n) for n in range(1, 11)])
+
+    result = run_line("globus task sync -F json")
+    assert json.loads(result.output)["new"] == 10
+    # each window ends at the oldest task of the one before
+    assert [f for f in _task_list_filters() if "request_time" in f] == [
+        "type:TRANSFER,DELETE/request_time:,2021-09-02 18:07:00",
+        "type:TRANSFER,DELETE/request_time:,2021-09-02 18:07:00",
+        "type:TRANSFER,DELETE/request_time:,2021-09-02 18:04:00",
+        "type:TRANSFER,DELETE/request_time:,2021-09-02 18:04:00",
+    ]
+    result = run_line("globus task list --local --limit 0 -F json")
+    assert len(json.loads(result.output)["DATA"]) == 10
+
+
+def test_list_local_filters(run_line):
+    _register_task_list(
+        [
+            _task(1, label="nightly backup"),
+            _task(2, label="Nightly Archive"),
+            _task(3, status="FAILED", label="adhoc"),
+            _task(4, status="ACTIVE"),
+        ]
+    )
+    run_line("globus task sync")
+    responses.calls.reset()
+
+    def local_task_ids(args):
+        result = run_line(f"globus task list --local -F json {args}")
+        return [int(uuid.UUID(t["task_id"])) for t in json.loads(result.output)["DATA"]]
+
+    assert local_task_ids("") == [4, 3, 2, 1]
+    assert local_task_ids("--limit 2") == [4, 3]
+    assert local_task_ids("--filter-label 'nightly*'") == [2, 1]
+    assert local_task_ids("--filter-label 'nightly*' --exact") == []
+    assert local_task_ids("--filter-not-label 'nightly*'") == [4, 3]
+    assert local_task_ids("--filter-status FAILED --filter-status ACTIVE") == [4, 3]
+    assert local_task_ids(
+        "--filter-requested-after '2021-09-02 18:02:00' "
+        "--filter-completed-before '2021-09-02 19:02:00'"
+    ) == [2]
+    assert local_task_ids(f"--filter-task-id {uuid.UUID(int=3)}") == [3]
+    # no calls were made to the Transfer service
+    assert len(responses.calls) == 0
+
+    result = run_line("globus task list --local")
+    assert "Nightly Archive" in result.output
+
+
+def test_list_local_without_sync(run_line):
+    result = run_line("globus task list --local", assert_exit_code=2)
+    assert "Run 'globus task sync' first" in result.stderr
@@ -0,0 +1,176 @@
+import json
+import urllib.parse
+import uuid
+
+import pytest
+import responses
+
+TASK_LIST_URL = "https://transfer.api.globus.org/v0.10/task_list"
+
+
+def _task_ids(n):
+    return [str(uuid.UUID(int=i + 1)) for i in range(n)]
+
+
+def _register_task_list(statuses_by_poll):
+    """
+    Serve task_list with the statuses of each poll, given as a list of dicts from
+    task ID to status (tasks missing from a dict are not found)
+    """
+    state = {"poll": 0, "calls": []}
+
+    def callback(request):
+        query = urllib.parse.parse_qs(urllib.parse.urlparse(request.url).query)
+        filter_ = query["filter"][0]
+        assert filter_.startswith("task_id:")
+        requested = filter_[len("task_id:") :].split(",")
+        assert int(query["limit"][0]) == len(requested)
+        state["calls"].append(requested)
+
+        statuses = statuses_by_poll[min(state["poll"], len(statuses_by_poll) - 1)]
+        data = [
+            {
+                "DATA_TYPE": "task",
+                "task_id": task_id,
+                "status": statuses[task_id],
+                "label": f"label {task_id[-1]}",
+            }
+            for task_id in requested
+            if task_id in statuses
+        ]
+        # the last batch of a poll moves on to the next set of statuses
+        if requested[-1] == list(statuses_by_poll[0])[-1]:
+            state["poll"] += 1
+        return (200, {}, json.dumps({"DATA": data, "DATA_TYPE": "task_list"}))
+
+    responses.add_callback(
+        responses.GET, TASK_LIST_URL, callback=callback, match_querystring=None
+    )
+    return state
+
+
+def test_wait_on_many_tasks(run_line):
+    t1, t2, t3 = _task_ids(3)
+    state = _register_task_list(
+        [
+            {t1: "SUCCEEDED", t2: "ACTIVE", t3: "ACTIVE"},
+            {t2: "FAILED", t3: "SUCCEEDED"},
+        ]
+    )
+    result = run_line(f"globus task wait -F json {t1} {t2} {t3}", assert_exit_code=1)
+    assert [task["task_id"] for task in json.loads(result.stdout)["DATA"]] == [
+        t1,
+        t2,
+        t3,
+    ]
+    assert f"Task {t1} SUCCEEDED (1 of 3 done)" in result.stderr
+    assert f"Task {t2} FAILED (2 of 3 done)" in result.stderr
+    # one call per poll, and completed tasks are not checked again
+    assert state["calls"] == [[t1, t2, t3], [t2, t3]]
+
+
+def test_wait_on_many_tasks_success(run_line):
+    t1, t2 = _task_ids(2)
+    _register_task_list([{t1: "ACTIVE", t2: "SUCCEEDED"}, {t1: "SUCCEEDED"}])
+    result = run_line(f"globus task wait {t1} {t2.upper()}")
+    assert result.stdout.splitlines()[2:] == [
+        f"{t2} | SUCCEEDED | label 2",
+        f"{t1} | SUCCEEDED | label 1",
+    ]
+
+
+def test_wait_from_file_batches_calls(run_line, tmp_path):
+    task_ids = _task_ids(120)
+    statuses = {task_id: "SUCCEEDED" for task_id in task_ids[1:]}
+    state = _register_task_list([statuses])
+    task_file = tmp_path / "tasks"
+    task_file.write_text("# tasks\n\n" + "\n".join(task_ids) + "\n")
+
+    result = run_line(
+        ["globus", "task", "wait", "-F", "ndjson", "--from-file", str(task_file)],
+        assert_exit_code=1,
+    )
+    assert [len(call) for call in state["calls"]] == [50, 50, 20]
+    assert len(result.stdout.splitlines()) == 119
+    assert f"Task {task_ids[0]} was not found" in result.stderr
+
+
+def test_wait_on_many_tasks_timeout(run_line):
+    t1, t2 = _task_ids(2)
+    _register_task_list([{t1: "SUCCEEDED", t2: "ACTIVE"}])
+    result = run_line(
+        f"globus task wait --timeout 3 --timeout-exit-code 50 -H {t1} {t2}",
+        assert_exit_code=50,
+    )
+    assert "1 of 2 tasks have yet to complete after 3 seconds" in result.stderr
+    assert "..." in result.stderr
+
+
+def test_wait_on_many_tasks_meow(run_line):
+    t1, t2 = _task_ids(2)
+    _register_task_list([{t1: "ACTIVE", t2: "SUCCEEDED"}, {t1: "SUCCEEDED"}])
+    result = run_line(f"globus task wait --meow {t1} {t2}")
+    assert "-.  ;-;;,_" in result.stderr
+    assert "( a a )" in result.stderr
+
+
+def test_wait_on_many_tasks_meow_timeout(run_line):
+    # the tasks do not wake up if some of them are still running
+    t1, t2 = _task_ids(2)
+    _register_task_list([{t1: "SUCCEEDED", t2: "ACTIVE"}])
+    result = run_line(
+        f"globus task wait --meow --timeout 3 {t1} {t2}", assert_exit_code=1
+    )
+    assert "-.  ;-;;,_" in result.stderr
+    assert "( a a )" not in result.stderr
+
+
+def test_wait_requires_task_ids(run_line):
+    result = run_line("globus task wait", assert_exit_code=2)
+    assert "give at least one TASK_ID, or use --from-file" in result.stderr
+
+
+def _register_get_task(task_id, statuses):
+    for status in statuses:
+        responses.add(
+            responses.GET,
+            f"https://transfer.api.globus.org/v0.10/task/{task_id}",
+            json={"DATA_TYPE": "task", "task_id": task_id, "status": status},
+        )
+
+
+def _get_task_calls():
+    return [c for c in responses.calls if "/task/" in c.request.url]
+
+
+def test_wait_reuses_final_task_document(run_line, mocksleep):
+    (task_id,) = _task_ids(1)
+    _register_get_task(task_id, ["ACTIVE", "ACTIVE", "ACTIVE", "SUCCEEDED"])
+
+    result = run_line(f"globus task wait -v -F json --polling-interval 10 {task_id}")
+    assert json.loads(result.stdout)["status"] == "SUCCEEDED"
+    # no fetch after the task is seen to complete
+    assert len(_get_task_calls()) == 4
+    assert "Made 4 API calls" in result.stderr
+
+    # polls start fast and back off
+    delays = [c.args[0] for c in mocksleep.call_args_list]
+    assert len(delays) == 3
+    for delay, base in zip(delays, [1, 2, 4]):
+        assert 0.9 * base <= delay <= base
+
+
+def test_wait_timeout_reuses_last_poll(run_line, mocksleep):
+    (task_id,) = _task_ids(1)
+    _register_get_task(task_id, ["ACTIVE"])
+
+    result = run_line(
+        f"globus task wait -F json --timeout 5 --polling-interval 30 {task_id}",
+        assert_exit_code=1,
+    )
+    assert "Task has yet to complete after 5 seconds" in result.stderr
+    assert json.loads(result.stdout)["status"] == "ACTIVE"
+    # the waits add up to exactly the timeout, with one poll after each
+    delays = [c.args[0] for c in mocksleep.call_args_list]
+    assert sum(delays) == pytest.approx(5)
+    assert len(_get_task_calls()) == len(delays) + 1
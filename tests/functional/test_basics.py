@@ -1,3 +1,5 @@
+import gzip
+import json
 import os
 
 import pytest
@@ -189,6 +191,118 @@ def test_transfer_batch_file_dryrun(run_line, go_ep1_id, go_ep2_id, tmp_path):
         assert f'"destination_path": "{dst}"' in result.output
 
 
+def test_transfer_batch_gzip_file_dryrun(run_line, go_ep1_id, go_ep2_id, tmp_path):
+    load_response_set("cli.get_submission_id")
+    load_response_set("cli.transfer_activate_success")
+    temp = tmp_path / "batch.gz"
+    temp.write_bytes(gzip.compress(b"abc /def\n/xyz p/q/r\n"))
+    result = run_line(
+        [
+            "globus",
+            "transfer",
+            "-F",
+            "json",
+            "--batch",
+            temp,
+            "--dry-run",
+            go_ep1_id,
+            go_ep2_id,
+        ]
+    )
+    for src, dst in [("abc", "/def"), ("/xyz", "p/q/r")]:
+        assert f'"source_path": "{src}"' in result.output
+        assert f'"destination_path": "{dst}"' in result.output
+
+
+def test_transfer_batch_options_and_errors(run_line, go_ep1_id, go_ep2_id):
+    load_response_set("cli.get_submission_id")
+    load_response_set("cli.transfer_activate_success")
+
+    batch_input = "-r abc /def\n--external-checksum=x 'p q' r  # comment\n"
+    result = run_line(
+        f"globus transfer -F json --batch - --dry-run {go_ep1_id}:/s {go_ep2_id}",
+        stdin=batch_input,
+    )
+    assert '"source_path": "/s/abc"' in result.output
+    assert '"source_path": "/s/p q"' in result.output
+    assert '"external_checksum": "x"' in result.output
+    assert '"recursive": true' in result.output
+
+    # errors on a bad line are reported as they always have been
+    result = run_line(
+        f"globus transfer --batch - --dry-run {go_ep1_id} {go_ep2_id}",
+        stdin="abc /def\n--recursive --external-checksum x abc /def\n",
+        assert_exit_code=2,
+    )
+    assert (
+        "Error: --recursive and --external-checksum are mutually exclusive"
+        in result.stderr
+    )
+    result = run_line(
+        f"globus transfer --batch - --dry-run {go_ep1_id} {go_ep2_id}",
+        stdin="abc\n",
+        assert_exit_code=2,
+    )
+    assert "Error: Missing argument 'DEST_PATH'." in result.stderr
+
+
+def test_transfer_batch_ndjson_dryrun(run_line, go_ep1_id, go_ep2_id):
+    load_response_set("cli.get_submission_id")
+    load_response_set("cli.transfer_activate_success")
+
+    batch_input = (
+        '{"source_path": "a \'b", "destination_path": "/def"}\n'
+        '{"source_path": "dir", "destination_path": "dir", "recursive": true}\n'
+    )
+    result = run_line(
+        "globus transfer -F json --batch - --batch-format ndjson --dry-run "
+        f"{go_ep1_id}:/s/ {go_ep2_id}",
+        stdin=batch_input,
+    )
+    items = json.loads(result.output)["DATA"]
+    assert [
+        (item["source_path"], item["destination_path"], item["recursive"])
+        for item in items
+    ] == [("/s/a 'b", "/def", False), ("/s/dir", "dir", True)]
+
+    result = run_line(
+        "globus transfer --batch - --batch-format ndjson --dry-run "
+        f"{go_ep1_id} {go_ep2_id}",
+        stdin='{"source_path": "a"}\n',
+        assert_exit_code=2,
+    )
+    assert (
+        "invalid --batch input on line 1: 'destination_path' must be a string"
+        in result.stderr
+    )
+
+
+def test_delete_batch_ndjson_dryrun(run_line, go_ep1_id):
+    load_response_set("cli.get_submission_id")
+    load_response_set("cli.transfer_activate_success")
+
+    result = run_line(
+        f"globus delete -F json --batch - --batch-format ndjson --dry-run {go_ep1_id}",
+        stdin='{"path": "abc/def"}\n{"path": "/x y/../z"}\n',
+    )
+    assert [item["path"] for item in json.loads(result.output)["DATA"]] == [
+        "abc/def",
+        "/z",
+    ]
+
+
+@pytest.mark.parametrize(
+    "cmd",
+    ["transfer {ep1}:/a {ep2}:/b", "delete {ep1}:/a"],
+)
+def test_batch_format_requires_batch(run_line, go_ep1_id, go_ep2_id, cmd):
+    result = run_line(
+        f"globus {cmd.format(ep1=go_ep1_id, ep2=go_ep2_id)} --batch-format ndjson",
+        assert_exit_code=2,
+    )
+    assert "--batch-format can only be used with --batch" in result.stderr
+
+
 def test_delete_batchmode_dryrun(run_line, go_ep1_id):
     """
     Dry-runs a delete in batchmode
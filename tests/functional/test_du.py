@@ -0,0 +1,40 @@
+import json
+
+from globus_sdk._testing import load_response_set
+
+
+def test_du(run_line, go_ep1_id):
+    load_response_set("cli.transfer_activate_success")
+    load_response_set("cli.ls_results")
+    result = run_line(f"globus du --max-depth 2 {go_ep1_id}:/share")
+    # every directory is totalled once its contents have been seen, and the
+    # grand total comes last
+    assert result.output.splitlines() == ["14\t3\tgodata", "14\t3\t."]
+    assert result.stderr == ""
+
+
+def test_du_depth_limit(run_line, go_ep1_id):
+    load_response_set("cli.transfer_activate_success")
+    load_response_set("cli.ls_results")
+    result = run_line(f"globus du --recursive-depth-limit 1 {go_ep1_id}:/")
+    # the empty "mnt" directory is shown, even though it produced no items
+    assert result.output.splitlines() == [
+        "0\t0\thome",
+        "0\t0\tmnt",
+        "0\t0\tnot shareable",
+        "0\t0\tshare",
+        "0\t0\t.",
+    ]
+    assert "3 directories were below the --recursive-depth-limit" in result.stderr
+
+
+def test_du_ndjson(run_line, go_ep1_id):
+    load_response_set("cli.transfer_activate_success")
+    load_response_set("cli.ls_results")
+    result = run_line(f"globus du -d 0 -F ndjson {go_ep1_id}:/share")
+    assert json.loads(result.output) == {
+        "path": ".",
+        "size": 14,
+        "file_count": 3,
+        "dir_count": 1,
+    }
@@ -1,3 +1,8 @@
+import json
+import os
+
+import pytest
+import responses
 from globus_sdk._testing import load_response_set
 
 
@@ -56,3 +61,219 @@ def test_recursive_json(run_line, go_ep1_id):
     result = run_line(f"globus ls -r -F json {go_ep1_id}:/share")
     assert '"DATA":' in result.output
     assert '"name": "godata/file1.txt"' in result.output
+
+
+def test_recursive_ndjson(run_line, go_ep1_id):
+    """
+    Confirms -F ndjson prints one compact object per item of a recursive ls
+    """
+    load_response_set("cli.transfer_activate_success")
+    load_response_set("cli.ls_results")
+    result = run_line(f"globus ls -r -F ndjson {go_ep1_id}:/share")
+    lines = result.output.splitlines()
+    items = [json.loads(line) for line in lines]
+    assert "godata/file1.txt" in [item["name"] for item in items]
+    assert all(": " not in line for line in lines)
+
+
+def test_ndjson_jmespath(run_line, go_ep1_id):
+    load_response_set("cli.transfer_activate_success")
+    load_response_set("cli.ls_results")
+    result = run_line(f"globus ls -F ndjson --jmespath name {go_ep1_id}:/")
+    assert result.output.splitlines() == [
+        '"home"',
+        '"mnt"',
+        '"not shareable"',
+        '"share"',
+    ]
+
+
+@pytest.mark.parametrize("parallel", [2, 4, 16])
+def test_recursive_parallel_matches_serial(run_line, go_ep1_id, parallel):
+    """
+    Confirms that a --parallel recursive ls produces exactly the same output, in the
+    same order, as a serial one
+    """
+    load_response_set("cli.transfer_activate_success")
+    load_response_set("cli.ls_results")
+    serial = run_line(f"globus ls -r --recursive-depth-limit 1 {go_ep1_id}:/")
+    result = run_line(
+        f"globus ls -r --recursive-depth-limit 1 --parallel {parallel} {go_ep1_id}:/"
+    )
+    assert "not shareable/godata/" in result.output
+    assert result.output == serial.output
+
+
+def _add_empty_listing(ep_id, path, listed_path):
+    responses.add(
+        responses.GET,
+        f"https://transfer.api.globus.org/v0.10/operation/endpoint/{ep_id}/ls",
+        match=[
+            responses.matchers.query_param_matcher({"path": path, "show_hidden": "0"})
+        ],
+        json={"DATA": [], "DATA_TYPE": "file_list", "path": listed_path},
+    )
+
+
+def _add_filtered_listing(ep_id, path, filter_val, items):
+    responses.add(
+        responses.GET,
+        f"https://transfer.api.globus.org/v0.10/operation/endpoint/{ep_id}/ls",
+        match=[
+            responses.matchers.query_param_matcher(
+                {"path": path, "show_hidden": "0", "filter": filter_val}
+            )
+        ],
+        json={
+            "DATA": [{"name": name, "type": type_} for name, type_ in items],
+            "DATA_TYPE": "file_list",
+            "path": path.rstrip("/") + "/",
+        },
+    )
+
+
+def test_recursive_filter_search_mode(run_line, go_ep1_id):
+    """
+    In search mode, every directory is walked with a "type:dir" listing, and the
+    filter only selects the items shown
+    """
+    load_response_set("cli.transfer_activate_success")
+    for path, dirs, matches in [
+        ("/", [("data", "dir")], [("a.h5", "file")]),
+        ("/data", [("raw", "dir")], []),
+        ("/data/raw", [], [("b.h5", "file"), ("c.h5", "dir")]),
+    ]:
+        _add_filtered_listing(go_ep1_id, path, "type:dir", dirs)
+        _add_filtered_listing(go_ep1_id, path, "name:~*.h5", matches)
+
+    result = run_line(
+        f"globus ls -r --recursive-filter-mode search --filter '~*.h5' "
+        f"{go_ep1_id}:/"
+    )
+    assert result.output.splitlines() == ["a.h5", "data/raw/b.h5", "data/raw/c.h5/"]
+
+
+def test_recursive_checkpoint_resume(run_line, go_ep1_id, tmp_path):
+    """
+    Interrupt a --recursive ls with a network error, then confirm that rerunning it
+    with the same --checkpoint file finishes the listing without repeating the
+    directories which were already shown
+    """
+    load_response_set("cli.transfer_activate_success")
+    load_response_set("cli.ls_results")
+    checkpoint = tmp_path / "ls.checkpoint"
+    line = (
+        f"globus ls -r --recursive-depth-limit 2 --checkpoint {checkpoint} "
+        f"{go_ep1_id}:/"
+    )
+
+    # "/home/foouser" is not in the fixture data, so the listing fails there
+    result = run_line(line, assert_exit_code=1)
+    assert result.output.splitlines() == [
+        "home/",
+        "mnt/",
+        "not shareable/",
+        "share/",
+        "home/foouser/",
+    ]
+    header, *queue = [json.loads(line) for line in checkpoint.read_text().splitlines()]
+    assert header["version"] == 3
+    # the directories which were shown are no longer queued
+    assert [rel_path for _, rel_path, _ in queue] == [
+        "share",
+        "not shareable",
+        "mnt",
+        "home/foouser",
+    ]
+
+    _add_empty_listing(go_ep1_id, "/home/foouser", "/home/foouser/")
+    _add_empty_listing(go_ep1_id, "/not shareable/godata", "/not shareable/godata/")
+    result = run_line(line)
+    assert result.output.splitlines() == [
+        "not shareable/godata/",
+        "share/godata/",
+        "share/godata/file1.txt",
+        "share/godata/file2.txt",
+        "share/godata/file3.txt",
+    ]
+    # listings which were completed the first time were not repeated
+    ls_calls = [c for c in responses.calls if "/ls" in c.request.url]
+    assert len([c for c in ls_calls if "path=%2Fhome&" in c.request.url]) == 1
+    # and the checkpoint is removed once the listing completes
+    assert not checkpoint.exists()
+
+
+@pytest.mark.parametrize("extra_args", ["", "-r --long", "-r -Fjson"])
+def test_checkpoint_usage_errors(run_line, go_ep1_id, tmp_path, extra_args):
+    result = run_line(
+        f"globus ls {extra_args} --checkpoint {tmp_path / 'x'} {go_ep1_id}:/",
+        assert_exit_code=2,
+    )
+    assert "--checkpoint can only be used with" in result.stderr
+
+
+def test_checkpoint_for_different_listing(run_line, go_ep1_id, tmp_path):
+    load_response_set("cli.transfer_activate_success")
+    load_response_set("cli.ls_results")
+    checkpoint = tmp_path / "ls.checkpoint"
+    checkpoint.write_text(json.dumps({"version": 2, "identity": {}, "queue": []}))
+    result = run_line(
+        f"globus ls -r --checkpoint {checkpoint} {go_ep1_id}:/", assert_exit_code=2
+    )
+    assert "is a checkpoint for a different listing" in result.stderr
+
+
+def _ls_call_count():
+    return len(
+        [
+            call
+            for call in responses.calls
+            if call.request.url.split("?")[0].endswith("/ls")
+        ]
+    )
+
+
+def test_cache_reuses_listings(run_line, go_ep1_id):
+    load_response_set("cli.transfer_activate_success")
+    load_response_set("cli.ls_results")
+    first = run_line(f"globus ls -r --cache-ttl 60 {go_ep1_id}:/share")
+    calls = _ls_call_count()
+    assert calls > 0
+
+    # the cache answers every listing of a repeated command
+    second = run_line(f"globus ls -r --cache-ttl 60 {go_ep1_id}:/share")
+    assert second.output == first.output
+    assert _ls_call_count() == calls
+
+    # but not a listing of another path
+    run_line(f"globus ls --cache-ttl 60 {go_ep1_id}:/home")
+    assert _ls_call_count() == calls + 1
+
+
+@pytest.mark.parametrize("flag", ["--no-cache", "--refresh"])
+def test_cache_overrides(run_line, go_ep1_id, flag):
+    load_response_set("cli.transfer_activate_success")
+    load_response_set("cli.ls_results")
+    run_line(f"globus ls --cache-ttl 60 {go_ep1_id}:/share")
+    run_line(f"globus ls --cache-ttl 60 {flag} {go_ep1_id}:/share")
+    assert _ls_call_count() == 2
+
+
+def test_cache_is_opt_in(run_line, go_ep1_id, ls_cache_file):
+    load_response_set("cli.transfer_activate_success")
+    load_response_set("cli.ls_results")
+    run_line(f"globus ls {go_ep1_id}:/share")
+    run_line(f"globus ls {go_ep1_id}:/share")
+    assert _ls_call_count() == 2
+    assert not os.path.exists(ls_cache_file)
+
+
+def test_cache_invalidated_by_rename(run_line, go_ep1_id, monkeypatch):
+    load_response_set("cli.transfer_activate_success")
+    load_response_set("cli.ls_results")
+    load_response_set("cli.rename_result")
+    monkeypatch.setenv("GLOBUS_CLI_LS_CACHE_TTL", "60")
+    run_line(f"globus ls {go_ep1_id}:/share")
+    run_line(f"globus rename {go_ep1_id} /share/godata /share/newdata")
+    run_line(f"globus ls {go_ep1_id}:/share")
+    assert _ls_call_count() == 2
@@ -0,0 +1,47 @@
+import time
+
+from globus_cli.services.transfer import ActivationCache
+
+
+def test_activation_cache(tmp_path, monkeypatch):
+    filename = str(tmp_path / "cache.json")
+    cache = ActivationCache(filename, namespace="user", ttl=300)
+    other = ActivationCache(filename, namespace="client", ttl=300)
+
+    assert not cache.get("ep1")
+    cache.put("ep1", 3600)
+    cache.put("ep2", -1)
+    assert cache.get("ep1", if_expires_in=60)
+    assert not cache.get("ep1", if_expires_in=3600)
+    assert cache.get("ep2", if_expires_in=10**9)
+    # results are kept apart by login
+    assert not other.get("ep1")
+
+    # results are only used for the length of the ttl
+    now = time.time()
+    monkeypatch.setattr(time, "time", lambda: now + 301)
+    assert not cache.get("ep1")
+    assert not cache.get("ep2")
+
+
+def test_activation_cache_invalidate(tmp_path):
+    filename = str(tmp_path / "cache.json")
+    cache = ActivationCache(filename, namespace="user")
+    other = ActivationCache(filename, namespace="client")
+    cache.put("ep1", 3600)
+    cache.put("ep2", 3600)
+    other.put("ep1", 3600)
+
+    cache.invalidate("ep1")
+    assert not cache.get("ep1")
+    assert not other.get("ep1")
+    assert cache.get("ep2")
+
+
+def test_activation_cache_ignores_bad_file(tmp_path):
+    filename = tmp_path / "cache.json"
+    filename.write_text("not json")
+    cache = ActivationCache(str(filename))
+    assert not cache.get("ep1")
+    cache.put("ep1", 3600)
+    assert cache.get("ep1")
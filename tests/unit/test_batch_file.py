@@ -0,0 +1,60 @@
+import gzip
+import sys
+
+import click
+import pytest
+
+from globus_cli.parsing import BatchFile
+
+
+@click.command()
+@click.option("--batch", type=BatchFile())
+def read_batch(batch):
+    for line in batch:
+        click.echo(f"<{line.rstrip()}>")
+
+
+BATCH_TEXT = "abc /def\n# comment\n'x y' z\n"
+EXPECTED_OUTPUT = "<abc /def>\n<# comment>\n<'x y' z>\n"
+
+
+def test_batch_file_plain(run_command, tmp_path):
+    path = tmp_path / "batch.txt"
+    path.write_text(BATCH_TEXT)
+    result = run_command(read_batch, ["--batch", str(path)])
+    assert result.output == EXPECTED_OUTPUT
+
+
+def test_batch_file_gzip(run_command, tmp_path):
+    # compression is detected from the content, not the filename
+    path = tmp_path / "batch.txt"
+    path.write_bytes(gzip.compress(BATCH_TEXT.encode()))
+    result = run_command(read_batch, ["--batch", str(path)])
+    assert result.output == EXPECTED_OUTPUT
+
+
+def test_batch_file_gzip_stdin(runner):
+    result = runner.invoke(
+        read_batch, ["--batch", "-"], input=gzip.compress(BATCH_TEXT.encode())
+    )
+    assert result.exit_code == 0
+    assert result.output == EXPECTED_OUTPUT
+
+
+def test_batch_file_zstd(run_command, tmp_path):
+    zstandard = pytest.importorskip("zstandard")
+    path = tmp_path / "batch.zst"
+    path.write_bytes(zstandard.ZstdCompressor().compress(BATCH_TEXT.encode()))
+    result = run_command(read_batch, ["--batch", str(path)])
+    assert result.output == EXPECTED_OUTPUT
+
+
+def test_batch_file_zstd_not_installed(runner, tmp_path, monkeypatch):
+    # a None entry in sys.modules makes the import fail
+    monkeypatch.setitem(sys.modules, "zstandard", None)
+    path = tmp_path / "batch.zst"
+    path.write_bytes(b"\x28\xb5\x2f\xfd" + b"\x00" * 16)
+    result = runner.invoke(read_batch, ["--batch", str(path)])
+    assert result.exit_code == 2
+    assert "requires the 'zstandard' package" in result.output
+    assert "pip install 'globus-cli[zstd]'" in result.output
@@ -0,0 +1,203 @@
+import io
+import shlex
+
+import click
+import pytest
+
+from globus_cli.parsing import (
+    BatchLineParser,
+    NDJSONBatchParser,
+    TaskPath,
+    mutex_option_group,
+)
+from globus_cli.parsing.batch_line import fast_split
+from globus_cli.utils import shlex_process_stream
+
+
+def _make_parsers(items):
+    def add_batch_item(source_path, dest_path, recursive, external_checksum):
+        items.append((source_path, dest_path, recursive, external_checksum))
+
+    @click.command()
+    @click.option("--external-checksum")
+    @click.option("--recursive", "-r", is_flag=True)
+    @click.argument("source_path", type=TaskPath(base_dir="/src/"))
+    @click.argument("dest_path", type=TaskPath(base_dir="/dst/"))
+    @mutex_option_group("--recursive", "--external-checksum")
+    def process_batch_line(dest_path, source_path, recursive, external_checksum):
+        add_batch_item(str(source_path), str(dest_path), recursive, external_checksum)
+
+    fast_parser = BatchLineParser(
+        add_batch_item,
+        arguments=[("source_path", "/src/"), ("dest_path", "/dst/")],
+        flags={"--recursive": "recursive", "-r": "recursive"},
+        options={"--external-checksum": "external_checksum"},
+        mutually_exclusive=("recursive", "external_checksum"),
+    )
+    return process_batch_line, fast_parser
+
+
+def _run(line, use_fast_parser, capsys):
+    items = []
+    process_batch_line, fast_parser = _make_parsers(items)
+    exit_code = 0
+    try:
+        shlex_process_stream(
+            process_batch_line,
+            io.StringIO(line + "\n"),
+            fast_parser if use_fast_parser else None,
+        )
+    except SystemExit as e:
+        exit_code = e.code
+    captured = capsys.readouterr()
+    return items, exit_code, captured.out, captured.err
+
+
+@pytest.mark.parametrize(
+    "line",
+    [
+        "a b",
+        "a/./b ../c/",
+        "/abs/path ~/home",
+        "--recursive a b",
+        "-r a b",
+        "a b --recursive",
+        "--external-checksum abc a b",
+        "--external-checksum=abc a b",
+        "--external-checksum= a b",
+        "--external-checksum x --external-checksum y a b",
+        "'a b' \"c d\"",
+        "a b  # a comment",
+        "# only a comment",
+        "",
+        "   ",
+        "- b",
+        "-- -a b",
+        "-rr a b",
+        "a\\ b c",
+        "a b c",
+        # bad lines
+        "a",
+        "a b c",
+        "--recursive --external-checksum x a b",
+        "--external-checksum",
+        "--external-checksum -r a b",
+        "--bogus a b",
+        "--recur a b",
+        "--recursive=1 a b",
+        "-x a b",
+        "-- a b -r",
+        "--= a b",
+    ],
+)
+def test_fast_parser_matches_click(line, capsys):
+    assert _run(line, True, capsys) == _run(line, False, capsys)
+
+
+@pytest.mark.parametrize(
+    "line",
+    [
+        "a b",
+        "a\tb\r",
+        "--recursive a/ b/",
+        "-r a b",
+        "--external-checksum abc a b",
+        "--external-checksum=abc a b",
+        "",
+    ],
+)
+def test_fast_parser_handles_common_lines(line):
+    items = []
+    _, fast_parser = _make_parsers(items)
+    assert fast_parser.process_line(line + "\n")
+
+
+@pytest.mark.parametrize(
+    "line", ["a", "a b c", "--recursive --external-checksum x a b", "--bogus a b"]
+)
+def test_fast_parser_leaves_bad_lines_to_click(line):
+    items = []
+    _, fast_parser = _make_parsers(items)
+    assert not fast_parser.process_line(line + "\n")
+    assert items == []
+
+
+@pytest.mark.parametrize(
+    "line", ["a b", " a\tb \r\n", "--opt=x a/b", "a b c", "a\x0bb c"]
+)
+def test_fast_split_matches_shlex(line):
+    assert fast_split(line) == shlex.split(line, comments=True)
+
+
+@pytest.mark.parametrize("line", ["'a b' c", 'a "b"', "a\\ b c", "a b # comment"])
+def test_fast_split_defers_to_shlex(line):
+    assert fast_split(line) is None
+
+
+def _make_ndjson_parser(items):
+    def add_batch_item(source_path, destination_path, recursive, external_checksum):
+        items.append((source_path, destination_path, recursive, external_checksum))
+
+    return NDJSONBatchParser(
+        add_batch_item,
+        arguments=[("source_path", "/src/"), ("destination_path", None)],
+        flags=("recursive",),
+        options=("external_checksum",),
+        mutually_exclusive=("recursive", "external_checksum"),
+    )
+
+
+def test_ndjson_parser():
+    items = []
+    _make_ndjson_parser(items).process_stream(
+        io.StringIO(
+            '{"source_path": "a/./b", "destination_path": "/x/../y"}\n'
+            "\n"
+            '{"source_path": "a b", "destination_path": "c", "recursive": true}\n'
+            '{"source_path": "#c", "destination_path": "d", '
+            '"external_checksum": "abc"}\n'
+        )
+    )
+    assert items == [
+        ("/src/a/b", "/y", False, None),
+        ("/src/a b", "c", True, None),
+        ("/src/#c", "d", False, "abc"),
+    ]
+
+
+@pytest.mark.parametrize(
+    "line, message",
+    [
+        ("not json", "not valid JSON"),
+        ('["a", "b"]', "expected a JSON object"),
+        ('{"source_path": "a"}', "'destination_path' must be a string"),
+        ('{"source_path": 1, "destination_path": "b"}', "'source_path' must be"),
+        (
+            '{"source_path": "a", "destination_path": "b", "recursive": "yes"}',
+            "'recursive' must be true or false",
+        ),
+        (
+            '{"source_path": "a", "destination_path": "b", "external_checksum": 1}',
+            "'external_checksum' must be a string or null",
+        ),
+        (
+            '{"source_path": "a", "destination_path": "b", "other": 1}',
+            "unexpected key 'other'",
+        ),
+        (
+            '{"source_path": "a", "destination_path": "b", "recursive": true, '
+            '"external_checksum": "x"}',
+            "recursive and external_checksum are mutually exclusive",
+        ),
+    ],
+)
+def test_ndjson_parser_errors(line, message):
+    items = []
+    parser = _make_ndjson_parser(items)
+    good_line = '{"source_path": "a", "destination_path": "b"}\n'
+    with pytest.raises(click.UsageError) as excinfo:
+        parser.process_stream(io.StringIO(good_line + line + "\n" + good_line))
+    assert str(excinfo.value).startswith("invalid --batch input on line 2: ")
+    assert message in str(excinfo.value)
+    # lines are processed as they are read, up to the bad line
+    assert len(items) == 1
@@ -0,0 +1,135 @@
+import pytest
+
+from globus_cli.services.transfer import BatchCoalescer
+
+
+class _ListingClient:
+    def __init__(self, tree):
+        self.tree = tree
+        self.listed = []
+
+    def operation_ls(self, endpoint_id, path, **kwargs):
+        self.listed.append(path)
+        return [
+            {"name": name, "type": type_} for name, type_ in self.tree[path].items()
+        ]
+
+
+def _item(source, dest, recursive=False, external_checksum=None):
+    return {
+        "DATA_TYPE": "transfer_item",
+        "source_path": source,
+        "destination_path": dest,
+        "recursive": recursive,
+        "external_checksum": external_checksum,
+        "checksum_algorithm": None,
+    }
+
+
+def _paths(items):
+    return [
+        (item["source_path"], item["destination_path"], item["recursive"])
+        for item in items
+    ]
+
+
+TREE = {
+    "/s": {"a": "dir", "b": "dir", "top": "file"},
+    "/s/a": {"1": "file", "2": "file", "sub": "dir"},
+    "/s/a/sub": {"x": "file", "y": "file"},
+    "/s/b": {"1": "file", "2": "file", "3": "file"},
+}
+
+
+def test_coalesce_nested_directories():
+    items = [
+        _item("/s/top", "/d/top"),
+        _item("/s/a/1", "/d/a/1"),
+        _item("/s/a/sub/x", "/d/a/sub/x"),
+        _item("/s/a/2", "/d/a/2"),
+        _item("/s/a/sub/y", "/d/a/sub/y"),
+        _item("/s/b/1", "/d/b/1"),
+        _item("/s/b/2", "/d/b/2"),
+    ]
+    client = _ListingClient(TREE)
+    coalescer = BatchCoalescer(client, "ep", items)
+    result = coalescer.coalesce()
+
+    # "b" is missing a file, so it and the top level directory are not collapsed
+    assert _paths(result) == [
+        ("/s/top", "/d/top", False),
+        ("/s/a", "/d/a", True),
+        ("/s/b/1", "/d/b/1", False),
+        ("/s/b/2", "/d/b/2", False),
+    ]
+    assert sorted(client.listed) == ["/s", "/s/a", "/s/a/sub", "/s/b"]
+    assert coalescer.directories_listed == 4
+    assert coalescer.directories_collapsed == 2
+    assert coalescer.payload_bytes_after < coalescer.payload_bytes_before
+
+
+def test_coalesce_whole_tree_with_recursive_item():
+    items = [
+        _item("/s/top", "/d/top"),
+        _item("/s/a", "/d/a", recursive=True),
+        _item("/s/b/1", "/d/b/1"),
+        _item("/s/b/2", "/d/b/2"),
+        _item("/s/b/3", "/d/b/3"),
+    ]
+    result = BatchCoalescer(_ListingClient(TREE), "ep", items).coalesce()
+    assert _paths(result) == [("/s", "/d", True)]
+
+
+@pytest.mark.parametrize(
+    "items, exclude",
+    [
+        # renamed on the destination
+        (
+            [
+                _item("/s/b/1", "/d/b/1"),
+                _item("/s/b/2", "/d/b/2"),
+                _item("/s/b/3", "/d/b/x"),
+            ],
+            (),
+        ),
+        # split across destination directories
+        (
+            [
+                _item("/s/b/1", "/d/b/1"),
+                _item("/s/b/2", "/d/b/2"),
+                _item("/s/b/3", "/e/b/3"),
+            ],
+            (),
+        ),
+        # an external checksum is not kept by a recursive item
+        (
+            [
+                _item("/s/b/1", "/d/b/1"),
+                _item("/s/b/2", "/d/b/2"),
+                _item("/s/b/3", "/d/b/3", external_checksum="abc"),
+            ],
+            (),
+        ),
+        # a file in the directory would be excluded by a recursive transfer
+        (
+            [
+                _item("/s/b/1", "/d/b/1"),
+                _item("/s/b/2", "/d/b/2"),
+                _item("/s/b/3", "/d/b/3"),
+            ],
+            ("3",),
+        ),
+    ],
+)
+def test_coalesce_leaves_incomplete_directories(items, exclude):
+    result = BatchCoalescer(
+        _ListingClient(TREE), "ep", items, exclude=exclude
+    ).coalesce()
+    assert result == items
+
+
+def test_coalesce_does_not_list_small_groups():
+    items = [_item("/s/b/1", "/d/b/1"), _item("/s/a/1", "/d/a/1")]
+    client = _ListingClient(TREE)
+    assert BatchCoalescer(client, "ep", items).coalesce() == items
+    assert client.listed == []
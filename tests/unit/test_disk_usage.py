@@ -0,0 +1,58 @@
+from globus_cli.services.transfer import DiskUsageAggregator
+
+
+def _file(name, size):
+    return {"name": name, "type": "file", "size": size}
+
+
+def _dir(name):
+    return {"name": name, "type": "dir"}
+
+
+# the items of a recursive ls of this tree, in the order they are produced
+#   a/  b/  top.txt
+#   a/x/  a/y/  a/1.txt
+#   a/x/2.txt
+#   (a/y/ and b/ are empty)
+ITEMS = [
+    _dir("a"),
+    _dir("b"),
+    _file("top.txt", 1),
+    _dir("a/x"),
+    _dir("a/y"),
+    _file("a/1.txt", 10),
+    _file("a/x/2.txt", 100),
+]
+
+
+def _totals(report_depth, walk_depth=3):
+    aggregator = DiskUsageAggregator(walk_depth=walk_depth, report_depth=report_depth)
+    return [
+        (r["path"], r["size"], r["file_count"], r["dir_count"])
+        for r in aggregator.aggregate(iter(ITEMS))
+    ]
+
+
+def test_totals_are_produced_depth_first():
+    assert _totals(report_depth=2) == [
+        ("a/x", 100, 1, 0),
+        ("a/y", 0, 0, 0),
+        ("a", 110, 2, 2),
+        ("b", 0, 0, 0),
+        (".", 111, 3, 4),
+    ]
+
+
+def test_report_depth_limits_output_not_totals():
+    assert _totals(report_depth=0) == [(".", 111, 3, 4)]
+    assert _totals(report_depth=1) == [
+        ("a", 110, 2, 2),
+        ("b", 0, 0, 0),
+        (".", 111, 3, 4),
+    ]
+
+
+def test_unlisted_dirs_are_counted():
+    aggregator = DiskUsageAggregator(walk_depth=1, report_depth=1)
+    list(aggregator.aggregate(iter(ITEMS)))
+    assert aggregator.unlisted_dirs == 2
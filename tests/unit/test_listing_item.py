@@ -0,0 +1,67 @@
+import json
+
+import pytest
+
+from globus_cli.services.transfer import ListingItem, RecursiveLsResponse
+
+
+def _item(**kwargs):
+    item = {
+        "DATA_TYPE": "file",
+        "group": "tutorial",
+        "last_modified": "2022-01-01 00:00:00+00:00",
+        "link_target": None,
+        "name": "file1.txt",
+        "permissions": "0644",
+        "size": 4,
+        "type": "file",
+        "user": "tutorial",
+    }
+    item.update(kwargs)
+    return item
+
+
+def test_behaves_like_the_item_dict():
+    original = _item(unexpected_field=[1, 2])
+    item = ListingItem(original)
+    assert item == original
+    assert dict(item) == original
+    assert item.data == original
+    assert item["size"] == 4
+    assert item.get("link_user", "absent") == "absent"
+    assert "unexpected_field" in item
+    with pytest.raises(KeyError):
+        item["link_user"]
+    assert json.dumps(item.data, sort_keys=True) == json.dumps(original, sort_keys=True)
+
+
+def test_renamed_and_read_only():
+    item = ListingItem(_item(), name="dir/file1.txt")
+    assert item["name"] == "dir/file1.txt"
+    with pytest.raises(AttributeError):
+        item.name = "other"
+    with pytest.raises(TypeError):
+        item["name"] = "other"
+
+
+def test_repeated_strings_are_shared():
+    first = ListingItem(_item(user="".join(["tuto", "rial"])))
+    second = ListingItem(_item(user="".join(["tutor", "ial"])))
+    assert first["user"] is second["user"]
+
+
+class _FakeClient:
+    def operation_ls(self, endpoint_id, path=None, **kwargs):
+        if path is None:
+            data = [_item(), _item(name="sub", type="dir")]
+        else:
+            data = [_item(name="nested.txt")]
+        return {"DATA": data, "path": path or "/"}
+
+
+def test_recursive_ls_compact_items():
+    plain = list(RecursiveLsResponse(_FakeClient(), "ep", {}))
+    compact = list(RecursiveLsResponse(_FakeClient(), "ep", {}, compact_items=True))
+    assert all(isinstance(item, ListingItem) for item in compact)
+    assert [item.data for item in compact] == plain
+    assert compact[-1]["name"] == "sub/nested.txt"
@@ -0,0 +1,83 @@
+from unittest import mock
+
+import pytest
+
+from globus_cli.services.transfer import LsCache
+
+
+def _listing(path, *names):
+    return {"path": path, "DATA": [{"name": name, "type": "file"} for name in names]}
+
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = LsCache(str(tmp_path / "cache.db"), ttl=60)
+    yield cache
+    cache.close()
+
+
+def test_get_put_roundtrip(cache):
+    assert cache.get("ep", "/foo", {}) is None
+    cache.put("ep", "/foo", {}, _listing("/foo/", "a", "b"))
+
+    res = cache.get("ep", "/foo/", {})
+    assert [item["name"] for item in res] == ["a", "b"]
+    assert res["path"] == "/foo/"
+    # params and namespaces are part of the key
+    assert cache.get("ep", "/foo", {"show_hidden": 1}) is None
+    assert (
+        LsCache(cache.filename, namespace="other", ttl=60).get("ep", "/foo", {}) is None
+    )
+
+
+def test_ttl(cache):
+    with mock.patch("time.time") as mocktime:
+        mocktime.return_value = 1000
+        cache.put("ep", "/foo", {}, _listing("/foo/", "a"))
+        mocktime.return_value = 1059
+        assert cache.get("ep", "/foo", {}) is not None
+        mocktime.return_value = 1060
+        assert cache.get("ep", "/foo", {}) is None
+
+
+def test_refresh(cache):
+    cache.put("ep", "/foo", {}, _listing("/foo/", "a"))
+    cache.refresh = True
+    assert cache.get("ep", "/foo", {}) is None
+
+
+def test_lru_eviction(tmp_path):
+    size = len('{"path":"/0/","DATA":[]}')
+    cache = LsCache(str(tmp_path / "cache.db"), ttl=60, max_bytes=size * 3)
+    with mock.patch("time.time") as mocktime:
+        for i in range(3):
+            mocktime.return_value = i
+            cache.put("ep", f"/{i}", {}, _listing(f"/{i}/"))
+        # use the oldest listing, so that the second one is least recently used
+        mocktime.return_value = 3
+        assert cache.get("ep", "/0", {}) is not None
+        mocktime.return_value = 4
+        cache.put("ep", "/3", {}, _listing("/3/"))
+
+        assert cache.get("ep", "/1", {}) is None
+        for i in (0, 2, 3):
+            assert cache.get("ep", f"/{i}", {}) is not None
+    cache.close()
+
+
+def test_invalidate(cache):
+    for path in ("/", "/a", "/a/b", "/a/b/c", "/ab", "~/x"):
+        cache.put("ep", path, {}, _listing(path.rstrip("/") + "/"))
+    cache.put("ep2", "/a", {}, _listing("/a/"))
+    # a relative listing which the service resolved to an absolute path
+    cache.put("ep", "d", {}, _listing("/home/u/d/"))
+
+    cache.invalidate("ep", ["/a/b", "/home/u/d/e"])
+
+    remaining = [
+        path
+        for path in ("/", "/a", "/a/b", "/a/b/c", "/ab", "~/x", "d")
+        if cache.get("ep", path, {}) is not None
+    ]
+    assert remaining == ["/", "/ab", "~/x"]
+    assert cache.get("ep2", "/a", {}) is not None
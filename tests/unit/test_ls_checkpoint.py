@@ -0,0 +1,75 @@
+import click
+import pytest
+
+from globus_cli.services.transfer import RecursiveLsResponse
+from globus_cli.services.transfer.ls_checkpoint import RecursiveLsCheckpoint
+
+
+def _entry(i):
+    return (f"/dir{i}", f"dir{i}", 1)
+
+
+def test_checkpoint_queue_is_streamed(tmp_path):
+    filename = str(tmp_path / "ls.checkpoint")
+    RecursiveLsCheckpoint(filename, {"ep": "x"}).save(_entry(i) for i in range(1000))
+
+    queue = RecursiveLsCheckpoint(filename, {"ep": "x"}).load()
+    # entries are read as they are consumed, not gathered into a list
+    assert not isinstance(queue, list)
+    assert next(queue) == _entry(0)
+    assert list(queue) == [_entry(i) for i in range(1, 1000)]
+
+
+def test_checkpoint_bad_entry(tmp_path):
+    path = tmp_path / "ls.checkpoint"
+    RecursiveLsCheckpoint(str(path), {}).save([_entry(0)])
+    path.write_text(path.read_text() + "[1, 2]\n")
+
+    queue = RecursiveLsCheckpoint(str(path), {}).load()
+    assert next(queue) == _entry(0)
+    with pytest.raises(click.UsageError, match="not a valid recursive ls checkpoint"):
+        next(queue)
+
+
+def test_checkpoint_missing_or_mismatched(tmp_path):
+    path = tmp_path / "ls.checkpoint"
+    assert RecursiveLsCheckpoint(str(path), {}).load() is None
+
+    RecursiveLsCheckpoint(str(path), {"ep": "x"}).save([])
+    with pytest.raises(click.UsageError, match="checkpoint for a different listing"):
+        RecursiveLsCheckpoint(str(path), {"ep": "y"}).load()
+
+
+class _FakeTreeClient:
+    """answers operation_ls for a root with two files and two dirs of 3 files"""
+
+    def operation_ls(self, endpoint_id, path="/", **kwargs):
+        path = path if path.endswith("/") else path + "/"
+        data = [{"name": f"file{i}", "type": "file"} for i in range(3)]
+        if path == "/":
+            data = data[:2] + [{"name": d, "type": "dir"} for d in ("a", "b")]
+        return {"DATA": data, "path": path}
+
+
+def test_interrupted_walk_repeats_at_most_one_directory(tmp_path):
+    checkpoint = str(tmp_path / "ls.checkpoint")
+
+    def walk():
+        return RecursiveLsResponse(
+            _FakeTreeClient(), "ep", {"path": "/"}, checkpoint_file=checkpoint
+        )
+
+    full = [item["name"] for item in walk()]
+    # the walk completed, so its checkpoint was removed
+    assert not (tmp_path / "ls.checkpoint").exists()
+
+    # stop partway through the second directory which is listed
+    stop_at = full.index("a/file1") + 1
+    items = iter(walk())
+    first = [next(items)["name"] for _ in range(stop_at)]
+    items.close()
+
+    resumed = [item["name"] for item in walk()]
+    # only the part of the interrupted directory which was shown is repeated
+    assert [name for name in resumed if name in first] == ["a/file0", "a/file1"]
+    assert first + [name for name in resumed if name not in first] == full
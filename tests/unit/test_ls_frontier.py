@@ -0,0 +1,124 @@
+from collections import deque
+
+import pytest
+
+from globus_cli.services.transfer import RecursiveLsResponse, ls_frontier
+from globus_cli.services.transfer.ls_frontier import DirectoryFrontier
+
+
+def _entry(i):
+    return (f"/dir{i}", f"dir{i}", i % 4)
+
+
+def test_frontier_behaves_like_deque():
+    frontier = DirectoryFrontier(memory_limit=4)
+    reference = deque()
+
+    # interleave pushes and pops so that entries are spilled and read back
+    for i in range(50):
+        frontier.append(_entry(i))
+        reference.append(_entry(i))
+        if i % 3 == 0:
+            assert frontier.pop() == reference.pop()
+    frontier.extend(_entry(i) for i in range(50, 60))
+    reference.extend(_entry(i) for i in range(50, 60))
+
+    assert len(frontier) == len(reference)
+    assert list(frontier) == list(reference)
+    assert list(reversed(frontier)) == list(reversed(reference))
+    assert frontier[-1] == reference[-1]
+
+    while reference:
+        assert frontier
+        assert frontier.pop() == reference.pop()
+    assert not frontier
+    frontier.close()
+
+
+def test_frontier_spills_to_disk():
+    frontier = DirectoryFrontier(memory_limit=10)
+    frontier.extend(_entry(i) for i in range(1000))
+    assert len(frontier._memory) <= 10
+    assert frontier._disk_count == 1000 - len(frontier._memory)
+    frontier.close()
+
+
+def test_frontier_only_peeks_at_top():
+    frontier = DirectoryFrontier()
+    frontier.append(_entry(0))
+    with pytest.raises(IndexError):
+        frontier[0]
+
+
+class _FakeTreeClient:
+    """answers operation_ls for a tree where every dir has 3 subdirs and a file"""
+
+    def operation_ls(self, endpoint_id, path="/", **kwargs):
+        path = path if path.endswith("/") else path + "/"
+        data = [{"name": "file.txt", "type": "file"}]
+        if path.count("/") <= 4:
+            data += [{"name": f"d{i}", "type": "dir"} for i in range(3)]
+        return {"DATA": data, "path": path}
+
+
+def test_recursive_ls_with_spilled_frontier_matches_in_memory():
+    def names(**kwargs):
+        res = RecursiveLsResponse(
+            _FakeTreeClient(), "ep", {"path": "/"}, max_depth=5, **kwargs
+        )
+        return [item["name"] for item in res]
+
+    in_memory = names()
+    # 40 dirs with a file and 3 subdirs, and 81 leaf dirs with only a file
+    assert len(in_memory) == 40 * 4 + 81
+    assert names(max_frontier_in_memory=2) == in_memory
+    assert names(max_frontier_in_memory=2, max_workers=4) == in_memory
+
+
+class _FakeWideClient:
+    """answers operation_ls for a root dir with many empty subdirs"""
+
+    def __init__(self, width):
+        self.width = width
+
+    def operation_ls(self, endpoint_id, path="/", **kwargs):
+        path = path if path.endswith("/") else path + "/"
+        data = []
+        if path == "/":
+            data = [{"name": f"d{i}", "type": "dir"} for i in range(self.width)]
+        return {"DATA": data, "path": path}
+
+
+class _CountingDeque(deque):
+    """a deque which counts the entries read by iterating over it"""
+
+    read = 0
+
+    def __iter__(self):
+        for entry in super().__iter__():
+            _CountingDeque.read += 1
+            yield entry
+
+    def __reversed__(self):
+        for entry in super().__reversed__():
+            _CountingDeque.read += 1
+            yield entry
+
+
+def test_parallel_prefetch_only_looks_ahead(monkeypatch):
+    """
+    On a wide level, each pop must only read the next few entries of the
+    frontier, not copy or scan the whole frontier
+    """
+    monkeypatch.setattr(ls_frontier, "deque", _CountingDeque)
+    monkeypatch.setattr(_CountingDeque, "read", 0)
+
+    width, workers = 2000, 4
+    res = RecursiveLsResponse(
+        _FakeWideClient(width), "ep", {"path": "/"}, max_depth=1, max_workers=workers
+    )
+    assert len(list(res)) == width
+    # each pop, and each wait for a listing, reads at most the number of entries
+    # which may be prefetched (a full scan of the frontier on every pop would
+    # read about width**2 / 2 entries)
+    assert _CountingDeque.read < width * workers * 4 * 4
@@ -0,0 +1,29 @@
+import random
+
+import pytest
+
+from globus_cli.services.transfer import PollingSchedule
+
+
+def test_polling_schedule_backs_off_to_ceiling():
+    schedule = PollingSchedule(10, rng=random.Random(0))
+    delays = [schedule.next_delay() for _ in range(8)]
+    for delay, base in zip(delays, [1, 2, 4, 8, 10, 10, 10, 10]):
+        assert 0.9 * base <= delay <= base
+    # the jitter differs between polls
+    assert len(set(delays[4:])) == 4
+
+
+@pytest.mark.parametrize("ceiling", [1, 0.5])
+def test_polling_schedule_small_ceiling(ceiling):
+    schedule = PollingSchedule(ceiling)
+    assert all(0.9 * ceiling <= schedule.next_delay() <= ceiling for _ in range(5))
+
+
+def test_polling_schedule_reset():
+    schedule = PollingSchedule(10)
+    for _ in range(4):
+        schedule.next_delay()
+    schedule.reset()
+    assert 0.9 <= schedule.next_delay() <= 1
+    assert 1.8 <= schedule.next_delay() <= 2
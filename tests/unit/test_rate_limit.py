@@ -0,0 +1,100 @@
+import datetime
+
+import pytest
+import requests
+from globus_sdk.transport import RetryCheckResult, RetryContext
+
+from globus_cli.services.transfer.rate_limit import AdaptiveRateLimiter
+
+
+def _ctx(status=200, latency=0.1, headers=None):
+    response = requests.Response()
+    response.status_code = status
+    response.headers.update(headers or {})
+    response.elapsed = datetime.timedelta(seconds=latency)
+    ctx = RetryContext(0)
+    ctx.response = response
+    return ctx
+
+
+def test_burst_does_not_sleep(mocksleep):
+    limiter = AdaptiveRateLimiter(rate=1, burst=5)
+    for _ in range(5):
+        limiter.acquire()
+    mocksleep.assert_not_called()
+    assert limiter.total_sleep == 0
+
+
+def test_empty_bucket_sleeps(mocksleep):
+    limiter = AdaptiveRateLimiter(rate=1, burst=2)
+    for _ in range(3):
+        limiter.acquire()
+    mocksleep.assert_called_once()
+    (delay,), _ = mocksleep.call_args
+    assert 0.9 < delay <= 1
+    assert limiter.total_sleep == delay
+    assert limiter.total_requests == 3
+
+
+@pytest.mark.parametrize("status", (429, 503))
+def test_throttle_backs_off(mocksleep, status):
+    limiter = AdaptiveRateLimiter(rate=8, burst=10)
+    assert limiter.check_response(_ctx(status)) is RetryCheckResult.no_decision
+    assert limiter.rate == 4
+    # the saved burst is given up, so the next call waits
+    limiter.acquire()
+    mocksleep.assert_called_once()
+
+
+def test_retry_after_blocks_callers(mocksleep):
+    limiter = AdaptiveRateLimiter(rate=8, burst=10)
+    limiter.check_response(_ctx(429, headers={"Retry-After": "30"}))
+    limiter.acquire()
+    (delay,), _ = mocksleep.call_args
+    assert 29 < delay <= 30
+
+
+def test_network_error_backs_off():
+    limiter = AdaptiveRateLimiter(rate=8)
+    ctx = RetryContext(0)
+    ctx.exception = requests.ConnectionError()
+    limiter.check_response(ctx)
+    assert limiter.rate == 4
+
+
+def test_rate_adapts_to_latency():
+    limiter = AdaptiveRateLimiter(rate=10, max_rate=11, healthy_latency=1)
+    limiter.check_response(_ctx(latency=0.1))
+    assert limiter.rate == 10.5
+    limiter.check_response(_ctx(latency=0.1))
+    limiter.check_response(_ctx(latency=0.1))
+    assert limiter.rate == 11
+    limiter.check_response(_ctx(latency=5))
+    assert limiter.rate == pytest.approx(9.9)
+
+
+def test_rate_never_drops_below_min():
+    limiter = AdaptiveRateLimiter(rate=1, min_rate=0.5)
+    for _ in range(5):
+        limiter.check_response(_ctx(429))
+    assert limiter.rate == 0.5
+
+
+def test_log_summary(mocksleep, caplog):
+    limiter = AdaptiveRateLimiter(rate=1, burst=1)
+    limiter.check_response(_ctx(429))
+    limiter.acquire()
+    limiter.acquire()
+    with caplog.at_level("DEBUG", logger="globus_cli.services.transfer.rate_limit"):
+        limiter.log_summary()
+    assert limiter.total_waits == 2
+    (record,) = caplog.records
+    assert record.getMessage().startswith(
+        "rate limiter summary: requests=2, throttled responses=1, waits=2, "
+    )
+
+
+def test_log_summary_is_quiet_without_requests(caplog):
+    with caplog.at_level("DEBUG", logger="globus_cli.services.transfer.rate_limit"):
+        AdaptiveRateLimiter().log_summary()
+    assert not caplog.records
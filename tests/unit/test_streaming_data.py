@@ -0,0 +1,51 @@
+import json
+
+import globus_sdk
+
+from globus_cli.services.transfer import StreamingTransferData, streaming_data
+
+
+def _transfer_data():
+    return globus_sdk.TransferData(
+        None, "src-ep", "dst-ep", label="lbl", submission_id="sub-id"
+    )
+
+
+def test_streamed_body_matches_transfer_data(monkeypatch):
+    monkeypatch.setattr(streaming_data, "STREAM_ITEMS_PER_CHUNK", 2)
+    expected = _transfer_data()
+    stream = StreamingTransferData(_transfer_data())
+    for i in range(5):
+        expected.add_item(f"/s/{i}", f'/d/"{i}"', recursive=i == 3)
+        stream.add_item(f"/s/{i}", f'/d/"{i}"', recursive=i == 3)
+
+    chunks = list(stream)
+    # the head, three chunks of items, and the tail
+    assert len(chunks) == 5
+    assert json.loads(b"".join(chunks)) == expected.data
+    # it can be iterated again, for retries
+    assert b"".join(stream) == b"".join(chunks)
+    assert stream.has_recursive_items
+    assert stream.item_count == 5
+
+
+def test_partly_materialized_body(monkeypatch):
+    monkeypatch.setattr(streaming_data, "STREAM_ITEMS_PER_CHUNK", 2)
+    stream = StreamingTransferData(_transfer_data())
+    stream.add_item("/s/a", "/d/a")
+    stream.add_item("/s/b", "/d/b", external_checksum="abc")
+    transfer_data = stream.materialize()
+    assert [item["source_path"] for item in transfer_data["DATA"]] == ["/s/a", "/s/b"]
+    assert transfer_data["DATA"][1]["external_checksum"] == "abc"
+    assert not stream.has_recursive_items
+
+    stream.add_item("/s/c", "/d/c")
+    doc = json.loads(b"".join(stream))
+    assert [item["source_path"] for item in doc["DATA"]] == ["/s/a", "/s/b", "/s/c"]
+    assert doc["label"] == "lbl"
+
+
+def test_empty_body():
+    doc = json.loads(b"".join(StreamingTransferData(_transfer_data())))
+    assert doc["DATA"] == []
+    assert doc["submission_id"] == "sub-id"
@@ -0,0 +1,31 @@
+import random
+
+from globus_cli.services.transfer.sync_plan import merge_key
+
+
+def _sorted_walk(tree, prefix=""):
+    """
+    Walk a tree of nested dicts the way a recursive ls with sort_by_name does: the
+    sorted items of a directory, then each subdirectory in sorted order
+    """
+    names = sorted(tree)
+    for name in names:
+        yield prefix + name
+    for name in names:
+        if tree[name] is not None:
+            yield from _sorted_walk(tree[name], prefix + name + "/")
+
+
+def test_merge_key_matches_sorted_walk_order():
+    tree = {
+        "a": {"x": None, "y": {"deep": None}},
+        "a b": None,
+        "a-b": {"z": None},
+        "b": None,
+        "a.txt": None,
+        "B": {"c": None},
+    }
+    walked = list(_sorted_walk(tree))
+    shuffled = list(walked)
+    random.Random(0).shuffle(shuffled)
+    assert sorted(shuffled, key=merge_key) == walked
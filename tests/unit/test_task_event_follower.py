@@ -0,0 +1,60 @@
+from globus_cli.services.transfer import TaskEventFollower
+
+
+def _event(second, code):
+    return {"time": f"2021-10-06 16:00:{second:02d}", "code": code}
+
+
+class _FakeEventClient:
+    """
+    answers task_event_list from a list of events, newest first, calling
+    ``on_call`` before each answer so that events can arrive between pages
+    """
+
+    def __init__(self, events, on_call=None):
+        self.events = events
+        self.on_call = on_call
+        self.calls = 0
+
+    def task_event_list(self, task_id, limit, offset, query_params):
+        if self.on_call is not None:
+            self.on_call(self.calls)
+        self.calls += 1
+        return {
+            "DATA": self.events[offset : offset + limit],
+            "total": len(self.events),
+        }
+
+
+def test_events_shifted_onto_the_next_page_are_not_repeated():
+    client = _FakeEventClient([_event(s, f"E{s}") for s in range(4, 0, -1)])
+
+    def arrive(call):
+        # new events arrive after the first page, pushing it down
+        if call == 1:
+            client.events[:0] = [_event(6, "E6"), _event(5, "E5")]
+
+    client.on_call = arrive
+    follower = TaskEventFollower(client, "task", page_size=2)
+    # the second page repeats the first, and the new events are left for later
+    assert [e["code"] for e in follower.poll()] == ["E1", "E2", "E3", "E4"]
+    assert client.calls == 3
+
+    client.on_call = None
+    assert [e["code"] for e in follower.poll()] == ["E5", "E6"]
+
+
+def test_limit_does_not_split_events_at_the_same_time():
+    client = _FakeEventClient(
+        [_event(3, "C"), _event(2, "B1"), _event(2, "B2"), _event(1, "A")]
+    )
+    follower = TaskEventFollower(client, "task")
+    # the limit falls between the two events at 00:02, so both are shown
+    assert [e["code"] for e in follower.poll(limit=2)] == ["B2", "B1", "C"]
+    assert follower.poll() == []
+
+    # when every event is at the newest time, none are left for the next poll
+    client = _FakeEventClient([_event(5, "X"), _event(5, "Y"), _event(5, "Z")])
+    follower = TaskEventFollower(client, "task")
+    assert [e["code"] for e in follower.poll(limit=1)] == ["Z", "Y", "X"]
+    assert follower.poll() == []
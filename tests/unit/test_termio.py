@@ -4,6 +4,7 @@ import re
 import click
 import pytest
 
+from globus_cli.parsing.command_state import CommandState
 from globus_cli.termio import (
     FORMAT_TEXT_RECORD_LIST,
     formatted_print,
@@ -53,3 +54,27 @@ def test_format_record_list(capsys):
     # and one empty line between the records
     assert "" in output.splitlines()
     assert re.match(r"Bird:\s+Killdeer", output)
+
+
+def test_format_ndjson_streams_iterables(capsys):
+    printed = []
+
+    def items():
+        for i in range(3):
+            # each item is printed before the next one is produced
+            printed.append(capsys.readouterr().out)
+            yield {"bird": "Killdeer", "count": i}
+
+    with click.Context(click.Command("fake-command")) as ctx:
+        ctx.ensure_object(CommandState).output_format = "ndjson"
+        formatted_print(items(), json_converter=lambda x: 1 / 0)
+    assert printed[2] == '{"bird":"Killdeer","count":1}\n'
+    assert capsys.readouterr().out == '{"bird":"Killdeer","count":2}\n'
+
+
+def test_format_ndjson_documents(capsys):
+    with click.Context(click.Command("fake-command")) as ctx:
+        ctx.ensure_object(CommandState).output_format = "ndjson"
+        formatted_print({"DATA": [{"a": 1}, {"b": 2}]})
+        formatted_print({"id": "foo"}, json_converter=lambda x: {"id": "bar"})
+    assert capsys.readouterr().out == '{"a":1}\n{"b":2}\n{"id":"bar"}\n'
@@ -0,0 +1,64 @@
+from unittest import mock
+
+from globus_cli.services.transfer import ThroughputMonitor
+
+
+def _task(task_id, status, bytes_transferred, files_transferred):
+    return {
+        "task_id": task_id,
+        "status": status,
+        "label": None,
+        "bytes_transferred": bytes_transferred,
+        "files": 10,
+        "files_transferred": files_transferred,
+        "subtasks_total": 10,
+        "subtasks_succeeded": files_transferred,
+    }
+
+
+def test_throughput_monitor_rates():
+    client = mock.Mock()
+    client.task_list.side_effect = [
+        [_task("a", "ACTIVE", 0, 0), _task("b", "ACTIVE", 100, 1)],
+        [_task("a", "ACTIVE", 1000, 2), _task("b", "SUCCEEDED", 300, 10)],
+        [_task("a", "SUCCEEDED", 1500, 10)],
+    ]
+    times = iter([0.0, 10.0, 20.0])
+    monitor = ThroughputMonitor(client, ["a", "b", "c"], clock=lambda: next(times))
+
+    rows = monitor.sample()
+    # the first sample has no rates, and tasks which are not found are dropped
+    assert [row["task_id"] for row in rows] == ["a", "b"]
+    assert monitor.not_found == ["c"]
+    assert all(row["bytes_per_second"] is None for row in rows)
+
+    rows = monitor.sample()
+    assert [row["bytes_per_second"] for row in rows] == [100.0, 20.0]
+    assert [row["files_per_second"] for row in rows] == [0.2, 0.9]
+    totals = monitor.totals(rows)
+    assert totals["bytes_per_second"] == 120.0
+    assert totals["active_tasks"] == 1
+    assert totals["bytes_transferred"] == 1300
+    assert not monitor.done
+
+    # completed tasks are not checked again, and make no more progress
+    rows = monitor.sample()
+    assert client.task_list.call_args.kwargs["filter"] == {"task_id": ["a"]}
+    assert [row["bytes_per_second"] for row in rows] == [50.0, 0.0]
+    assert monitor.done
+    assert monitor.api_calls == 3
+
+
+def test_throughput_monitor_drops_tasks_which_go_missing():
+    client = mock.Mock()
+    client.task_list.side_effect = [
+        [_task("a", "ACTIVE", 0, 0), _task("b", "ACTIVE", 0, 0)],
+        [_task("a", "SUCCEEDED", 100, 10)],
+    ]
+    monitor = ThroughputMonitor(client, ["a", "b"])
+    monitor.sample()
+    rows = monitor.sample()
+    # "b" was found by the first sample, but not by the second
+    assert [row["task_id"] for row in rows] == ["a"]
+    assert monitor.not_found == ["b"]
+    assert monitor.done